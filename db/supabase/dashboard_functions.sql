@@ -0,0 +1,100 @@
+-- 대시보드 집계용 Postgres 함수
+-- Supabase SQL Editor에서 실행하면 SupabaseConnector가 client.rpc()로 호출합니다.
+-- 전체 테이블을 PostgREST로 내려받지 않고, 집계 결과만 전송합니다.
+
+-- 1. 일별 전체 관객수/매출액
+CREATE OR REPLACE FUNCTION boxoffice_daily_totals(start_date date, end_date date)
+RETURNS TABLE (target_dt date, audi_cnt double precision, sales_amt double precision)
+LANGUAGE sql STABLE AS $$
+    SELECT b.target_dt::date, SUM(b.audi_cnt)::double precision, SUM(b.sales_amt)::double precision
+    FROM boxoffice b
+    WHERE b.target_dt >= start_date AND b.target_dt < end_date + 1
+    GROUP BY b.target_dt::date
+    ORDER BY b.target_dt::date;
+$$;
+
+-- 2. 기간 내 관객수 상위 N개 영화
+CREATE OR REPLACE FUNCTION boxoffice_top_movies(start_date date, end_date date, top_n integer DEFAULT 10)
+RETURNS TABLE (movie_nm text, audi_cnt double precision)
+LANGUAGE sql STABLE AS $$
+    SELECT b.movie_nm::text, SUM(b.audi_cnt)::double precision AS audi_cnt
+    FROM boxoffice b
+    WHERE b.target_dt >= start_date AND b.target_dt < end_date + 1
+    GROUP BY b.movie_nm
+    ORDER BY audi_cnt DESC
+    LIMIT top_n;
+$$;
+
+-- 3. 기간 내 상영 영화의 대표 장르 분포
+CREATE OR REPLACE FUNCTION boxoffice_genre_distribution(start_date date, end_date date, top_n integer DEFAULT 3)
+RETURNS TABLE (rep_genre_nm text, movie_count bigint, movie_list text)
+LANGUAGE sql STABLE AS $$
+    WITH movies_in_period AS (
+        SELECT DISTINCT b.movie_cd, b.movie_nm
+        FROM boxoffice b
+        WHERE b.target_dt >= start_date AND b.target_dt < end_date + 1
+    )
+    SELECT m.rep_genre_nm::text,
+           COUNT(DISTINCT p.movie_nm) AS movie_count,
+           string_agg(DISTINCT p.movie_nm, ', ' ORDER BY p.movie_nm) AS movie_list
+    FROM movies_in_period p
+    JOIN movie m ON m.movie_cd = p.movie_cd
+    WHERE m.rep_genre_nm IS NOT NULL AND m.rep_genre_nm <> ''
+    GROUP BY m.rep_genre_nm
+    ORDER BY movie_count DESC
+    LIMIT top_n;
+$$;
+
+-- 4. 박스오피스가 있는 첫 날짜와 마지막 날짜 (idx_boxoffice_target_dt의 양 끝만 읽음)
+CREATE OR REPLACE FUNCTION boxoffice_date_range()
+RETURNS TABLE (min_dt date, max_dt date)
+LANGUAGE sql STABLE AS $$
+    SELECT MIN(b.target_dt)::date, MAX(b.target_dt)::date FROM boxoffice b;
+$$;
+
+-- 5. 기간 내 박스오피스 행 (movie_nms가 있으면 해당 영화만)
+CREATE OR REPLACE FUNCTION boxoffice_between(start_date date, end_date date, movie_nms text[] DEFAULT NULL)
+RETURNS TABLE (
+    target_dt timestamp, rank integer, movie_nm text, audi_cnt double precision, audi_inten double precision,
+    audi_acc double precision, sales_amt double precision, open_dt date, movie_cd text
+)
+LANGUAGE sql STABLE AS $$
+    SELECT b.target_dt::timestamp, b.rank::integer, b.movie_nm::text, b.audi_cnt::double precision,
+           b.audi_inten::double precision, b.audi_acc::double precision, b.sales_amt::double precision,
+           b.open_dt::date, b.movie_cd::text
+    FROM boxoffice b
+    WHERE b.target_dt >= start_date AND b.target_dt < end_date + 1
+      AND (movie_nms IS NULL OR b.movie_nm = ANY(movie_nms))
+    ORDER BY b.target_dt DESC, b.rank ASC;
+$$;
+
+-- 6. 화면에 보이는 영화의 상세 정보
+CREATE OR REPLACE FUNCTION movie_details(movie_cds text[])
+RETURNS TABLE (movie_cd text, rep_genre_nm text, genre_alt text, rep_nation_nm text, directors text)
+LANGUAGE sql STABLE AS $$
+    SELECT m.movie_cd::text, m.rep_genre_nm::text, m.genre_alt::text, m.rep_nation_nm::text, m.directors::text
+    FROM movie m
+    WHERE m.movie_cd = ANY(movie_cds);
+$$;
+
+-- 7. 이벤트별 지점 최신 재고 (goods_stock 뷰 대신 팩트 테이블의 기본키로 조회)
+CREATE OR REPLACE FUNCTION goods_stock_latest(p_event_id text)
+RETURNS TABLE (
+    scraped_at timestamp, theater_name text, event_id text,
+    status text, quantity text, total_quantity integer
+)
+LANGUAGE sql STABLE AS $$
+    SELECT (to_timestamp(f.scraped_at) AT TIME ZONE 'UTC')::timestamp, t.theater_name::text, k.event_id::text,
+           st.status::text, f.quantity::text, f.total_quantity::integer
+    FROM (
+        SELECT DISTINCT ON (s.theater_id) s.*
+        FROM goods_stock_fact s
+        WHERE s.event_key = (SELECT g.event_key FROM goods_event_key g WHERE g.event_id = p_event_id)
+        ORDER BY s.theater_id, s.scraped_at DESC
+    ) f
+    JOIN theater t ON t.theater_id = f.theater_id
+    JOIN goods_event_key k ON k.event_key = f.event_key
+    LEFT JOIN stock_status st ON st.status_code = f.status_code;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_boxoffice_target_dt ON boxoffice (target_dt);
@@ -0,0 +1,224 @@
+-- 파이프라인이 추가로 사용하는 테이블
+-- Supabase SQL Editor에서 실행합니다.
+
+-- 이벤트별 마지막 재고 응답 해시
+-- 응답이 이전과 같으면 goods_stock에 쓰지 않고 checked_at(하트비트)만 갱신합니다.
+CREATE TABLE IF NOT EXISTS goods_stock_hash (
+    theater_chain text NOT NULL,
+    event_id text NOT NULL,
+    response_hash text NOT NULL,
+    checked_at timestamp NOT NULL,
+    changed_at timestamp NOT NULL,
+    PRIMARY KEY (theater_chain, event_id)
+);
+
+-- 날짜/영화별 박스오피스 행 해시. 다시 받은 행 중 해시가 바뀐(정정된) 행만 boxoffice에 씁니다.
+CREATE TABLE IF NOT EXISTS boxoffice_hash (
+    target_dt date NOT NULL,
+    movie_cd text NOT NULL,
+    row_hash text NOT NULL,
+    changed_at timestamp NOT NULL,
+    PRIMARY KEY (target_dt, movie_cd)
+);
+
+-- KOBIS가 다시 보낸 응답에서 빠진 (target_dt, movie_cd)의 박스오피스 행과 행 해시를 지웁니다.
+-- (SupabaseConnector.delete_boxoffice_rows, replicated 모드에서는 SupabaseReplicator가 호출)
+CREATE OR REPLACE FUNCTION delete_boxoffice_rows(p_target_dt date, p_movie_cds text[])
+RETURNS void
+LANGUAGE sql AS $$
+    DELETE FROM boxoffice
+    WHERE target_dt >= p_target_dt AND target_dt < p_target_dt + 1 AND movie_cd = ANY (p_movie_cds);
+    DELETE FROM boxoffice_hash WHERE target_dt = p_target_dt AND movie_cd = ANY (p_movie_cds);
+$$;
+
+-- 백필 CLI(src/scripts/backfill.py)의 구간별 진행 상태
+CREATE TABLE IF NOT EXISTS backfill_checkpoint (
+    job_name text,
+    chunk_key text,
+    status text NOT NULL,
+    rows integer,
+    attempts integer NOT NULL DEFAULT 0,
+    error text,
+    updated_at timestamp,
+    PRIMARY KEY (job_name, chunk_key)
+);
+
+-- 복제된 차원 키 뒤로 identity 시퀀스를 옮깁니다. (SupabaseReplicator.sync_all이 호출)
+CREATE OR REPLACE FUNCTION sync_dimension_sequences()
+RETURNS void
+LANGUAGE sql AS $$
+    SELECT setval(pg_get_serial_sequence('theater', 'theater_id'), COALESCE((SELECT MAX(theater_id) FROM theater), 0) + 1, false);
+    SELECT setval(pg_get_serial_sequence('goods_event_key', 'event_key'), COALESCE((SELECT MAX(event_key) FROM goods_event_key), 0) + 1, false);
+    SELECT setval(pg_get_serial_sequence('stock_status', 'status_code'), GREATEST(COALESCE((SELECT MAX(status_code) FROM stock_status), 0) + 1, 100), false);
+$$;
+
+-- 실행 임대(lease). 영화관별 재고 조회가 겹쳐 실행되지 않게 합니다.
+CREATE TABLE IF NOT EXISTS run_lease (
+    lease_name text PRIMARY KEY,
+    holder text NOT NULL,
+    acquired_at timestamp NOT NULL,
+    expires_at timestamp NOT NULL
+);
+
+-- 임대가 비었거나 만료됐거나 이미 p_holder의 것이면 p_holder로 갱신하고 true를 반환합니다.
+CREATE OR REPLACE FUNCTION try_acquire_lease(p_lease_name text, p_holder text, p_acquired_at timestamp, p_expires_at timestamp)
+RETURNS boolean
+LANGUAGE sql AS $$
+    WITH acquired AS (
+        INSERT INTO run_lease (lease_name, holder, acquired_at, expires_at)
+        VALUES (p_lease_name, p_holder, p_acquired_at, p_expires_at)
+        ON CONFLICT (lease_name) DO UPDATE SET
+            holder = excluded.holder,
+            acquired_at = excluded.acquired_at,
+            expires_at = excluded.expires_at
+        WHERE run_lease.expires_at <= excluded.acquired_at OR run_lease.holder = excluded.holder
+        RETURNING 1
+    )
+    SELECT EXISTS (SELECT 1 FROM acquired);
+$$;
+
+-- 적응형 재고 조회 스케줄러(adaptive_goods_stock_sensor)의 이벤트별 조회 간격과 다음 조회 시각
+CREATE TABLE IF NOT EXISTS goods_stock_poll (
+    theater_chain text,
+    event_id text PRIMARY KEY,
+    interval_seconds integer NOT NULL,
+    last_polled_at timestamp,
+    next_poll_at timestamp NOT NULL
+);
+
+-- 영화관별 스크레이퍼 회로 차단기 상태 (closed / open / half_open)
+-- 연속 실패로 열린 영화관은 opened_at부터 쿨다운 동안 스크레이핑하지 않습니다.
+CREATE TABLE IF NOT EXISTS scraper_circuit_state (
+    theater_chain text PRIMARY KEY,
+    state text NOT NULL,
+    consecutive_failures integer NOT NULL DEFAULT 0,
+    opened_at timestamp,
+    last_error text,
+    updated_at timestamp NOT NULL
+);
+
+-- 재고 차원/팩트 테이블
+-- 지점/이벤트/상태 문자열은 차원 테이블에 한 번만 저장하고, goods_stock_fact는 정수 컬럼만 가집니다.
+-- scraped_at은 수집 시각(시간대 없음)을 1970-01-01 00:00 기준 초로 저장합니다. 초 미만은 버립니다. (floor)
+-- 키는 SQLite에서 복제될 때 그대로 들어오고, insert_goods_stock으로 직접 저장할 때는 identity로 발급됩니다.
+-- replicated 모드에서는 SQLite가 키를 발급하므로, 복제 중에는 Supabase에 직접(supabase 모드로) 재고를 쓰지 않습니다.
+-- 복제기는 동기화 후 sync_dimension_sequences()로 identity 시퀀스를 최대 키 뒤로 옮겨, 모드를 바꾼 뒤의 직접 저장이 충돌하지 않게 합니다.
+CREATE TABLE IF NOT EXISTS theater (
+    theater_id integer GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    theater_chain text NOT NULL DEFAULT '',
+    theater_name text NOT NULL,
+    UNIQUE (theater_chain, theater_name)
+);
+
+CREATE TABLE IF NOT EXISTS goods_event_key (
+    event_key integer GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    event_id text NOT NULL UNIQUE
+);
+
+-- 1~7은 SQLiteConnector.STOCK_STATUSES와 같은 값입니다. 새 상태는 100번부터 발급됩니다.
+CREATE TABLE IF NOT EXISTS stock_status (
+    status_code smallint GENERATED BY DEFAULT AS IDENTITY (START WITH 100) PRIMARY KEY,
+    status text NOT NULL UNIQUE
+);
+INSERT INTO stock_status (status_code, status) VALUES
+    (1, '보유'), (2, '소진중'), (3, '소량보유'), (4, '소진'), (5, '품절'), (6, '준비중'), (7, '알 수 없음')
+ON CONFLICT DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS goods_stock_fact (
+    scraped_at bigint NOT NULL,
+    event_key integer NOT NULL REFERENCES goods_event_key (event_key),
+    theater_id integer NOT NULL REFERENCES theater (theater_id),
+    status_code smallint REFERENCES stock_status (status_code),
+    quantity integer,
+    total_quantity integer,
+    PRIMARY KEY (event_key, theater_id, scraped_at)
+);
+-- 최근 구간만 읽는 조회(StockPollScheduler.load_stock_metrics)용 인덱스
+CREATE INDEX IF NOT EXISTS goods_stock_fact_scraped_at ON goods_stock_fact (scraped_at);
+
+-- 예전 goods_stock 테이블이 있으면 차원/팩트 테이블로 옮기고, 지우지 않고 goods_stock_legacy로 이름을 바꿉니다.
+-- 이름을 바꾼 뒤에는 다시 실행해도 옮기지 않습니다. 결과를 확인한 뒤 goods_stock_legacy는 직접 지웁니다.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_tables WHERE schemaname = current_schema() AND tablename = 'goods_stock') THEN
+        INSERT INTO theater (theater_chain, theater_name)
+        SELECT DISTINCT COALESCE(e.theater_chain, ''), s.theater_name
+        FROM goods_stock s LEFT JOIN goods_event e ON e.event_id::text = s.event_id::text
+        WHERE s.theater_name IS NOT NULL
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO goods_event_key (event_id)
+        SELECT DISTINCT s.event_id::text FROM goods_stock s WHERE s.event_id IS NOT NULL
+        ON CONFLICT DO NOTHING;
+
+        INSERT INTO stock_status (status)
+        SELECT DISTINCT s.status FROM goods_stock s WHERE s.status IS NOT NULL
+        ON CONFLICT DO NOTHING;
+
+        -- 같은 (이벤트, 지점, 초)에 수집한 행이 여럿이면 insert_goods_stock과 같이 나중 값만 남깁니다.
+        INSERT INTO goods_stock_fact (scraped_at, event_key, theater_id, status_code, quantity, total_quantity)
+        SELECT DISTINCT ON (k.event_key, t.theater_id, floor(extract(epoch FROM s.scraped_at::timestamp)))
+               floor(extract(epoch FROM s.scraped_at::timestamp))::bigint, k.event_key, t.theater_id, st.status_code,
+               round(NULLIF(s.quantity::text, '')::numeric)::integer, s.total_quantity::integer
+        FROM goods_stock s
+        LEFT JOIN goods_event e ON e.event_id::text = s.event_id::text
+        JOIN theater t ON t.theater_chain = COALESCE(e.theater_chain, '') AND t.theater_name = s.theater_name
+        JOIN goods_event_key k ON k.event_id = s.event_id::text
+        LEFT JOIN stock_status st ON st.status = s.status
+        WHERE s.scraped_at IS NOT NULL
+        ORDER BY k.event_key, t.theater_id, floor(extract(epoch FROM s.scraped_at::timestamp)), s.scraped_at::timestamp DESC
+        ON CONFLICT DO NOTHING;
+
+        ALTER TABLE goods_stock RENAME TO goods_stock_legacy;
+    END IF;
+END $$;
+
+-- 기존 쿼리(대시보드, 적응형 재고 조회 스케줄러)가 사용하는 goods_stock 컬럼을 그대로 제공하는 뷰
+CREATE OR REPLACE VIEW goods_stock AS
+SELECT (to_timestamp(f.scraped_at) AT TIME ZONE 'UTC')::timestamp AS scraped_at,
+       t.theater_name,
+       k.event_id,
+       s.status,
+       f.quantity::text AS quantity,
+       f.total_quantity
+FROM goods_stock_fact f
+JOIN theater t ON t.theater_id = f.theater_id
+JOIN goods_event_key k ON k.event_key = f.event_key
+LEFT JOIN stock_status s ON s.status_code = f.status_code;
+
+-- SupabaseConnector.insert_goods_stock이 호출하는 재고 저장 함수
+-- rows: [{scraped_at, theater_chain, theater_name, event_id, status, quantity, total_quantity}, ...]
+CREATE OR REPLACE FUNCTION insert_goods_stock(rows jsonb)
+RETURNS void
+LANGUAGE sql AS $$
+    INSERT INTO theater (theater_chain, theater_name)
+    SELECT DISTINCT COALESCE(r.theater_chain, ''), r.theater_name
+    FROM jsonb_to_recordset(rows) AS r(theater_chain text, theater_name text)
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO goods_event_key (event_id)
+    SELECT DISTINCT r.event_id
+    FROM jsonb_to_recordset(rows) AS r(event_id text)
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO stock_status (status)
+    SELECT DISTINCT r.status
+    FROM jsonb_to_recordset(rows) AS r(status text)
+    WHERE r.status IS NOT NULL
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO goods_stock_fact (scraped_at, event_key, theater_id, status_code, quantity, total_quantity)
+    SELECT floor(extract(epoch FROM r.scraped_at))::bigint, k.event_key, t.theater_id, st.status_code,
+           round(r.quantity)::integer, round(r.total_quantity)::integer
+    FROM jsonb_to_recordset(rows) AS r(
+        scraped_at timestamp, theater_chain text, theater_name text, event_id text,
+        status text, quantity numeric, total_quantity numeric
+    )
+    JOIN theater t ON t.theater_chain = COALESCE(r.theater_chain, '') AND t.theater_name = r.theater_name
+    JOIN goods_event_key k ON k.event_id = r.event_id
+    LEFT JOIN stock_status st ON st.status = r.status
+    ON CONFLICT (event_key, theater_id, scraped_at) DO UPDATE SET
+        status_code = excluded.status_code,
+        quantity = excluded.quantity,
+        total_quantity = excluded.total_quantity;
+$$;
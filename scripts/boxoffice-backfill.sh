@@ -0,0 +1,22 @@
+#!/bin/bash
+
+# 재개 가능한 백필 CLI(src/scripts/backfill.py)를 실행합니다.
+# 끝난 구간은 backfill_checkpoint 테이블에 기록되므로, 중간에 멈추면 같은 명령을 다시 실행해 이어서 채웁니다.
+# 모든 저장은 upsert이며 데이터베이스 파일이나 기존 데이터를 지우지 않습니다.
+#
+# 예) ./scripts/boxoffice-backfill.sh                      # 영화 → 박스오피스 → 굿즈 이벤트 전체
+#     ./scripts/boxoffice-backfill.sh boxoffice --start 20250101 --end 20250131
+#     ./scripts/boxoffice-backfill.sh --workers 2 movie --start-year 2024
+
+cd "$(dirname "$0")/.." || exit
+
+if [ -d "venv" ]; then
+    echo "Activating virtual environment..."
+    source venv/bin/activate
+fi
+
+if [ $# -eq 0 ]; then
+    set -- all
+fi
+
+python -m src.scripts.backfill "$@"
@@ -26,7 +26,8 @@ class AIAgent:
     def _get_db_schema(self) -> str:
         """데이터베이스의 스키마 정보를 문자열로 반환합니다."""
         schema_info = []
-        tables_df = self.db.select_query("SELECT name FROM sqlite_master WHERE type='table';")
+        # goods_stock은 재고 차원/팩트 테이블을 조인한 뷰이므로 뷰도 함께 보여줍니다.
+        tables_df = self.db.select_query("SELECT name FROM sqlite_master WHERE type IN ('table', 'view');")
         tables = [row['name'] for _, row in tables_df.iterrows() if not row['name'].startswith('sqlite_')]
         
         for table in tables:
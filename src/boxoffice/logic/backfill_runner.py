@@ -0,0 +1,99 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+from .base_connector import BaseDatabaseConnector
+
+logger = logging.getLogger(__name__)
+
+DONE = "done"
+FAILED = "failed"
+
+
+def date_chunks(start: date, end: date, days: int) -> List[Tuple[str, Tuple[date, date]]]:
+    """start~end(포함)를 days일씩 나눈 [(chunk_key, (구간 시작, 구간 끝))]. chunk_key는 "YYYYMMDD-YYYYMMDD"입니다."""
+    chunks = []
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + timedelta(days=max(1, days) - 1), end)
+        chunks.append((f"{chunk_start:%Y%m%d}-{chunk_end:%Y%m%d}", (chunk_start, chunk_end)))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def year_chunks(start_year: int, end_year: int) -> List[Tuple[str, int]]:
+    """start_year~end_year(포함)를 한 해씩 나눈 [(chunk_key, 연도)]"""
+    return [(str(year), year) for year in range(start_year, end_year + 1)]
+
+
+class BackfillRunner:
+    """
+    백필 구간(chunk)을 여러 워커 스레드로 나눠 실행하고, 구간마다 결과를 backfill_checkpoint 테이블에 기록합니다.
+    이미 끝난(done) 구간은 건너뛰므로 중간에 멈춘 백필을 같은 인자로 다시 실행하면 남은 구간만 이어서 실행합니다.
+    구간 작업은 다시 실행해도 결과가 같게(upsert로) 기록해야 하며, 저장에 실패하면 예외를 올려야 합니다.
+    예외가 난 구간은 failed로 남아 다음 실행에서 다시 시도됩니다.
+    """
+
+    def __init__(self, db: BaseDatabaseConnector, job_name: str, workers: int = 4):
+        self.db = db
+        self.job_name = job_name
+        self.workers = max(1, workers)
+
+    def load_checkpoints(self) -> Dict[str, Dict]:
+        """이 작업의 {chunk_key: 체크포인트 레코드}"""
+        job_name = self.job_name.replace("'", "''")
+        checkpoint_df = self.db.select_query(
+            f"SELECT chunk_key, status, rows, attempts FROM backfill_checkpoint WHERE job_name = '{job_name}'"
+        )
+        if checkpoint_df.empty:
+            return {}
+        return {str(record["chunk_key"]): record for record in checkpoint_df.to_dict("records")}
+
+    def run(self, chunks: List[Tuple[str, Any]], task: Callable[[Any], int], restart: bool = False) -> Dict[str, int]:
+        """
+        chunks의 각 구간에 task(구간 값)를 실행합니다. task는 기록한 행 수를 반환합니다.
+        restart=True이면 체크포인트와 관계없이 모든 구간을 다시 실행합니다. (데이터는 지우지 않습니다)
+        """
+        checkpoints = self.load_checkpoints()
+        pending = [
+            (chunk_key, value) for chunk_key, value in chunks
+            if restart or checkpoints.get(chunk_key, {}).get("status") != DONE
+        ]
+        summary = {"chunks": len(chunks), "skipped": len(chunks) - len(pending), "done": 0, "failed": 0, "rows": 0}
+        logger.info(
+            f"[{self.job_name}] 구간 {len(chunks)}개 중 완료된 {summary['skipped']}개를 건너뛰고 "
+            f"{len(pending)}개를 워커 {self.workers}개로 실행합니다."
+        )
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"backfill-{self.job_name}") as executor:
+            future_to_chunk = {executor.submit(task, value): chunk_key for chunk_key, value in pending}
+            for future in as_completed(future_to_chunk):
+                chunk_key = future_to_chunk[future]
+                record = {
+                    "job_name": self.job_name,
+                    "chunk_key": chunk_key,
+                    "attempts": int(checkpoints.get(chunk_key, {}).get("attempts") or 0) + 1,
+                    "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f"),
+                }
+                try:
+                    rows = int(future.result() or 0)
+                    record.update({"status": DONE, "rows": rows, "error": None})
+                    summary["done"] += 1
+                    summary["rows"] += rows
+                    logger.info(f"[{self.job_name}] {chunk_key} 완료 ({rows}건)")
+                except Exception as e:
+                    record.update({"status": FAILED, "rows": None, "error": str(e)[:500]})
+                    summary["failed"] += 1
+                    logger.error(f"[{self.job_name}] {chunk_key} 실패: {e}", exc_info=True)
+                # 구간이 끝날 때마다 기록하므로 프로세스가 죽어도 끝난 구간은 다시 실행하지 않습니다.
+                # 기록에 실패하면 나머지 구간은 계속 실행하고, 그 구간은 다음 실행에서 다시 실행합니다.
+                try:
+                    self.db.upsert_backfill_checkpoints([record])
+                except Exception as e:
+                    logger.error(f"[{self.job_name}] {chunk_key} 체크포인트 기록 실패: {e}")
+
+        logger.info(
+            f"[{self.job_name}] 백필 종료: 완료 {summary['done']}개, 실패 {summary['failed']}개, "
+            f"건너뜀 {summary['skipped']}개, 기록 {summary['rows']}건"
+        )
+        return summary
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 class BaseDatabaseConnector(ABC):
     """모든 데이터베이스 커넥터가 구현해야 할 추상 기본 클래스"""
@@ -25,6 +25,86 @@ class BaseDatabaseConnector(ABC):
     def insert_goods_stock(self, stocks: pd.DataFrame):
         pass
 
+    @abstractmethod
+    def upsert_stock_response_hashes(self, records: List[Dict]):
+        """이벤트별 재고 응답 해시 (theater_chain, event_id, response_hash, checked_at, changed_at)"""
+        pass
+
+    @abstractmethod
+    def upsert_boxoffice_hashes(self, records: List[Dict]):
+        """박스오피스 행 해시 (target_dt, movie_cd, row_hash, changed_at)"""
+        pass
+
+    @abstractmethod
+    def delete_boxoffice_rows(self, target_dt: str, movie_cds: List[str]):
+        """target_dt(YYYY-MM-DD) 하루의 박스오피스 행과 행 해시 중 movie_cds 영화의 것을 지웁니다."""
+        pass
+
+    @abstractmethod
+    def upsert_stock_poll_state(self, records: List[Dict]):
+        """이벤트별 재고 조회 스케줄 (theater_chain, event_id, interval_seconds, last_polled_at, next_poll_at)"""
+        pass
+
+    @abstractmethod
+    def upsert_scraper_circuit_state(self, records: List[Dict]):
+        """영화관별 회로 차단기 상태 (theater_chain, state, consecutive_failures, opened_at, last_error, updated_at)"""
+        pass
+
+    @abstractmethod
+    def upsert_backfill_checkpoints(self, records: List[Dict]):
+        """백필 구간별 진행 상태 (job_name, chunk_key, status, rows, attempts, error, updated_at)"""
+        pass
+
+    @abstractmethod
+    def try_acquire_lease(self, lease_name: str, holder: str, acquired_at: str, expires_at: str) -> bool:
+        """run_lease 임대가 비었거나 만료됐거나 이미 holder의 것이면 holder로 갱신하고 True를 반환합니다."""
+        pass
+
+    @abstractmethod
+    def release_leases(self, prefix: str, holder: str, released_at: str):
+        """holder가 가진 prefix로 시작하는 임대를 released_at에 만료시킵니다."""
+        pass
+
     @abstractmethod
     def _get_db_column_name(self, logical_name: str) -> str:
         pass
+
+    # --- 대시보드 집계 ---
+
+    @abstractmethod
+    def get_daily_totals(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """기간 내 일별 전체 관객수/매출액 (target_dt, audi_cnt, sales_amt)"""
+        pass
+
+    @abstractmethod
+    def get_top_movies(self, start_date: str, end_date: str, top_n: int = 10) -> pd.DataFrame:
+        """기간 내 관객수 상위 N개 영화 (movie_nm, audi_cnt)"""
+        pass
+
+    @abstractmethod
+    def get_genre_distribution(self, start_date: str, end_date: str, top_n: int = 3) -> pd.DataFrame:
+        """기간 내 상영 영화의 장르 분포 (rep_genre_nm, movie_count, movie_list)"""
+        pass
+
+    @abstractmethod
+    def get_boxoffice_date_range(self) -> pd.DataFrame:
+        """박스오피스가 있는 첫 날짜와 마지막 날짜 (min_dt, max_dt)"""
+        pass
+
+    @abstractmethod
+    def get_boxoffice(self, start_date: str, end_date: str, movie_nms: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        기간 내 박스오피스 행 (target_dt, rank, movie_nm, audi_cnt, audi_inten, audi_acc, sales_amt, open_dt, movie_cd).
+        movie_nms를 주면 해당 영화만 가져옵니다.
+        """
+        pass
+
+    @abstractmethod
+    def get_movie_details(self, movie_cds: List[str]) -> pd.DataFrame:
+        """movie_cds 영화의 상세 정보 (movie_cd, rep_genre_nm, genre_alt, rep_nation_nm, directors)"""
+        pass
+
+    @abstractmethod
+    def get_latest_stock(self, event_id: str) -> pd.DataFrame:
+        """이벤트의 지점별 최신 재고"""
+        pass
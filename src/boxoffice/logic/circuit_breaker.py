@@ -0,0 +1,140 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import pandas as pd
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.RequestException):
+    """차단기가 열려 있어 요청을 보내지 않았습니다. 스크레이퍼의 기존 요청 실패 처리 경로를 그대로 탑니다."""
+
+
+class CircuitBreaker:
+    """
+    영화관(사이트)별 회로 차단기.
+
+    - closed: 정상. 연속 실패(예외, 5xx, 느린 응답)가 failure_threshold회에 이르면 open으로 바뀝니다.
+    - open: cool_down_seconds 동안 요청을 보내지 않고 바로 실패시킵니다.
+    - half_open: 쿨다운이 끝나면 요청 하나만 시험 삼아 보내고, 성공하면 closed, 실패하면 다시 open이 됩니다.
+
+    상태는 실행(프로세스) 사이에 유지되도록 scraper_circuit_state 테이블에 저장/복원합니다.
+    같은 영화관을 여러 프로세스(재고 조회 샤드)가 동시에 쓰므로, 저장할 때는 merge()로 저장된 상태와 합칩니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, cool_down_seconds: int = 900):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cool_down_seconds = cool_down_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.updated_at: Optional[datetime] = None
+        self._probe_in_flight = False
+        # 이 차단기가 half_open 시험 요청을 마지막으로 보낸 시각 (merge에서 저장된 open 상태를 덮어쓸 수 있는지 판단)
+        self._probed_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str):
+        if state != self.state:
+            logger.warning(f"[{self.name}] 회로 차단기 {self.state} → {state} (연속 실패 {self.consecutive_failures}회, 마지막 오류: {self.last_error})")
+        self.state = state
+        self.updated_at = datetime.now()
+        if state == self.OPEN:
+            self.opened_at = self.updated_at
+
+    def _refresh_state(self):
+        if self.state == self.OPEN and datetime.now() - self.opened_at >= timedelta(seconds=self.cool_down_seconds):
+            self._transition(self.HALF_OPEN)
+            self._probe_in_flight = False
+
+    def current_state(self) -> str:
+        """쿨다운이 지났으면 half_open으로 바꾼 뒤 현재 상태를 반환합니다."""
+        with self._lock:
+            self._refresh_state()
+            return self.state
+
+    def allow_request(self) -> bool:
+        """요청을 보내도 되는지 반환합니다. half_open에서는 동시에 하나의 시험 요청만 허용합니다."""
+        with self._lock:
+            self._refresh_state()
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN or self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            self._probed_at = datetime.now()
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self, reason: str):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = reason
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._transition(self.OPEN)
+
+    def snapshot(self) -> Dict:
+        """scraper_circuit_state 테이블에 저장할 레코드"""
+        with self._lock:
+            timestamp_format = "%Y-%m-%d %H:%M:%S.%f"
+            return {
+                "theater_chain": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "opened_at": self.opened_at.strftime(timestamp_format) if self.opened_at else None,
+                "last_error": self.last_error,
+                "updated_at": (self.updated_at or datetime.now()).strftime(timestamp_format),
+            }
+
+    def merge(self, record: Optional[Dict]) -> bool:
+        """
+        같은 영화관의 다른 프로세스가 저장한 상태(record)와 이 차단기의 상태를 합칩니다.
+        저장된 상태를 따르기로 하면 이 차단기를 그 상태로 바꾸고 True를, 이 차단기의 상태를 저장해야 하면 False를 반환합니다.
+
+        저장된 open 상태는 이 차단기가 그보다 나중에 열렸거나, 그 뒤에 half_open 시험 요청을 직접 보낸 경우에만 덮어씁니다.
+        (open이 아닌 상태나 실패 횟수가 더 적은 상태가 다른 샤드가 연 차단기를 닫지 못하게 합니다)
+        """
+        if not record or record.get("state") != self.OPEN:
+            return False
+        stored_opened_at = self._parse_time(record.get("opened_at")) or datetime.min
+        with self._lock:
+            if self.state == self.OPEN and self.opened_at and self.opened_at >= stored_opened_at:
+                return False
+            if self.state != self.OPEN and self._probed_at and self._probed_at >= stored_opened_at:
+                return False
+        self.restore(record)
+        return True
+
+    @staticmethod
+    def _parse_time(value) -> Optional[datetime]:
+        parsed = pd.to_datetime(value, errors='coerce')
+        return None if pd.isna(parsed) else parsed.to_pydatetime().replace(tzinfo=None)
+
+    def restore(self, record: Dict):
+        """scraper_circuit_state 테이블의 레코드로 상태를 복원합니다."""
+        with self._lock:
+            self.state = record.get("state") or self.CLOSED
+            self.consecutive_failures = int(record.get("consecutive_failures") or 0)
+            self.opened_at = self._parse_time(record.get("opened_at"))
+            if self.state == self.OPEN and self.opened_at is None:
+                self.opened_at = datetime.now()
+            last_error = record.get("last_error")
+            self.last_error = last_error if isinstance(last_error, str) else None
+            self._probe_in_flight = False
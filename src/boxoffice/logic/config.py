@@ -22,6 +22,8 @@ class KobisConfig(BaseConfig):
     def __init__(self):
         super().__init__()
         self.key = self.config["kobis"]["key"]
+        # 매일 다시 받는 최근 박스오피스 일수 (KOBIS 사후 정정 반영)
+        self.revision_window_days = int(self.config["kobis"].get("revision_window_days", 7))
 
 class SQLiteConfig(BaseConfig):
     def __init__(self):
@@ -44,3 +46,17 @@ class DatabaseConfig(BaseConfig):
         super().__init__()
         self.type = self.config["database"]["type"]
 
+
+class ReplicationConfig(BaseConfig):
+    def __init__(self):
+        super().__init__()
+        replication = self.config.get("replication", {})
+        self.batch_size = int(replication.get("batch_size", 1000))
+        self.max_batches = int(replication.get("max_batches", 50))
+
+
+class StockPollConfig(BaseConfig):
+    def __init__(self):
+        super().__init__()
+        stock_poll = self.config.get("stock_poll", {})
+        self.request_budget_per_hour = int(stock_poll.get("request_budget_per_hour", 720))
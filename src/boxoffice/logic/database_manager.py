@@ -6,13 +6,14 @@ from .base_connector import BaseDatabaseConnector
 def get_database_connector() -> BaseDatabaseConnector:
     """
     secrets.toml의 database.type 설정에 따라 적절한 데이터베이스 커넥터 인스턴스를 반환합니다.
+    'replicated'인 경우 로컬 SQLite에 쓰고, SupabaseReplicator가 백그라운드로 Supabase에 복제합니다.
     """
     config = DatabaseConfig()
     db_type = config.type.lower()
 
-    if db_type == "sqlite":
+    if db_type in ("sqlite", "replicated"):
         return SQLiteConnector()
     elif db_type == "supabase":
         return SupabaseConnector()
     else:
-        raise ValueError(f"Unsupported database type: {db_type}. Must be 'sqlite' or 'supabase'.")
+        raise ValueError(f"Unsupported database type: {db_type}. Must be 'sqlite', 'supabase' or 'replicated'.")
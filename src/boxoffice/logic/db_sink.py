@@ -0,0 +1,61 @@
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BatchSink:
+    """
+    스크레이퍼가 만들어 내는 레코드를 모았다가 작은 배치로 DB에 씁니다.
+
+    batch_size개가 모이거나 마지막 기록 후 flush_interval초가 지나면 write(records)를 호출합니다.
+    쓰기에 실패하면 버퍼를 비우지 않고 예외를 그대로 올려 다음 flush에서 다시 시도하게 합니다.
+    with 블록을 벗어날 때 남은 레코드를 모두 기록합니다.
+    """
+
+    def __init__(self, write: Callable[[List[Dict]], None], batch_size: int = 100,
+                 flush_interval: Optional[float] = 5.0, name: str = "sink"):
+        self.write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.name = name
+        self.buffer: List[Dict] = []
+        self.written = 0
+        self.flushes = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, record: Dict):
+        self.buffer.append(record)
+        self._maybe_flush()
+
+    def extend(self, records: Iterable[Dict]):
+        for record in records:
+            self.buffer.append(record)
+            if len(self.buffer) >= self.batch_size:
+                self.flush()
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+        elif self.buffer and self.flush_interval is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        records = self.buffer
+        self.write(records)
+        self.buffer = []
+        self.written += len(records)
+        self.flushes += 1
+        self._last_flush = time.monotonic()
+        logger.debug(f"{self.name}: {len(records)}건 기록 (누적 {self.written}건)")
+
+    def __enter__(self) -> "BatchSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
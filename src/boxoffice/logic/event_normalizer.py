@@ -0,0 +1,109 @@
+import os
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+import toml
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "normalization_rules.toml")
+ALL_CHAINS = "*"
+
+# 이벤트 제목에서 영화 제목/굿즈 이름을 뽑을 때 쓰는 정규식 (모든 스크레이퍼 공용)
+BRACKET_CONTENT_PATTERN = re.compile(r'[<\[](.*?)[>\]]')        # 첫 <...> 또는 [...]의 내용
+ANGLE_CONTENT_PATTERN = re.compile(r'<([^<>]+)>')               # 첫 <...>의 내용
+SQUARE_BRACKET_PATTERN = re.compile(r'\[.*?\]')                 # [...] 전체
+ANGLE_BRACKET_PATTERN = re.compile(r'<[^<>]+>')                 # <...> 전체
+BRACKET_WITH_SPACES_PATTERN = re.compile(r'\s*[<\[].*?[>\]]\s*')  # 앞뒤 공백을 포함한 <...>/[...]
+COMMA_PAREN_PATTERN = re.compile(r',\s*(.*?)\s*\)')             # "(..., 굿즈명)"의 굿즈명
+
+
+def first_group(pattern: re.Pattern, text: Optional[str]) -> Optional[str]:
+    """pattern의 첫 그룹을 앞뒤 공백을 제거해 반환합니다. 일치하지 않으면 None"""
+    if not text:
+        return None
+    match = pattern.search(text)
+    return match.group(1).strip() if match else None
+
+
+@lru_cache(maxsize=None)
+def _load_rules(path: str) -> Dict:
+    with open(path, "r", encoding="utf8") as f:
+        return toml.load(f)
+
+
+class EventNormalizer:
+    """
+    영화관 하나의 이벤트 영화 제목/굿즈 이름 정규화기.
+
+    굿즈 이름 규칙은 normalization_rules.toml에서 영화관별로 읽어
+    별칭 → 표준 이름 해시 테이블로 미리 만들어 두므로, 이벤트마다 규칙 전체를 훑지 않습니다.
+    영화 제목은 title_normalizer(스크레이퍼의 MovieTitleIndex 조회)로 정규화합니다.
+    """
+
+    def __init__(self, chain_name: str, title_normalizer: Optional[Callable[[str], str]] = None,
+                 rules_path: str = DEFAULT_RULES_PATH):
+        self.chain_name = chain_name
+        self.title_normalizer = title_normalizer
+        rules = _load_rules(rules_path)
+        self.goods_aliases = self._build_alias_table(rules.get("goods_aliases", {}))
+        self.goods_keywords = self._build_keywords(rules.get("goods_keywords", {}))
+
+    def _chain_rules(self, section: Dict) -> List[Dict]:
+        """모든 영화관 공통 규칙, 영화관별 규칙 순서 (뒤의 규칙이 우선)"""
+        return [section.get(ALL_CHAINS, {}), section.get(self.chain_name, {})]
+
+    def _build_alias_table(self, section: Dict) -> Dict[str, str]:
+        table = {}
+        for rules in self._chain_rules(section):
+            for canonical, aliases in rules.items():
+                if isinstance(aliases, str):
+                    aliases = [aliases]
+                for name in [canonical, *aliases]:
+                    table[name.strip()] = canonical
+        return table
+
+    def _build_keywords(self, section: Dict) -> List[Tuple[str, str]]:
+        common_rules, chain_rules = self._chain_rules(section)
+        keywords = dict(chain_rules)
+        for keyword, goods_name in common_rules.items():
+            keywords.setdefault(keyword, goods_name)
+        return list(keywords.items())
+
+    # --- 개별 정규화 ---
+
+    def goods_name(self, goods_name: Optional[str]) -> str:
+        """별칭이면 표준 이름을, 아니면 원본 이름을 반환합니다."""
+        if not goods_name:
+            return ""
+        return self.goods_aliases.get(goods_name.strip(), goods_name)
+
+    def keyword_goods_name(self, text: Optional[str]) -> Optional[str]:
+        """이벤트 제목에 키워드 규칙이 있으면 해당 굿즈 이름을 반환합니다."""
+        if text:
+            for keyword, goods_name in self.goods_keywords:
+                if keyword in text:
+                    return goods_name
+        return None
+
+    def movie_title(self, raw_title: Optional[str]) -> Optional[str]:
+        if not raw_title:
+            return None
+        return self.title_normalizer(raw_title) if self.title_normalizer else raw_title
+
+    # --- 일괄 정규화 ---
+
+    def normalize_events(self, events: List[Dict]) -> List[Dict]:
+        """
+        스크레이퍼가 만든 이벤트 목록의 movie_title(괄호에서 뽑은 원문)과 goods_name을 한 번에 정규화합니다.
+        같은 영화 제목은 목록 안에서 한 번만 색인을 조회합니다. 이벤트는 제자리에서 바뀌고 같은 목록을 반환합니다.
+        """
+        raw_titles = {event.get("movie_title") for event in events if event.get("movie_title")}
+        titles = {raw_title: self.movie_title(raw_title) for raw_title in raw_titles}
+        for event in events:
+            if event.get("movie_title"):
+                event["movie_title"] = titles[event["movie_title"]]
+            if event.get("goods_name") is not None:
+                event["goods_name"] = self.goods_name(event["goods_name"])
+        return events
+
+    def normalize_event(self, event: Dict) -> Dict:
+        return self.normalize_events([event])[0]
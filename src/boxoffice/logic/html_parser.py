@@ -0,0 +1,205 @@
+import abc
+import logging
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# 메가박스 페이지에서 필요한 노드만 추출하는 HTML 파서 백엔드.
+# selectolax > lxml > BeautifulSoup 순으로 설치된 것을 사용합니다.
+
+
+class HtmlParserBackend(abc.ABC):
+    """메가박스 스크레이핑에 필요한 노드만 파싱하는 백엔드 인터페이스"""
+
+    name: str = ""
+
+    @abc.abstractmethod
+    def parse_event_items(self, html_text: str) -> List[Dict[str, Optional[str]]]:
+        """'div.event-list > div.item'마다 첫 번째 a의 onclick, img의 alt/data-src, p.date 텍스트를 반환합니다."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def parse_goods_button(self, html_text: str) -> Optional[Dict[str, Optional[str]]]:
+        """'button#btnSelectGoodsStock'의 data-nm, data-pn을 {"name", "id"}로 반환합니다."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def parse_branch_stocks(self, html_text: str) -> List[Tuple[Optional[str], Optional[str]]]:
+        """'li.brch'마다 (첫 번째 a 텍스트, 첫 번째 span 텍스트)를 반환합니다. 노드가 없으면 None입니다."""
+        raise NotImplementedError
+
+
+class Bs4Backend(HtmlParserBackend):
+    """
+    BeautifulSoup 백엔드 (lxml/selectolax가 없을 때의 대체 경로).
+    html.parser에서는 SoupStrainer를 써도 토큰화 비용이 그대로라 오히려 느려져 전체 파싱을 사용합니다.
+    """
+
+    name = "bs4"
+
+    def parse_event_items(self, html_text):
+        soup = BeautifulSoup(html_text, 'html.parser')
+        items = []
+        for tag in soup.select("div.event-list > div.item"):
+            link = tag.find("a")
+            img_tag = link.find("img") if link else None
+            period_tag = link.find("p", class_="date") if link else None
+            items.append({
+                "onclick": link.get("onclick", "") if link else None,
+                "img_alt": img_tag.get("alt", "") if img_tag else None,
+                "image_url": img_tag.get("data-src") if img_tag else None,
+                "period": period_tag.get_text(strip=True) if period_tag else "",
+            })
+        return items
+
+    def parse_goods_button(self, html_text):
+        soup = BeautifulSoup(html_text, 'html.parser')
+        button = soup.find("button", id="btnSelectGoodsStock")
+        if not button:
+            return None
+        return {"name": button.get("data-nm"), "id": button.get("data-pn")}
+
+    def parse_branch_stocks(self, html_text):
+        soup = BeautifulSoup(html_text, 'html.parser')
+        results = []
+        for tag in soup.find_all("li", class_="brch"):
+            link, span = tag.find("a"), tag.find("span")
+            results.append((
+                link.get_text(strip=True) if link else None,
+                span.get_text(strip=True) if span else None,
+            ))
+        return results
+
+
+def _has_class_xpath(class_name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+class LxmlBackend(HtmlParserBackend):
+    """lxml 백엔드. libxml2로 파싱한 뒤 XPath로 필요한 노드만 찾습니다."""
+
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        self._fromstring = lxml.html.fromstring
+
+    def _parse(self, html_text: str):
+        if not html_text or not html_text.strip():
+            return None
+        return self._fromstring(html_text)
+
+    @staticmethod
+    def _text(element) -> str:
+        return "".join(t.strip() for t in element.itertext())
+
+    def parse_event_items(self, html_text):
+        root = self._parse(html_text)
+        if root is None:
+            return []
+        items = []
+        xpath = f"//div[{_has_class_xpath('event-list')}]/div[{_has_class_xpath('item')}]"
+        for tag in root.xpath(xpath):
+            links = tag.xpath(".//a")
+            link = links[0] if links else None
+            imgs = link.xpath(".//img") if link is not None else []
+            periods = link.xpath(f".//p[{_has_class_xpath('date')}]") if link is not None else []
+            items.append({
+                "onclick": link.get("onclick", "") if link is not None else None,
+                "img_alt": imgs[0].get("alt", "") if imgs else None,
+                "image_url": imgs[0].get("data-src") if imgs else None,
+                "period": self._text(periods[0]) if periods else "",
+            })
+        return items
+
+    def parse_goods_button(self, html_text):
+        root = self._parse(html_text)
+        buttons = root.xpath("//button[@id='btnSelectGoodsStock']") if root is not None else []
+        if not buttons:
+            return None
+        return {"name": buttons[0].get("data-nm"), "id": buttons[0].get("data-pn")}
+
+    def parse_branch_stocks(self, html_text):
+        root = self._parse(html_text)
+        if root is None:
+            return []
+        results = []
+        for tag in root.xpath(f"//li[{_has_class_xpath('brch')}]"):
+            links, spans = tag.xpath(".//a"), tag.xpath(".//span")
+            results.append((
+                self._text(links[0]) if links else None,
+                self._text(spans[0]) if spans else None,
+            ))
+        return results
+
+
+class SelectolaxBackend(HtmlParserBackend):
+    """selectolax(lexbor) 백엔드. CSS 선택자로 필요한 노드만 찾습니다."""
+
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_cls = LexborHTMLParser
+
+    @staticmethod
+    def _text(node) -> str:
+        return node.text(deep=True, separator="", strip=True)
+
+    def parse_event_items(self, html_text):
+        tree = self._parser_cls(html_text)
+        items = []
+        for tag in tree.css("div.event-list > div.item"):
+            link = tag.css_first("a")
+            img_tag = link.css_first("img") if link else None
+            period_tag = link.css_first("p.date") if link else None
+            items.append({
+                "onclick": (link.attributes.get("onclick") or "") if link else None,
+                "img_alt": (img_tag.attributes.get("alt") or "") if img_tag else None,
+                "image_url": img_tag.attributes.get("data-src") if img_tag else None,
+                "period": self._text(period_tag) if period_tag else "",
+            })
+        return items
+
+    def parse_goods_button(self, html_text):
+        button = self._parser_cls(html_text).css_first("button#btnSelectGoodsStock")
+        if not button:
+            return None
+        return {"name": button.attributes.get("data-nm"), "id": button.attributes.get("data-pn")}
+
+    def parse_branch_stocks(self, html_text):
+        results = []
+        for tag in self._parser_cls(html_text).css("li.brch"):
+            link, span = tag.css_first("a"), tag.css_first("span")
+            results.append((
+                self._text(link) if link else None,
+                self._text(span) if span else None,
+            ))
+        return results
+
+
+BACKENDS = {
+    "selectolax": SelectolaxBackend,
+    "lxml": LxmlBackend,
+    "bs4": Bs4Backend,
+}
+
+
+def get_html_parser(preferred: Optional[str] = None) -> HtmlParserBackend:
+    """
+    사용 가능한 가장 빠른 파서 백엔드를 반환합니다.
+    preferred를 지정하면 해당 백엔드를 먼저 시도하고, 설치되어 있지 않으면 자동 선택으로 넘어갑니다.
+    """
+    order = list(BACKENDS)
+    if preferred:
+        order.insert(0, preferred)
+    for name in order:
+        backend_cls = BACKENDS.get(name)
+        if backend_cls is None:
+            continue
+        try:
+            return backend_cls()
+        except ImportError:
+            logger.debug(f"HTML 파서 백엔드 '{name}'를 사용할 수 없습니다.")
+    return Bs4Backend()
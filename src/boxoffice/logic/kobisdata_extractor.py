@@ -2,6 +2,7 @@ import requests
 import json
 import pandas as pd
 from datetime import datetime, timedelta
+from typing import Iterator, List
 import logging
 from .config import KobisConfig
 from .utils import camel_to_snake, convert_dict_keys_snake_case, infer_col_types_from_df, auto_cast_dataframe
@@ -11,6 +12,7 @@ logger = logging.getLogger(__name__)
 
 class KobisDataExtractor:
     base_url = "http://www.kobis.or.kr/kobisopenapi/webservice/rest/"
+    MOVIE_LIST_PAGE_SIZE = 100
 
     def __init__(self):
         self.kobis_key = kobis_config.key
@@ -56,7 +58,7 @@ class KobisDataExtractor:
     def _request_movie_list(self, cur_page: int, year: str) -> tuple[pd.DataFrame, bool]:
         params = {
             "key": self.kobis_key,
-            "itemPerPage": "100",
+            "itemPerPage": str(self.MOVIE_LIST_PAGE_SIZE),
             "curPage": str(cur_page),
             "openStartDt": year,
             "openEndDt": year
@@ -74,22 +76,65 @@ class KobisDataExtractor:
         ]
         return pd.DataFrame(snake_movie_list), has_more
 
-    def get_MovieList(self, year: int) -> pd.DataFrame:
-        all_movies_for_year = []
+    def iter_movie_list_pages(self, year: int) -> Iterator[pd.DataFrame]:
+        """해당 연도 개봉 영화목록을 페이지 단위로 내려받습니다. 컬럼은 가공 전(snake_case) 그대로입니다."""
         cur_page = 1
         while True:
             movies_page_df, has_more = self._request_movie_list(cur_page, str(year))
             if movies_page_df.empty:
-                break
-            all_movies_for_year.append(movies_page_df)
+                return
+            yield movies_page_df
+            # 한 페이지를 다 채우지 못했으면 마지막 페이지이므로 빈 페이지를 한 번 더 요청하지 않습니다.
+            if not has_more or len(movies_page_df) < self.MOVIE_LIST_PAGE_SIZE:
+                return
             cur_page += 1
-            if not has_more:
-                break
 
+    def get_MovieList(self, year: int) -> pd.DataFrame:
+        all_movies_for_year = list(self.iter_movie_list_pages(year))
         if not all_movies_for_year:
             return pd.DataFrame()
+        return self.clean_movie_list(pd.concat(all_movies_for_year, ignore_index=True))
+
+    def get_movies_by_code(self, movie_cds: List[str]) -> pd.DataFrame:
+        """
+        영화 상세정보 API로 movie_cd별 영화를 가져와 영화목록과 같은 컬럼으로 맞춥니다.
+        박스오피스에 오른 영화를 채우는 용도이므로 영화목록의 필터(영문 제목/감독 없음 등)는 적용하지 않습니다.
+        """
+        movies = []
+        for movie_cd in movie_cds:
+            info = self._request_movie_info(movie_cd)
+            if info:
+                movies.append(self._movie_info_to_list_item(info))
+        if not movies:
+            return pd.DataFrame()
+        return self.clean_movie_list(pd.DataFrame(movies), apply_filters=False)
+
+    @staticmethod
+    def _movie_info_to_list_item(info: dict) -> dict:
+        """영화 상세정보(movieInfo)를 영화목록(movieList) 항목 형태로 바꿉니다."""
+        info = convert_dict_keys_snake_case(info)
+        nations = [n.get("nationNm") for n in info.get("nations", []) if n.get("nationNm")]
+        genres = [g.get("genreNm") for g in info.get("genres", []) if g.get("genreNm")]
+        return {
+            "movie_cd": info.get("movie_cd"),
+            "movie_nm": info.get("movie_nm"),
+            "movie_nm_en": info.get("movie_nm_en"),
+            "prdt_year": info.get("prdt_year"),
+            "open_dt": info.get("open_dt"),
+            "type_nm": info.get("type_nm"),
+            "prdt_stat_nm": info.get("prdt_stat_nm"),
+            "nation_alt": ",".join(nations),
+            "genre_alt": ",".join(genres),
+            "rep_nation_nm": nations[0] if nations else "",
+            "rep_genre_nm": genres[0] if genres else "",
+            "directors": info.get("directors", []),
+            "companys": info.get("companys", []),
+        }
+
+    def clean_movie_list(self, movie_list: pd.DataFrame, apply_filters: bool = True) -> pd.DataFrame:
+        """영화목록 원본을 DB에 넣을 형태로 가공합니다. (감독/영화사 JSON 변환, 성인물 등 필터, 개봉일 형식)"""
+        movie_list = movie_list.copy()
 
-        movie_list = pd.concat(all_movies_for_year, ignore_index=True)
         def process_directors(directors_list):
             if isinstance(directors_list, list):
                 snake_list = [convert_dict_keys_snake_case(d) for d in directors_list]
@@ -112,10 +157,11 @@ class KobisDataExtractor:
         movie_list["directors"] = movie_list["directors"].apply(process_directors)
         movie_list["companys"] = movie_list["companys"].apply(process_companys)
 
-        is_not_adult = movie_list["rep_genre_nm"] != "성인물(에로)"
-        has_eng_title = movie_list["movie_nm_en"].astype(str).str.strip() != ""
-        has_directors = movie_list["directors"].apply(lambda x: len(json.loads(x)) > 0 if x else False)
-        movie_list = movie_list[is_not_adult & has_eng_title & has_directors].copy()
+        if apply_filters:
+            is_not_adult = movie_list["rep_genre_nm"] != "성인물(에로)"
+            has_eng_title = movie_list["movie_nm_en"].astype(str).str.strip() != ""
+            has_directors = movie_list["directors"].apply(lambda x: len(json.loads(x)) > 0 if x else False)
+            movie_list = movie_list[is_not_adult & has_eng_title & has_directors].copy()
 
         # open_dt를 YYYY-MM-DD 형식의 문자열로 변환
         movie_list["open_dt"] = pd.to_datetime(movie_list["open_dt"], errors='coerce').dt.strftime('%Y-%m-%d')
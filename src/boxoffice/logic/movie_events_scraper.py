@@ -1,15 +1,28 @@
 import requests
 import json
 import pandas as pd
-from bs4 import BeautifulSoup
 import re
 from fake_useragent import UserAgent
 import abc
-from typing import List, Dict, TypedDict, Optional, Union
+from typing import List, Dict, TypedDict, Optional, Union, Tuple, Iterator
 import logging
 import html
-from datetime import datetime
+import os
+import time
+import threading
+import zlib
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, date
+from urllib.parse import urlparse
 from .sqlite_connector import SQLiteConnector
+from .movie_title_index import MovieTitleIndex
+from .html_parser import get_html_parser
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .event_normalizer import (
+    EventNormalizer, first_group, BRACKET_CONTENT_PATTERN, ANGLE_CONTENT_PATTERN,
+    SQUARE_BRACKET_PATTERN, ANGLE_BRACKET_PATTERN, BRACKET_WITH_SPACES_PATTERN, COMMA_PAREN_PATTERN,
+)
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -41,104 +54,241 @@ class UnifiedStock(TypedDict):
     total_quantity: Optional[int]
 
 
+class ChainDeadlineExceeded(requests.RequestException):
+    """이번 실행에서 영화관에 허용된 시간(begin_run의 deadline_seconds)을 넘겨 요청을 보내지 않았습니다."""
+
+
 # --- 추상 베이스 클래스 ---
 
 class TheaterEventScraper(abc.ABC):
     """영화관 이벤트 스크레이퍼의 추상 베이스 클래스"""
 
+    # 세션 쿠키 발급을 위해 먼저 방문해야 하는 페이지 (없으면 워밍업하지 않음)
+    WARMUP_URL: Optional[str] = None
+    # 저장된 세션(쿠키)을 재사용할 수 있는 시간
+    SESSION_TTL_SECONDS = 6 * 60 * 60
+    SESSION_CACHE_DIR = os.path.join(os.environ.get("ROOT_PATH", "."), ".cache", "scraper_sessions")
+    # 이미 DB에 있는 이벤트의 상세 정보를 다시 확인하는 주기 (일)
+    KNOWN_EVENT_REVALIDATION_DAYS = 7
+    # 요청 타임아웃 (연결, 읽기) 초
+    REQUEST_TIMEOUT_SECONDS = (5, 20)
+    # 이보다 오래 걸린 응답은 회로 차단기에서 실패로 셉니다.
+    SLOW_RESPONSE_SECONDS = 10
+    # 연속 실패가 이 횟수에 이르면 회로 차단기가 열리고, 쿨다운 동안 이 영화관은 요청하지 않습니다.
+    CIRCUIT_FAILURE_THRESHOLD = 5
+    CIRCUIT_COOL_DOWN_SECONDS = 15 * 60
+
     def __init__(self, chain_name: str):
         self.chain_name = chain_name
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': UserAgent().random})
         self.logger = logging.getLogger(self.__class__.__name__)
         self.db_connector = SQLiteConnector()
+        self.title_index: Optional[MovieTitleIndex] = None
+        self.normalizer = EventNormalizer(chain_name, self._normalize_movie_title)
+        self._session_warmed_at: Optional[float] = None
+        self._session_lock = threading.Lock()
+        self.circuit_breaker = CircuitBreaker(chain_name, self.CIRCUIT_FAILURE_THRESHOLD, self.CIRCUIT_COOL_DOWN_SECONDS)
+        self._deadline: Optional[float] = None
+
+    # --- 실행 예산 (회로 차단기, 마감 시각) ---
+
+    def begin_run(self, deadline_seconds: Optional[float] = None):
+        """이번 실행의 마감 시각을 정합니다. 마감 이후의 요청은 보내지 않고 ChainDeadlineExceeded로 실패시킵니다."""
+        self._deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+
+    def _check_run_budget(self):
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise ChainDeadlineExceeded(f"{self.chain_name} 실행 마감 시간을 초과했습니다.")
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError(f"{self.chain_name} 회로 차단기가 열려 있습니다. (마지막 오류: {self.circuit_breaker.last_error})")
+
+    def _request_timeout(self):
+        """기본 타임아웃을 남은 실행 시간 이내로 줄여서 반환합니다."""
+        connect_timeout, read_timeout = self.REQUEST_TIMEOUT_SECONDS
+        if self._deadline is not None:
+            read_timeout = max(1.0, min(read_timeout, self._deadline - time.monotonic()))
+        return (connect_timeout, read_timeout)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """요청 결과(예외, 5xx, 느린 응답)를 회로 차단기에 기록합니다."""
+        start = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            self.circuit_breaker.record_failure(f"{type(e).__name__}: {e}")
+            raise
+        elapsed = time.monotonic() - start
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure(f"HTTP {response.status_code} ({url})")
+        elif elapsed > self.SLOW_RESPONSE_SECONDS:
+            self.circuit_breaker.record_failure(f"느린 응답 {elapsed:.1f}초 ({url})")
+        else:
+            self.circuit_breaker.record_success()
+        return response
+
+    # --- 세션 관리 ---
+
+    @property
+    def _session_cache_path(self) -> str:
+        return os.path.join(self.SESSION_CACHE_DIR, f"{self.__class__.__name__}.json")
+
+    def _load_session(self) -> bool:
+        """저장된 쿠키가 TTL 이내이면 세션에 복원합니다."""
+        try:
+            with open(self._session_cache_path, "r", encoding="utf8") as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+
+        if time.time() - cached.get("warmed_at", 0) > self.SESSION_TTL_SECONDS:
+            return False
+
+        self.session.headers['User-Agent'] = cached.get("user_agent", self.session.headers['User-Agent'])
+        for cookie in cached.get("cookies", []):
+            self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+        self._session_warmed_at = cached["warmed_at"]
+        self.logger.debug("저장된 세션을 복원했습니다.")
+        return True
+
+    def _save_session(self):
+        cached = {
+            "warmed_at": self._session_warmed_at,
+            "user_agent": self.session.headers['User-Agent'],
+            "cookies": [
+                {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path}
+                for c in self.session.cookies
+            ],
+        }
+        try:
+            os.makedirs(self.SESSION_CACHE_DIR, exist_ok=True)
+            with open(self._session_cache_path, "w", encoding="utf8") as f:
+                json.dump(cached, f)
+        except OSError as e:
+            self.logger.warning(f"세션 저장 실패: {e}")
+
+    def _warm_up(self):
+        """WARMUP_URL을 방문하여 세션 쿠키를 새로 발급받고 저장합니다."""
+        self.logger.info("세션 워밍업을 수행합니다.")
+        self.session.cookies.clear()
+        self._send("GET", self.WARMUP_URL, timeout=self._request_timeout())
+        self._session_warmed_at = time.time()
+        self._save_session()
+
+    def _ensure_session(self, force: bool = False):
+        """세션이 없거나 만료되었을 때만 워밍업합니다. 실행 간에는 저장된 쿠키를 재사용합니다."""
+        if not self.WARMUP_URL:
+            return
+        with self._session_lock:
+            if force:
+                self._warm_up()
+                return
+            if self._session_warmed_at and time.time() - self._session_warmed_at <= self.SESSION_TTL_SECONDS:
+                return
+            if not self._load_session():
+                self._warm_up()
+
+    def _is_session_expired(self, response: requests.Response) -> bool:
+        """401/403 응답 또는 랜딩 페이지로의 리다이렉트를 세션 만료로 간주합니다."""
+        if response.status_code in (401, 403):
+            return True
+        if response.history:
+            landing_paths = {"", "/", urlparse(self.WARMUP_URL).path}
+            return urlparse(response.url).path in landing_paths
+        return False
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        회로 차단기와 실행 마감 시각을 확인하고 세션을 보장한 뒤 요청합니다.
+        세션이 만료된 경우 한 번 재워밍업 후 재시도합니다.
+        """
+        self._check_run_budget()
+        kwargs.setdefault("timeout", self._request_timeout())
+        self._ensure_session()
+        response = self._send(method, url, **kwargs)
+        if self.WARMUP_URL and self._is_session_expired(response):
+            self.logger.info(f"세션 만료가 감지되었습니다. (status={response.status_code}, url={response.url})")
+            self._ensure_session(force=True)
+            response = self._send(method, url, **kwargs)
+        return response
+
+    @classmethod
+    def share_title_index(cls, scrapers: List["TheaterEventScraper"]) -> MovieTitleIndex:
+        """영화 제목 색인을 한 번 만들어 주어진 스크레이퍼들이 공유하도록 합니다. (실행마다 호출)"""
+        title_index = MovieTitleIndex.from_db(scrapers[0].db_connector)
+        for scraper in scrapers:
+            scraper.title_index = title_index
+        return title_index
 
     def _normalize_movie_title(self, title: str) -> str:
-        """영화 제목을 정규화합니다."""
-        # 괄호 안의 내용 제거 (예: [퀴어], <판타스틱4>)
-        title = re.sub(r'[<\[].*?[>\]]', '', title)
-        # 특수문자 제거 및 공백 정규화 (한글, 영어, 숫자, 공백만 허용)
-        title = re.sub(r'[^가-힣a-zA-Z0-9\s]', '', title)
-        title = re.sub(r'\s+', ' ', title).strip()
-
-        if not title:
-            return ""
-
-        # 1. DB에서 최근/개봉예정 영화 후보 목록을 가져옵니다.
-        query1 = """
-            SELECT movie_nm FROM (
-                SELECT movie_nm
-                FROM boxoffice
-                WHERE DATE(target_dt) >= DATE('now', '-1 days')
-                GROUP BY movie_nm
-                UNION
-                SELECT movie_nm
-                FROM movie
-                WHERE DATE(open_dt) > DATE('now', '-1 day')
-                  AND DATE(open_dt) < DATE('now', '7 day')
-                  AND movie_nm NOT IN (SELECT DISTINCT movie_nm FROM boxoffice)
-            )
-        """
-        df1 = self.db_connector.select_query(query1)
-        candidate_movies = df1['movie_nm'].tolist() if not df1.empty else []
+        """영화 제목을 정규화합니다. 색인이 공유되지 않았다면 처음 호출될 때 만듭니다."""
+        if self.title_index is None:
+            self.title_index = MovieTitleIndex.from_db(self.db_connector)
+        return self.title_index.normalize(title)
 
-        # 2. 후보 목록에서 매칭되는 영화를 찾습니다.
-        cleaned_title = title.replace(' ', '').replace(':', '').replace('_', '')
-        
-        def find_best_match(candidates, clean_input):
-            found_matches = []
-            for movie in candidates:
-                cleaned_movie = movie.replace(' ', '').replace(':', '').replace('_', '')
-                if clean_input in cleaned_movie:
-                    # 길이 차이를 계산하여 유사도 점수로 활용
-                    similarity = len(cleaned_movie) - len(clean_input)
-                    found_matches.append((movie, similarity))
-            
-            if found_matches:
-                # 유사도(길이 차이)가 가장 작은 순으로 정렬
-                found_matches.sort(key=lambda x: x[1])
-                return found_matches[0][0]
+    def _get_known_event(self, event_id: str, known_events: Optional[Dict[str, Dict]]) -> Optional[Dict]:
+        """
+        이미 수집된 이벤트라면 저장된 굿즈 정보(goods_id, goods_name, spmtl_no)를 반환하여 상세 조회를 생략하게 합니다.
+        기존 이벤트도 KNOWN_EVENT_REVALIDATION_DAYS일에 한 번씩은 상세 조회로 재검증하며,
+        이벤트 ID 해시로 재검증 날짜를 분산시킵니다.
+        """
+        if not known_events:
             return None
+        known = known_events.get(str(event_id))
+        if not known or not known.get("goods_id"):
+            return None
+        period = self.KNOWN_EVENT_REVALIDATION_DAYS
+        if zlib.crc32(str(event_id).encode()) % period == date.today().toordinal() % period:
+            return None
+        return known
 
-        best_match = find_best_match(candidate_movies, cleaned_title)
-        if best_match:
-            return best_match
-
-        # 3. 최근 목록에 없으면 전체 movie 테이블에서 다시 검색합니다.
-        self.logger.info(f"'{title}'을(를) 최근/개봉예정 목록에서 찾지 못했습니다. 전체 DB를 검색합니다.")
-        query2 = "SELECT movie_nm FROM movie"
-        df2 = self.db_connector.select_query(query2)
-        all_movies = df2['movie_nm'].tolist() if not df2.empty else []
-
-        best_match_from_all = find_best_match(all_movies, cleaned_title)
-        if best_match_from_all:
-            return best_match_from_all
-
-        # 4. 그래도 없으면 원본 제목으로 마지막 검색을 시도합니다.
-        fallback_matches = []
-        for movie in all_movies:
-            if title in movie:
-                fallback_matches.append(movie)
-
-        if fallback_matches:
-            fallback_matches.sort(key=len)
-            return fallback_matches[0]
+    def get_events(self, known_events: Optional[Dict[str, Dict]] = None) -> List[UnifiedEvent]:
+        """
+        진행 중인 굿즈 관련 이벤트를 크롤링하여 통합된 형식의 리스트로 반환합니다.
 
-        # 5. 최종적으로 매칭되는 영화가 없을 경우, 원래 제목 반환
-        return title
+        :param known_events: DB에 이미 저장된 이벤트 {event_id: {goods_id, goods_name, spmtl_no}}.
+                             해당 이벤트는 상세 페이지 요청을 생략합니다.
+        """
+        return list(self.iter_events(known_events))
 
     @abc.abstractmethod
-    def get_events(self) -> List[UnifiedEvent]:
+    def iter_events(self, known_events: Optional[Dict[str, Dict]] = None) -> Iterator[UnifiedEvent]:
         """
-        진행 중인 굿즈 관련 이벤트를 크롤링하여 통합된 형식의 리스트로 반환합니다.
+        get_events와 같지만, 이벤트를 파싱하는 즉시 하나씩 반환합니다.
+        파이프라인은 이를 BatchSink로 받아 전체 수집이 끝나기 전에 DB에 기록합니다.
         """
         raise NotImplementedError
 
-    @abc.abstractmethod
     def get_goods_stock(self, event: UnifiedEvent) -> List[UnifiedStock]:
         """
         특정 이벤트에 해당하는 굿즈의 지점별 재고를 크롤링합니다.
         """
+        stocks, _ = self.get_goods_stock_if_changed(event)
+        return stocks
+
+    def get_goods_stock_if_changed(
+        self, event: UnifiedEvent, previous_hash: Optional[str] = None
+    ) -> Tuple[Optional[List[UnifiedStock]], Optional[str]]:
+        """
+        재고 응답 원문의 해시가 previous_hash와 같으면 파싱을 생략하고 (None, 해시)를 반환합니다.
+        달라졌으면 (재고 목록, 새 해시)를, 요청에 실패하면 ([], None)을 반환합니다.
+        """
+        raw = self._fetch_goods_stock(event)
+        if raw is None:
+            return [], None
+        response_hash = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        if previous_hash is not None and response_hash == previous_hash:
+            return None, response_hash
+        return self._parse_goods_stock(raw), response_hash
+
+    @abc.abstractmethod
+    def _fetch_goods_stock(self, event: UnifiedEvent) -> Optional[bytes]:
+        """재고 API 응답 원문을 반환합니다. 조회할 수 없거나 요청에 실패하면 None입니다."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _parse_goods_stock(self, raw: bytes) -> List[UnifiedStock]:
+        """_fetch_goods_stock의 응답 원문을 지점별 재고로 변환합니다."""
         raise NotImplementedError
 
 
@@ -147,19 +297,21 @@ class TheaterEventScraper(abc.ABC):
 class CGVScraper(TheaterEventScraper):
     """CGV 이벤트 및 재고 스크레이퍼"""
 
-    # 굿즈 이름 정규화 맵
-    GOODS_NORMALIZATION_MAP = {
-        "TTT": "TTT",
-        "SCREENX 와이드 포스터": ["SCREENX 와이드 포스터", "SX 와이드 포스터", "SX 와이드포스터"],
-        "SCREENX 포스터": ["SCREENX 포스터", "SX 포스터", "SX포스터"],
-        "ULTRA 4DX 모먼트라벨": ["ULTRA 4DX 모먼트라벨", "ULTRA4DX모먼트라벨", "4DX MOMENT LABEL & TAG"],
-        "IMAX 포스터": ["IMAX 포스터", "IMAX포스터"],
-        "4DX 포스터": ["4DX 포스터"],
-        # 여기에 추가적인 정규화 규칙을 정의할 수 있습니다.
-    }
+    # 목록 API 한 페이지의 행 수
+    LIST_PAGE_SIZE = 20
+    # totalCount를 확인한 뒤 나머지 페이지를 동시에 요청할 스레드 수
+    LIST_CONCURRENCY = 6
+    # 영화 이벤트 카테고리 ("03": 영화, "01": SPECIAL)
+    MOVIE_EVENT_CATEGORY_CODES = ["03", "01"]
+    GOODS_LISTING = "goods"
 
-    def __init__(self):
+    def __init__(self, movie_events_dump_path: Optional[str] = None):
+        """
+        :param movie_events_dump_path: 지정하면 조회한 영화 이벤트 목록을 이 경로에 CSV로 저장합니다. (디버깅용)
+        """
         super().__init__("CGV")
+        self.movie_events_dump_path = movie_events_dump_path
+        self.MOVIE_EVENT_LIST_URL = "https://event-mobile.cgv.co.kr/evt/evt/evt/searchEvtListForPage"
         self.EVENT_LIST_URL = "https://event-mobile.cgv.co.kr/evt/saprm/saprm/searchSaprmEvtListForPage"
         self.EVENT_DETAIL_URL = "https://event-mobile.cgv.co.kr/evt/saprm/saprm/searchSaprmEvtProdList"
         self.THEATER_STOCK_URL = "https://event-mobile.cgv.co.kr/evt/saprm/saprm/searchSaprmEvtTgtsiteList"
@@ -168,30 +320,11 @@ class CGVScraper(TheaterEventScraper):
             "Origin": "https://cgv.co.kr",
         })
 
-    def _normalize_goods_name(self, goods_name: str) -> str:
-        """굿즈 이름을 정규화합니다."""
-        if not goods_name:
-            return ""
-        
-        cleaned_goods_name = goods_name.strip()
-        
-        for standard_name, aliases in self.GOODS_NORMALIZATION_MAP.items():
-            if cleaned_goods_name == standard_name:
-                return standard_name
-            if isinstance(aliases, list):
-                for alias in aliases:
-                    if cleaned_goods_name == alias:
-                        return standard_name
-            elif cleaned_goods_name == aliases:
-                return standard_name
-        
-        return goods_name # 매칭되는 것이 없으면 원본 이름 반환
-
     def _get_goods_info(self, event_idx: str) -> Optional[Dict[str, str]]:
         """이벤트 ID로 굿즈 정보(ID, 이름)를 조회합니다."""
         try:
             params = {"coCd": "A420", "saprmEvntNo": event_idx}
-            response = self.session.get(self.EVENT_DETAIL_URL, params=params)
+            response = self._request("GET", self.EVENT_DETAIL_URL, params=params)
             response.raise_for_status()
             data = response.json()
             items = data.get("data", [])
@@ -207,107 +340,137 @@ class CGVScraper(TheaterEventScraper):
             self.logger.error(f"굿즈 정보 파싱 실패 (Event ID: {event_idx}): {e}")
         return None
 
-    def _get_movie_events(self) -> List[UnifiedEvent]:
+    def _movie_event_listings(self) -> Dict[str, Tuple[str, Dict]]:
+        """영화 이벤트 카테고리별 목록 API (목록 이름: (URL, 페이지 외 파라미터))"""
+        return {
+            category_code: (self.MOVIE_EVENT_LIST_URL, {
+                "coCd": "A420",
+                "evntCtgryLclsCd": category_code,
+                "sscnsChoiYn": "N",
+                "expnYn": "N",
+                "expoChnlCd": "01",
+            })
+            for category_code in self.MOVIE_EVENT_CATEGORY_CODES
+        }
+
+    def _goods_event_listings(self) -> Dict[str, Tuple[str, Dict]]:
+        return {self.GOODS_LISTING: (self.EVENT_LIST_URL, {"coCd": "A420", "siteNo": ""})}
+
+    def _fetch_list_page(self, url: str, params: Dict, start_row: int) -> Dict:
+        response = self._request("GET", url, params={**params, "startRow": start_row, "listCount": self.LIST_PAGE_SIZE})
+        response.raise_for_status()
+        return response.json().get("data", {}) or {}
+
+    def _fetch_listings(self, listings: Dict[str, Tuple[str, Dict]]) -> Dict[str, List[Dict]]:
+        """
+        여러 목록 API의 모든 페이지를 동시에 조회하여 목록별 항목을 페이지 순서대로 반환합니다.
+        첫 페이지들을 동시에 요청해 totalCount를 확인한 뒤 나머지 페이지를 한꺼번에 요청하므로,
+        이벤트 수와 관계없이 약 두 번의 왕복으로 끝납니다. 실패한 페이지는 로그를 남기고 건너뜁니다.
+        """
+        pages: Dict[Tuple[str, int], List[Dict]] = {}
+
+        def fetch(name: str, start_row: int) -> Optional[Dict]:
+            url, params = listings[name]
+            try:
+                return self._fetch_list_page(url, params, start_row)
+            except requests.RequestException as e:
+                self.logger.error(f"CGV 이벤트 목록 요청 실패 ({name}, startRow={start_row}): {e}")
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                self.logger.error(f"CGV 이벤트 목록 파싱 실패 ({name}, startRow={start_row}): {e}")
+            return None
+
+        with ThreadPoolExecutor(max_workers=self.LIST_CONCURRENCY, thread_name_prefix="cgv-list") as executor:
+            first_pages = {executor.submit(fetch, name, 0): name for name in listings}
+            remaining_pages = {}
+            for future in as_completed(first_pages):
+                name = first_pages[future]
+                data = future.result()
+                if data is None:
+                    continue
+                pages[(name, 0)] = data.get("list") or []
+                if len(pages[(name, 0)]) < self.LIST_PAGE_SIZE:
+                    continue
+                total_count = int(data.get("totalCount") or 0)
+                for start_row in range(self.LIST_PAGE_SIZE, total_count, self.LIST_PAGE_SIZE):
+                    remaining_pages[executor.submit(fetch, name, start_row)] = (name, start_row)
+
+            for future in as_completed(remaining_pages):
+                data = future.result()
+                if data is not None:
+                    pages[remaining_pages[future]] = data.get("list") or []
+
+        self.logger.info(f"CGV 이벤트 목록 {len(pages)}페이지 조회 완료. ({', '.join(listings)})")
+        return {
+            name: [item for key in sorted(key for key in pages if key[0] == name) for item in pages[key]]
+            for name in listings
+        }
+
+    def _parse_movie_event(self, item: Dict) -> UnifiedEvent:
+        event_no = item.get("evntNo")
+        self.logger.debug(f"Processing movie event: {event_no}")
+        event_name = item.get("evntNm")
+
+        # movie_title 추출 (정규화는 _get_movie_events에서 목록 단위로 합니다)
+        movie_title = first_group(BRACKET_CONTENT_PATTERN, event_name)
+
+        # 날짜 형식 변환
+        start_date_str = item.get("evntStartDt", "").split(" ")[0].replace("-", "")
+        end_date_str = item.get("evntEndDt", "").split(" ")[0].replace("-", "")
+        start_date = f"{start_date_str[:4]}.{start_date_str[4:6]}.{start_date_str[6:]}" if start_date_str and len(start_date_str) == 8 else start_date_str
+        end_date = f"{end_date_str[:4]}.{end_date_str[4:6]}.{end_date_str[6:]}" if end_date_str and len(end_date_str) == 8 else end_date_str
+
+        # 이미지 URL 조합
+        image_path = item.get("lagBanrPhyscFilePathnm", "")
+        image_file = item.get("lagBanrPhyscFnm", "")
+        image_url = f"https://cdn.cgv.co.kr/{image_path}/{image_file}" if image_path and image_file else None
+
+        # 이벤트 URL 조합
+        event_url = f"https://cgv.co.kr/evt/eventDetail?evntNo={event_no}&expnYn=N"
+
+        return UnifiedEvent(
+            theater_chain=self.chain_name,
+            event_title=event_name,
+            movie_title=movie_title,
+            goods_name=SQUARE_BRACKET_PATTERN.sub('', event_name).strip(),
+            start_date=start_date,
+            end_date=end_date,
+            event_url=event_url,
+            image_url=image_url,
+            event_id=event_no,
+            goods_id=None,
+            spmtl_no=None
+        )
+
+    def _get_movie_events(self, items_by_listing: Optional[Dict[str, List[Dict]]] = None) -> List[UnifiedEvent]:
         """
         CGV 영화 관련 이벤트 목록을 스크랩합니다.
         (https://event-mobile.cgv.co.kr/evt/evt/evt/searchEvtListForPage)
+        items_by_listing에 _fetch_listings로 미리 조회한 목록이 있으면 그대로 사용합니다.
         """
         self.logger.info("CGV 영화 이벤트 목록 조회를 시작합니다.")
+        listings = self._movie_event_listings()
+        if items_by_listing is None:
+            items_by_listing = self._fetch_listings(listings)
+
         all_events = []
-        # "03": 영화, "01": SPECIAL
-        event_category_codes = ["03", "01"]
-
-        for category_code in event_category_codes:
-            self.logger.info(f"CGV 이벤트 목록 조회를 시작합니다. (카테고리: {category_code})")
-            start_row = 0
-            list_count = 20
-            total_count = -1
-            
-            url = "https://event-mobile.cgv.co.kr/evt/evt/evt/searchEvtListForPage"
-
-            while True:
-                if total_count != -1 and start_row >= total_count:
-                    break
-
-                params = {
-                    "coCd": "A420",
-                    "evntCtgryLclsCd": category_code,
-                    "sscnsChoiYn": "N",
-                    "expnYn": "N",
-                    "expoChnlCd": "01",
-                    "startRow": start_row,
-                    "listCount": list_count,
-                }
+        for category_code in listings:
+            for item in items_by_listing.get(category_code, []):
                 try:
-                    response = self.session.get(url, params=params)
-                    response.raise_for_status()
-                    data = response.json().get("data", {})
-                    
-                    if total_count == -1:
-                        total_count = data.get("totalCount", 0)
-
-                    event_list = data.get("list", [])
-                    if not event_list:
-                        break
+                    all_events.append(self._parse_movie_event(item))
+                except (AttributeError, KeyError, TypeError) as e:
+                    self.logger.warning(f"CGV 영화 이벤트 파싱 중 오류 발생 (카테고리: {category_code}): {item}, 오류: {e}")
 
-                    for item in event_list:
-                        event_no = item.get("evntNo")
-                        self.logger.debug(f"Processing movie event: {event_no}")
-                        event_name = item.get("evntNm")
-                        
-                        # movie_title 추출
-                        movie_title = None
-                        match = re.search(r'[<\[](.*?)[>\]]', event_name)
-                        if match:
-                            movie_title = self._normalize_movie_title(match.group(1).strip())
-
-                        # 날짜 형식 변환
-                        start_date_str = item.get("evntStartDt", "").split(" ")[0].replace("-", "")
-                        end_date_str = item.get("evntEndDt", "").split(" ")[0].replace("-", "")
-                        start_date = f"{start_date_str[:4]}.{start_date_str[4:6]}.{start_date_str[6:]}" if start_date_str and len(start_date_str) == 8 else start_date_str
-                        end_date = f"{end_date_str[:4]}.{end_date_str[4:6]}.{end_date_str[6:]}" if end_date_str and len(end_date_str) == 8 else end_date_str
-
-                        # 이미지 URL 조합
-                        image_path = item.get("lagBanrPhyscFilePathnm", "")
-                        image_file = item.get("lagBanrPhyscFnm", "")
-                        image_url = f"https://cdn.cgv.co.kr/{image_path}/{image_file}" if image_path and image_file else None
-                        
-                        # 이벤트 URL 조합
-                        event_url = f"https://cgv.co.kr/evt/eventDetail?evntNo={event_no}&expnYn=N"
-
-                        all_events.append(UnifiedEvent(
-                            theater_chain=self.chain_name,
-                            event_title=event_name,
-                            movie_title=movie_title,
-                            goods_name=self._normalize_goods_name(re.sub(r'\[.*?\]', '', event_name).strip()),    
-                            start_date=start_date,
-                            end_date=end_date,
-                            event_url=event_url,
-                            image_url=image_url,
-                            event_id=event_no,
-                            goods_id=None,
-                            spmtl_no=None
-                        ))
-                    
-                    start_row += len(event_list)
-                    if len(event_list) < list_count:
-                        break
-
-                except requests.RequestException as e:
-                    self.logger.error(f"CGV 영화 이벤트 목록 요청 실패 (카테고리: {category_code}): {e}")
-                    break
-                except (json.JSONDecodeError, KeyError) as e:
-                    self.logger.error(f"CGV 영화 이벤트 목록 파싱 실패 (카테고리: {category_code}): {e}")
-                    break
-    
+        self.normalizer.normalize_events(all_events)
         self.logger.info(f"총 {len(all_events)}개의 CGV 영화 이벤트를 조회했습니다.")
-        pd.DataFrame(all_events).to_csv("cgv_movie_events.csv", index=False)
+        if self.movie_events_dump_path:
+            pd.DataFrame(all_events).to_csv(self.movie_events_dump_path, index=False)
         return all_events
 
-    def get_events(self) -> List[UnifiedEvent]:
-        # 1. 기본이 되는 굿즈 이벤트와, 정보를 보강할 영화/일반 이벤트를 가져옵니다.
-        goods_events = self._get_goods_events()
-        movie_events = self._get_movie_events()
+    def iter_events(self, known_events: Optional[Dict[str, Dict]] = None) -> Iterator[UnifiedEvent]:
+        # 1. 영화 이벤트 두 카테고리와 굿즈 이벤트 목록을 한꺼번에 조회합니다.
+        #    정보를 보강할 영화/일반 이벤트를 먼저 만들고, 굿즈 이벤트는 파싱되는 대로 보강하여 반환합니다.
+        items_by_listing = self._fetch_listings({**self._movie_event_listings(), **self._goods_event_listings()})
+        movie_events = self._get_movie_events(items_by_listing)
 
         # 2. 영화/일반 이벤트를 빠르게 조회할 수 있도록 두 가지 키로 딕셔너리를 생성합니다.
         #    (movie_title, goods_name) 키와 (movie_title, start_date, end_date) 키
@@ -328,7 +491,8 @@ class CGVScraper(TheaterEventScraper):
                 movie_events_by_date_key[date_key] = event
 
         # 3. 굿즈 이벤트를 순회하며, 매칭되는 영화/일반 이벤트의 정보로 업데이트합니다.
-        for goods_event in goods_events:
+        event_count = 0
+        for goods_event in self._iter_goods_events(known_events, items_by_listing.get(self.GOODS_LISTING, [])):
             updated = False
 
             # 3-1. 1차 시도: movie_title과 goods_name 조합으로 매칭
@@ -362,113 +526,85 @@ class CGVScraper(TheaterEventScraper):
                         if not goods_event.get("image_url") and matching_movie_event.get("image_url"):
                             goods_event["image_url"] = matching_movie_event["image_url"]
 
-        # 4. 업데이트된 굿즈 이벤트 목록을 최종 결과로 반환합니다.
-        self.logger.info(f"총 {len(goods_events)}개의 통합된 이벤트를 조회했습니다.")
-        return goods_events
+            # 4. 업데이트된 굿즈 이벤트를 바로 반환합니다.
+            event_count += 1
+            yield goods_event
 
-    def _get_goods_events(self) -> List[UnifiedEvent]:
-        self.logger.info("CGV 굿즈 이벤트 목록 조회를 시작합니다.")
-        all_events = []
-        start_row = 0
-        list_count = 20
-        total_count = -1
+        self.logger.info(f"총 {event_count}개의 통합된 이벤트를 조회했습니다.")
 
-        while True:
-            if total_count != -1 and start_row >= total_count:
-                break
+    def _iter_goods_events(self, known_events: Optional[Dict[str, Dict]] = None,
+                           goods_items: Optional[List[Dict]] = None) -> Iterator[UnifiedEvent]:
+        """goods_items에 _fetch_listings로 미리 조회한 굿즈 이벤트 목록이 있으면 그대로 사용합니다."""
+        self.logger.info("CGV 굿즈 이벤트 목록 조회를 시작합니다.")
+        if goods_items is None:
+            goods_items = self._fetch_listings(self._goods_event_listings())[self.GOODS_LISTING]
+        event_count = 0
+        detail_requests = 0
 
-            params = {
-                "coCd": "A420",
-                "siteNo": "",
-                "startRow": start_row,
-                "listCount": list_count
-            }
+        for event in goods_items:
             try:
-                response = self.session.get(self.EVENT_LIST_URL, params=params)
-                response.raise_for_status()
-                response_data = response.json()
-                data = response_data.get("data", {})
-
-                if total_count == -1:
-                    total_count = data.get("totalCount", 0)
-
-                event_list = data.get("list", [])
-
-                if not event_list:
-                    break
-
-                for event in event_list:
-                    try:
-                        event_idx = event.get("saprmEvntNo")
-                        if not event_idx:
-                            continue
+                event_idx = event.get("saprmEvntNo")
+                if not event_idx:
+                    continue
 
-                        event_name = event.get("saprmEvntNm") or event.get("evntOnlnExpoNm")
-                        goods_info = self._get_goods_info(event_idx)
+                event_name = event.get("saprmEvntNm") or event.get("evntOnlnExpoNm")
+                known = self._get_known_event(event_idx, known_events)
+                if known:
+                    goods_info = {"id": known["goods_id"], "name": known.get("goods_name"), "spmtlNo": known.get("spmtl_no")}
+                else:
+                    goods_info = self._get_goods_info(event_idx)
+                    detail_requests += 1
                         
-                        goods_id = None
-                        goods_name = None
-                        spmtl_no = None
-                        if goods_info:
-                            goods_id = goods_info.get("id")
-                            goods_name = self._normalize_goods_name(goods_info.get("name"))
-                            spmtl_no = goods_info.get("spmtlNo")
-
-                        movie_title = None
-                        if event_name:
-                            match = re.search(r'[<\[](.*?)[>\]]', event_name)
-                            if match:
-                                movie_title = self._normalize_movie_title(match.group(1).strip())
-                            goods_name = self._normalize_goods_name(re.sub(r'\[.*?\]', '', event_name).strip())
-
-                        start_date_str = event.get("evntStartYmd")
-                        start_date = f"{start_date_str[:4]}.{start_date_str[4:6]}.{start_date_str[6:]}" if start_date_str and len(start_date_str) == 8 else start_date_str                                                                    
-                        end_date_str = event.get("evntEndYmd")                                                                          
-                        end_date = f"{end_date_str[:4]}.{end_date_str[4:6]}.{end_date_str[6:]}" if end_date_str and len(end_date_str) == 8 else end_date_str                     
+                goods_id = None
+                goods_name = None
+                spmtl_no = None
+                if goods_info:
+                    goods_id = goods_info.get("id")
+                    goods_name = goods_info.get("name") or ""
+                    spmtl_no = goods_info.get("spmtlNo")
+
+                movie_title = None
+                if event_name:
+                    movie_title = first_group(BRACKET_CONTENT_PATTERN, event_name)
+                    goods_name = SQUARE_BRACKET_PATTERN.sub('', event_name).strip()
+
+                start_date_str = event.get("evntStartYmd")
+                start_date = f"{start_date_str[:4]}.{start_date_str[4:6]}.{start_date_str[6:]}" if start_date_str and len(start_date_str) == 8 else start_date_str                                                                    
+                end_date_str = event.get("evntEndYmd")                                                                          
+                end_date = f"{end_date_str[:4]}.{end_date_str[4:6]}.{end_date_str[6:]}" if end_date_str and len(end_date_str) == 8 else end_date_str                     
                         
-                        all_events.append(UnifiedEvent(
-                            theater_chain=self.chain_name,
-                            event_title=event_name,
-                            movie_title=movie_title,
-                            goods_name=goods_name,
-                            start_date=start_date,
-                            end_date=end_date,
-                            event_url=f"https://cgv.co.kr/evt/giveawayStateDetail?saprmEvntNo={event_idx}",
-                            image_url=event.get("attchFilePathNm"),
-                            event_id=event_idx,
-                            goods_id=goods_id,
-                            spmtl_no=spmtl_no
-                        ))
-                    except (AttributeError, KeyError) as e:
-                        self.logger.warning(f"개별 이벤트 파싱 중 오류 발생: {event}, 오류: {e}")
-                        continue
-                
-                start_row += len(event_list)
-                if len(event_list) < list_count:
-                    break
+                unified_event = UnifiedEvent(
+                    theater_chain=self.chain_name,
+                    event_title=event_name,
+                    movie_title=movie_title,
+                    goods_name=goods_name,
+                    start_date=start_date,
+                    end_date=end_date,
+                    event_url=f"https://cgv.co.kr/evt/giveawayStateDetail?saprmEvntNo={event_idx}",
+                    image_url=event.get("attchFilePathNm"),
+                    event_id=event_idx,
+                    goods_id=goods_id,
+                    spmtl_no=spmtl_no
+                )
+                self.normalizer.normalize_event(unified_event)
+            except (AttributeError, KeyError) as e:
+                self.logger.warning(f"개별 이벤트 파싱 중 오류 발생: {event}, 오류: {e}")
+                continue
+            event_count += 1
+            yield unified_event
 
-            except requests.RequestException as e:
-                self.logger.error(f"이벤트 목록 요청 실패: {e}")
-                break
-            except (json.JSONDecodeError, KeyError) as e:
-                self.logger.error(f"이벤트 목록 파싱 실패: {e}")
-                break
-        
-        self.logger.info(f"총 {len(all_events)}개의 이벤트를 조회했습니다.")
-        return all_events
+        self.logger.info(f"총 {event_count}개의 이벤트를 조회했습니다. (상세 조회 {detail_requests}건)")
 
-    def get_goods_stock(self, event: UnifiedEvent) -> List[UnifiedStock]:
+    def _fetch_goods_stock(self, event: UnifiedEvent) -> Optional[bytes]:
         event_id = event.get("event_id")
         goods_id = event.get("goods_id")
         spmtl_no = event.get("spmtl_no")
 
         if not event_id or not goods_id or not spmtl_no:
             self.logger.warning(f"재고 조회를 위한 event_id, goods_id, 또는 spmtl_no가 없습니다: event_id={event_id}, goods_id={goods_id}, spmtl_no={spmtl_no}")
-            return []
+            return None
 
         self.logger.info(f"'{event.get('goods_name', 'N/A')}' 재고 조회를 시작합니다. (Event ID: {event_id}, Goods ID: {goods_id}, Spmtl No: {spmtl_no})")
-        all_stocks = []
-        
         params = {
             "coCd": "A420",
             "saprmEvntNo": event_id,
@@ -477,9 +613,17 @@ class CGVScraper(TheaterEventScraper):
         }
         
         try:
-            response = self.session.get(self.THEATER_STOCK_URL, params=params)
+            response = self._request("GET", self.THEATER_STOCK_URL, params=params)
             response.raise_for_status()
-            data = response.json().get("data", [])
+            return response.content
+        except requests.RequestException as e:
+            self.logger.error(f"재고 조회 요청 실패: {e}")
+        return None
+
+    def _parse_goods_stock(self, raw: bytes) -> List[UnifiedStock]:
+        all_stocks = []
+        try:
+            data = json.loads(raw).get("data", [])
             theaters = data if isinstance(data, list) else data.get("list", [])
 
             for theater in theaters:
@@ -508,8 +652,6 @@ class CGVScraper(TheaterEventScraper):
                     quantity=quantity,
                     total_quantity=tot_pay_qty
                 ))
-        except requests.RequestException as e:
-            self.logger.error(f"재고 조회 요청 실패: {e}")
         except (json.JSONDecodeError, KeyError) as e:
             self.logger.error(f"재고 조회 파싱 실패: {e}")
             
@@ -519,6 +661,8 @@ class CGVScraper(TheaterEventScraper):
 class LotteCinemaScraper(TheaterEventScraper):
     """롯데시네마 이벤트 및 재고 스크레이퍼"""
 
+    WARMUP_URL = "https://www.lottecinema.co.kr/NLCHS/Event"
+
     def __init__(self):
         super().__init__("롯데시네마")
         self.BASE_URL = "https://www.lottecinema.co.kr/LCWS/Event/EventData.aspx"
@@ -527,8 +671,8 @@ class LotteCinemaScraper(TheaterEventScraper):
             "Origin": "https://www.lottecinema.co.kr",
         })
 
-    def _make_request(self, method_name: str, params: Dict) -> Optional[Dict]:
-        """롯데시네마 API 요청을 처리하는 헬퍼 함수"""
+    def _post_api(self, method_name: str, params: Dict) -> requests.Response:
+        """롯데시네마 API에 요청하고 응답을 그대로 반환합니다."""
         payload = {
             "MethodName": method_name,
             "channelType": "HO", "osType": "W",
@@ -537,20 +681,22 @@ class LotteCinemaScraper(TheaterEventScraper):
         payload.update(params)
         
         files = {"paramList": (None, json.dumps(payload), "application/json")}
-        
+        # 세션 워밍업은 _request에서 최초 1회(및 만료 시)만 수행됩니다.
+        response = self._request("POST", self.BASE_URL, files=files)
+        response.raise_for_status()
+        return response
+
+    def _make_request(self, method_name: str, params: Dict) -> Optional[Dict]:
+        """롯데시네마 API 요청을 처리하는 헬퍼 함수"""
         try:
-            # 세션 유지를 위해 이벤트 페이지를 먼저 방문
-            self.session.get("https://www.lottecinema.co.kr/NLCHS/Event")
-            response = self.session.post(self.BASE_URL, files=files)
-            response.raise_for_status()
-            return response.json()
+            return self._post_api(method_name, params).json()
         except requests.RequestException as e:
             self.logger.error(f"API 요청 실패 ({method_name}): {e}")
         except json.JSONDecodeError as e:
             self.logger.error(f"API 응답 파싱 실패 ({method_name}): {e}")
         return None
 
-    def get_events(self) -> List[UnifiedEvent]:
+    def iter_events(self, known_events: Optional[Dict[str, Dict]] = None) -> Iterator[UnifiedEvent]:
         self.logger.info("이벤트 목록 조회를 시작합니다.")
         params = {
             "EventClassificationCode": "20", "SearchText": "", "CinemaID": "",
@@ -558,41 +704,47 @@ class LotteCinemaScraper(TheaterEventScraper):
         }
         data = self._make_request("GetEventLists", params)
         if not data or "Items" not in data:
-            return []
+            return
 
-        all_events = []
+        event_count = 0
+        detail_requests = 0
         for item in data["Items"]:
             try:
                 event_id = item.get("EventID")
                 event_name = item.get("EventName", "")
-                
-                # 굿즈 정보 조회
-                detail_data = self._make_request("GetInfomationDeliveryEventDetail", {"EventID": event_id})
-                goods_items = detail_data.get("InfomationDeliveryEventDetail", [{}])[0].get("GoodsGiftItems", [])
-                
-                if not goods_items:
-                    continue
-                
-                goods_info = goods_items[0]
-                goods_id = goods_info.get("FrGiftID")
-                goods_full_name = goods_info.get("FrGiftNm", "")
-
-                # 영화 제목 및 굿즈 이름 파싱
-                movie_title_match = re.search(r'<([^<>]+)>', event_name)
-                movie_title = self._normalize_movie_title(movie_title_match.group(1).strip()) if movie_title_match else None
-
-                if '시그니처 아트카드' in event_name:
-                    goods_name = '시그니처 아트카드'
-                elif 'SPECIAL ART CARD' in event_name:
-                    goods_name = '스페셜 아트카드'
+
+                known = self._get_known_event(event_id, known_events)
+                if known:
+                    goods_id = known["goods_id"]
+                    goods_full_name = None
                 else:
-                    # <...> 제거
-                    cleaned_goods_name = re.sub(r'<[^<>]+>', '', goods_full_name).strip()
-                    # 콤마와 괄호 사이의 내용 추출
-                    goods_match = re.search(r',\s*(.*?)\s*\)', cleaned_goods_name)
-                    goods_name = goods_match.group(1).strip() if goods_match else cleaned_goods_name
+                    # 굿즈 정보 조회
+                    detail_data = self._make_request("GetInfomationDeliveryEventDetail", {"EventID": event_id})
+                    detail_requests += 1
+                    goods_items = detail_data.get("InfomationDeliveryEventDetail", [{}])[0].get("GoodsGiftItems", [])
+
+                    if not goods_items:
+                        continue
 
-                all_events.append(UnifiedEvent(
+                    goods_info = goods_items[0]
+                    goods_id = goods_info.get("FrGiftID")
+                    goods_full_name = goods_info.get("FrGiftNm", "")
+
+                # 영화 제목 및 굿즈 이름 파싱 (키워드 규칙은 normalization_rules.toml)
+                movie_title = first_group(ANGLE_CONTENT_PATTERN, event_name)
+
+                goods_name = self.normalizer.keyword_goods_name(event_name)
+                if goods_name is None:
+                    if goods_full_name is None:
+                        goods_name = known.get("goods_name")
+                    else:
+                        # <...> 제거
+                        cleaned_goods_name = ANGLE_BRACKET_PATTERN.sub('', goods_full_name).strip()
+                        # 콤마와 괄호 사이의 내용 추출
+                        goods_match = COMMA_PAREN_PATTERN.search(cleaned_goods_name)
+                        goods_name = goods_match.group(1).strip() if goods_match else cleaned_goods_name
+
+                unified_event = UnifiedEvent(
                     theater_chain=self.chain_name,
                     event_title=event_name,
                     movie_title=movie_title,
@@ -603,24 +755,37 @@ class LotteCinemaScraper(TheaterEventScraper):
                     image_url=item.get("ImageUrl"),
                     event_id=event_id,
                     goods_id=goods_id
-                ))
+                )
+                self.normalizer.normalize_event(unified_event)
             except (AttributeError, KeyError, IndexError) as e:
                 self.logger.warning(f"개별 이벤트 파싱 중 오류 발생: {item}, 오류: {e}")
                 continue
+            event_count += 1
+            yield unified_event
         
-        self.logger.info(f"총 {len(all_events)}개의 이벤트를 조회했습니다.")
-        return all_events
+        self.logger.info(f"총 {event_count}개의 이벤트를 조회했습니다. (상세 조회 {detail_requests}건)")
 
-    def get_goods_stock(self, event: UnifiedEvent) -> List[UnifiedStock]:
+    def _fetch_goods_stock(self, event: UnifiedEvent) -> Optional[bytes]:
         event_id = event.get("event_id")
         goods_id = event.get("goods_id")
         if not event_id or not goods_id:
             self.logger.warning("재고 조회를 위한 event_id 또는 goods_id가 없습니다.")
-            return []
+            return None
 
         self.logger.info(f"'{event['goods_name']}' 재고 조회를 시작합니다. (Event ID: {event_id}, Goods ID: {goods_id})")
         params = {"EventID": event_id, "GiftID": goods_id}
-        data = self._make_request("GetCinemaGoods", params)
+        try:
+            return self._post_api("GetCinemaGoods", params).content
+        except requests.RequestException as e:
+            self.logger.error(f"API 요청 실패 (GetCinemaGoods): {e}")
+        return None
+
+    def _parse_goods_stock(self, raw: bytes) -> List[UnifiedStock]:
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as e:
+            self.logger.error(f"API 응답 파싱 실패 (GetCinemaGoods): {e}")
+            return []
         if not data or "CinemaDivisionGoods" not in data:
             return []
 
@@ -654,8 +819,15 @@ class LotteCinemaScraper(TheaterEventScraper):
 class MegaboxScraper(TheaterEventScraper):
     """메가박스 이벤트 및 재고 스크레이퍼"""
 
+    WARMUP_URL = "https://www.megabox.co.kr/event/movie"
+    # 이벤트 목록 항목의 onclick 속성에서 이벤트 번호를 추출합니다.
+    EVENT_NO_PATTERN = re.compile(r"fn_eventDetail\('(\d+)'")
+    # HTML 파서 백엔드 ("selectolax", "lxml", "bs4"). None이면 설치된 것 중 가장 빠른 것을 사용합니다.
+    HTML_PARSER_BACKEND: Optional[str] = None
+
     def __init__(self):
         super().__init__("메가박스")
+        self.html_parser = get_html_parser(self.HTML_PARSER_BACKEND)
         self.EVENT_LIST_URL = "https://www.megabox.co.kr/on/oh/ohe/Event/eventMngDiv.do"
         self.EVENT_DETAIL_URL = "https://www.megabox.co.kr/event/detail"
         self.THEATER_STOCK_URL = "https://www.megabox.co.kr/on/oh/ohe/Event/selectGoodsStockPrco.do"
@@ -668,96 +840,86 @@ class MegaboxScraper(TheaterEventScraper):
     def _get_goods_info_from_detail(self, event_no: str) -> Optional[Dict[str, str]]:
         """이벤트 상세 페이지에서 굿즈 정보(이름, 번호)를 조회합니다."""
         try:
-            response = self.session.get(self.EVENT_DETAIL_URL, params={"eventNo": event_no})
+            response = self._request("GET", self.EVENT_DETAIL_URL, params={"eventNo": event_no})
             response.raise_for_status()
             response.encoding = 'utf-8'
-            soup = BeautifulSoup(response.text, 'html.parser')
-            button = soup.find("button", id="btnSelectGoodsStock")
-            if button:
-                goods_data = {"name": button.get("data-nm"), "id": button.get("data-pn")}
-                return goods_data
-            else:
-                return None
+            return self.html_parser.parse_goods_button(response.text)
         except requests.RequestException as e:
             self.logger.error(f"굿즈 정보 조회 실패 (Event No: {event_no}): {e}")
         return None
 
-    def get_events(self) -> List[UnifiedEvent]:
+    def iter_events(self, known_events: Optional[Dict[str, Dict]] = None) -> Iterator[UnifiedEvent]:
         self.logger.info("이벤트 목록 조회를 시작합니다.")
         body = {
             "currentPage": "1", "recordCountPerPage": "1000", "eventStatCd": "ONG",
             "eventTitle": "", "eventDivCd": "CED03", "eventTyCd": "", "orderReqCd": "ONGlist"
         }
-        try:            
-            self.session.get("https://www.megabox.co.kr/event/movie")
-            response = self.session.post(self.EVENT_LIST_URL, data=body)
+        try:
+            response = self._request("POST", self.EVENT_LIST_URL, data=body)
             response.raise_for_status()
             response.encoding = response.apparent_encoding  # 인코딩 자동 감지
-            soup = BeautifulSoup(response.text, 'html.parser')
-            event_tags = soup.select("div.event-list > div.item")
+            event_items = self.html_parser.parse_event_items(response.text)
         except requests.RequestException as e:
             self.logger.error(f"이벤트 목록 요청 실패: {e}")
-            return []
+            return
         except (json.JSONDecodeError, KeyError) as e:
             self.logger.error(f"이벤트 목록 파싱 실패: {e}")
-            return []
+            return
 
-        all_events = []
-        for i, tag in enumerate(event_tags):
+        event_count = 0
+        detail_requests = 0
+        for item in event_items:
             try:
-                link = tag.find("a")
-                if not link: continue
-                 # onclick 속성에서 event_no 추출
-                onclick_attr = link.get("onclick", "")
-                match = re.search(r"fn_eventDetail\('(\d+)'", onclick_attr)
+                onclick_attr = item["onclick"]
+                if onclick_attr is None: continue
+                # onclick 속성에서 event_no 추출
+                match = self.EVENT_NO_PATTERN.search(onclick_attr)
                 if not match:
                     continue
                 event_no = match.group(1)
-                img_tag = link.find("img")
-                if not img_tag: continue
+                if item["img_alt"] is None: continue
 
                 # 원본 alt 텍스트 (HTML entity 포함)
-                raw_goods_name = img_tag.get("alt", "").strip()
+                raw_goods_name = item["img_alt"].strip()
                 event_title = raw_goods_name  # 백업용 저장
-                image_url = img_tag.get("data-src")
-
-                period_tag = link.find("p", class_="date")
-                period = period_tag.get_text(strip=True) if period_tag else ""
+                image_url = item["image_url"]
+                period = item["period"]
 
-                goods_info = self._get_goods_info_from_detail(event_no)
+                known = self._get_known_event(event_no, known_events)
+                if known:
+                    goods_info = {"name": known.get("goods_name") or "", "id": known["goods_id"]}
+                else:
+                    goods_info = self._get_goods_info_from_detail(event_no)
+                    detail_requests += 1
                 if not goods_info:
                     continue
 
                 goods_name = html.unescape(goods_info["name"]).strip()
                 goods_id = goods_info["id"]
 
-                # 영화명 추출
-                movie_title = None
+                # 영화명 추출 (굿즈명 정리가 정규화된 영화명에 따라 달라지므로 여기서 바로 정규화합니다)
                 unescaped_goods_name = html.unescape(raw_goods_name)
-                movie_match_goods = re.search(r'[<\[](.*?)[>\]]', unescaped_goods_name)
-                if movie_match_goods:
-                    movie_title = self._normalize_movie_title(movie_match_goods.group(1).strip())
+                movie_title = self.normalizer.movie_title(first_group(BRACKET_CONTENT_PATTERN, unescaped_goods_name))
 
                 if not movie_title:
                     unescaped_event_title = html.unescape(event_title)
-                    movie_match_event = re.search(r'[<\[](.*?)[>\]]', unescaped_event_title)
-                    if movie_match_event:
-                        movie_title = self._normalize_movie_title(movie_match_event.group(1).strip())
+                    movie_title = self.normalizer.movie_title(first_group(BRACKET_CONTENT_PATTERN, unescaped_event_title))
 
                 # 굿즈명에서 영화명 제거
                 if movie_title:
-                    goods_name = re.sub(r'\s*[<\[].*?[>\]]\s*', '', unescaped_goods_name).strip()
+                    goods_name = BRACKET_WITH_SPACES_PATTERN.sub('', unescaped_goods_name).strip()
                     if not goods_name:
-                        goods_name = re.sub(r'\s*[<\[].*?[>\]]\s*', '', unescaped_event_title).strip()
+                        goods_name = BRACKET_WITH_SPACES_PATTERN.sub('', unescaped_event_title).strip()
                 else:
                     goods_name = unescaped_goods_name
+                goods_name = self.normalizer.goods_name(goods_name)
 
                 # 날짜 파싱
                 dates = [d.strip() for d in period.split('~')]
                 start_date = dates[0] if len(dates) > 0 else None
                 end_date = dates[1] if len(dates) > 1 else None
 
-                all_events.append(UnifiedEvent(
+                unified_event = UnifiedEvent(
                     theater_chain=self.chain_name,
                     event_title=event_title,
                     movie_title=movie_title,
@@ -768,43 +930,44 @@ class MegaboxScraper(TheaterEventScraper):
                     image_url=image_url,
                     event_id=event_no,
                     goods_id=goods_id
-                ))            
+                )
             except (AttributeError, KeyError) as e:
-                self.logger.warning(f"개별 이벤트 파싱 중 오류 발생: {tag}, 오류: {e}")
+                self.logger.warning(f"개별 이벤트 파싱 중 오류 발생: {item}, 오류: {e}")
                 continue
+            event_count += 1
+            yield unified_event
         
-        self.logger.info(f"총 {len(all_events)}개의 이벤트를 조회했습니다.")
-        return all_events
+        self.logger.info(f"총 {event_count}개의 이벤트를 조회했습니다. (상세 조회 {detail_requests}건)")
 
 
-    def get_goods_stock(self, event: UnifiedEvent) -> List[UnifiedStock]:
+    def _fetch_goods_stock(self, event: UnifiedEvent) -> Optional[bytes]:
         goods_id = event.get("goods_id")
         if not goods_id:
             self.logger.warning("재고 조회를 위한 goods_id가 없습니다.")
-            return []
+            return None
 
         self.logger.info(f"'{event['goods_name']}' 재고 조회를 시작합니다. (Goods ID: {goods_id})")
-        
-        all_stocks = []
         body = {"goodsNo": goods_id}
         
         try:
-            response = self.session.post(self.THEATER_STOCK_URL, data=body)
+            response = self._request("POST", self.THEATER_STOCK_URL, data=body)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            theater_tags = soup.find_all("li", class_="brch")
+            return response.content
+        except requests.RequestException as e:
+            self.logger.error(f"재고 조회 요청 실패: {e}")
+        return None
 
-            for tag in theater_tags:
-                theater_name = tag.find("a").get_text(strip=True) if tag.find("a") else "알 수 없는 지점"
-                status = tag.find("span").get_text(strip=True) if tag.find("span") else "알 수 없음"
+    def _parse_goods_stock(self, raw: bytes) -> List[UnifiedStock]:
+        all_stocks = []
+        try:
+            html_text = raw.decode('utf-8', errors='replace')
+            for theater_name, status in self.html_parser.parse_branch_stocks(html_text):
                 all_stocks.append(UnifiedStock(
                     theater_chain=self.chain_name,
-                    theater_name=theater_name,
-                    status=status,
+                    theater_name=theater_name if theater_name is not None else "알 수 없는 지점",
+                    status=status if status is not None else "알 수 없음",
                     quantity=None
                 ))
-        except requests.RequestException as e:
-            self.logger.error(f"재고 조회 요청 실패: {e}")
         except Exception as e:
             self.logger.error(f"재고 조회 파싱 실패: {e}")
             
@@ -0,0 +1,120 @@
+import re
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from .base_connector import BaseDatabaseConnector
+
+logger = logging.getLogger(__name__)
+
+_BRACKET_PATTERN = re.compile(r'[<\[].*?[>\]]')
+_DISALLOWED_CHAR_PATTERN = re.compile(r'[^가-힣a-zA-Z0-9\s]')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_COMPACT_TABLE = str.maketrans('', '', ' :_')
+
+
+def clean_title(title: str) -> str:
+    """괄호 내용과 특수문자를 제거하고 공백을 정규화합니다. (예: '[퀴어] <판타스틱4>' 제거)"""
+    title = _BRACKET_PATTERN.sub('', title)
+    title = _DISALLOWED_CHAR_PATTERN.sub('', title)
+    return _WHITESPACE_PATTERN.sub(' ', title).strip()
+
+
+def compact_title(title: str) -> str:
+    """비교용으로 공백, ':', '_'를 제거합니다."""
+    return title.translate(_COMPACT_TABLE)
+
+
+class _TitleTier:
+    """하나의 후보 목록(최근 상영작 또는 전체 영화)에 대한 bigram 역색인"""
+
+    def __init__(self, movie_names: List[str]):
+        self.entries: List[Tuple[str, str]] = []
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        seen = set()
+        for movie_nm in movie_names:
+            if not movie_nm or movie_nm in seen:
+                continue
+            seen.add(movie_nm)
+            compact = compact_title(movie_nm)
+            idx = len(self.entries)
+            self.entries.append((movie_nm, compact))
+            for gram in self._bigrams(compact):
+                self.postings[gram].add(idx)
+
+    @staticmethod
+    def _bigrams(text: str) -> Set[str]:
+        return {text[i:i + 2] for i in range(len(text) - 1)}
+
+    def find_best_match(self, compact_input: str) -> Optional[str]:
+        """compact_input을 포함하는 제목 중 길이 차이가 가장 작은 것(동률이면 먼저 등록된 것)을 반환합니다."""
+        grams = self._bigrams(compact_input)
+        if grams:
+            postings = sorted((self.postings.get(g, set()) for g in grams), key=len)
+            candidate_ids = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidate_ids = range(len(self.entries))
+
+        best: Optional[Tuple[int, int]] = None
+        for idx in candidate_ids:
+            compact = self.entries[idx][1]
+            if compact_input in compact:
+                key = (len(compact) - len(compact_input), idx)
+                if best is None or key < best:
+                    best = key
+        return self.entries[best[1]][0] if best else None
+
+
+class MovieTitleIndex:
+    """
+    이벤트 제목 → DB 영화명 매칭용 인메모리 색인.
+    실행마다 한 번만 DB에서 만들어 모든 스크레이퍼가 공유하며, 조회 시에는 SQL을 실행하지 않습니다.
+
+    매칭은 최근 상영/개봉예정작 tier를 먼저 보고, 없으면 전체 movie tier를 봅니다.
+    """
+
+    RECENT_MOVIES_QUERY = """
+        SELECT movie_nm FROM (
+            SELECT movie_nm
+            FROM boxoffice
+            WHERE DATE(target_dt) >= DATE('now', '-1 days')
+            GROUP BY movie_nm
+            UNION
+            SELECT movie_nm
+            FROM movie
+            WHERE DATE(open_dt) > DATE('now', '-1 day')
+              AND DATE(open_dt) < DATE('now', '7 day')
+              AND movie_nm NOT IN (SELECT DISTINCT movie_nm FROM boxoffice)
+        )
+    """
+    ALL_MOVIES_QUERY = "SELECT movie_nm FROM movie"
+
+    def __init__(self, recent_movies: List[str], all_movies: List[str]):
+        self.tiers = [_TitleTier(recent_movies), _TitleTier(all_movies)]
+        self._cache: Dict[str, str] = {}
+
+    @classmethod
+    def from_db(cls, db_connector: BaseDatabaseConnector) -> "MovieTitleIndex":
+        recent_df = db_connector.select_query(cls.RECENT_MOVIES_QUERY)
+        all_df = db_connector.select_query(cls.ALL_MOVIES_QUERY)
+        recent_movies = recent_df['movie_nm'].tolist() if not recent_df.empty else []
+        all_movies = all_df['movie_nm'].tolist() if not all_df.empty else []
+        logger.info(f"영화 제목 색인 생성: 최근 {len(recent_movies)}편, 전체 {len(all_movies)}편")
+        return cls(recent_movies, all_movies)
+
+    def normalize(self, title: str) -> str:
+        """이벤트에서 추출한 제목을 DB의 영화명으로 정규화합니다. 매칭되지 않으면 정리된 제목을 반환합니다."""
+        if title in self._cache:
+            return self._cache[title]
+
+        cleaned = clean_title(title)
+        result = cleaned
+        if cleaned:
+            compact_input = compact_title(cleaned)
+            for tier in self.tiers:
+                match = tier.find_best_match(compact_input)
+                if match:
+                    result = match
+                    break
+
+        self._cache[title] = result
+        return result
@@ -0,0 +1,65 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from .base_connector import BaseDatabaseConnector
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+class RunLease:
+    """
+    DB(run_lease 테이블)에 기록하는 실행 임대(lease).
+
+    같은 이름의 임대는 한 번에 한 holder(Dagster run_id)만 가질 수 있고, 같은 holder는 다시 얻을 수 있습니다.
+    holder가 비정상 종료해 release하지 못해도 ttl_seconds가 지나면 만료되어 다음 실행이 가져갑니다.
+    영화관별 재고 조회 임대 이름은 "goods_stock:<영화관>"입니다.
+    """
+
+    def __init__(self, db: BaseDatabaseConnector, prefix: str, ttl_seconds: int):
+        self.db = db
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    def lease_name(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def acquire(self, key: str, holder: str, now: Optional[datetime] = None) -> bool:
+        """임대를 얻으면 True. 다른 holder의 임대가 아직 만료되지 않았으면 False"""
+        now = now or datetime.now()
+        acquired = self.db.try_acquire_lease(
+            self.lease_name(key), holder,
+            now.strftime(TIMESTAMP_FORMAT), (now + timedelta(seconds=self.ttl_seconds)).strftime(TIMESTAMP_FORMAT),
+        )
+        if not acquired:
+            logger.info(f"[{self.lease_name(key)}] 다른 실행이 임대 중이라 얻지 못했습니다.")
+        return acquired
+
+    def release(self, holder: str, now: Optional[datetime] = None):
+        """holder가 가진 이 prefix의 임대를 모두 바로 만료시킵니다."""
+        now = now or datetime.now()
+        self.db.release_leases(f"{self.prefix}:", holder, now.strftime(TIMESTAMP_FORMAT))
+
+    def held(self, now: Optional[datetime] = None, exclude_holder: Optional[str] = None) -> Dict[str, Dict]:
+        """아직 만료되지 않은 임대 {key: {holder, acquired_at, expires_at}}"""
+        now = (now or datetime.now()).strftime(TIMESTAMP_FORMAT)
+        leases_df = self.db.select_query(
+            f"SELECT lease_name, holder, acquired_at, expires_at FROM run_lease "
+            f"WHERE lease_name LIKE '{self.prefix}:%' AND expires_at > '{now}'"
+        )
+        if leases_df.empty:
+            return {}
+        return {
+            record["lease_name"][len(self.prefix) + 1:]: record
+            for record in leases_df.to_dict("records")
+            if record["holder"] != exclude_holder
+        }
+
+    @staticmethod
+    def describe(leases: Dict[str, Dict]) -> List[str]:
+        """스킵 사유에 남길 "<key>(run <holder 앞 8자리>, <만료 시각>까지)" 목록"""
+        return [
+            f"{key}(run {str(record['holder'])[:8]}, {str(record['expires_at'])[:19]}까지)"
+            for key, record in leases.items()
+        ]
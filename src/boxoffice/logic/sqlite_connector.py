@@ -1,15 +1,25 @@
+import logging
 import sqlite3
 import pandas as pd
-from sqlalchemy import create_engine, types
+from datetime import datetime
+from sqlalchemy import create_engine
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .config import SQLiteConfig
 from .base_connector import BaseDatabaseConnector
 
+logger = logging.getLogger(__name__)
+
 class SQLiteConnector(BaseDatabaseConnector):
-    def __init__(self):
-        self.config = SQLiteConfig()
-        self.db_path = self.config.db_path
+    # 재고 상태 코드. 여기에 없는 상태는 stock_status 테이블에 새 코드로 추가됩니다. (db/supabase/tables.sql과 같은 값)
+    STOCK_STATUSES = {"보유": 1, "소진중": 2, "소량보유": 3, "소진": 4, "품절": 5, "준비중": 6, "알 수 없음": 7}
+    # 자연 키. 같은 키의 행은 덮어씁니다. (SupabaseConnector의 on_conflict 컬럼과 같은 값)
+    NATURAL_KEYS = {"boxoffice": ("movie_cd", "target_dt"), "movie": ("movie_cd",)}
+
+    def __init__(self, db_path: Optional[str] = None):
+        # db_path를 넘기면(테스트, 복제 대상 등) secrets.toml의 경로 대신 사용합니다.
+        self.config = None if db_path else SQLiteConfig()
+        self.db_path = db_path or self.config.db_path
         self.engine = create_engine(f"sqlite:///{self.db_path}")
 
         self.create_tables()
@@ -40,6 +50,9 @@ class SQLiteConnector(BaseDatabaseConnector):
                 directors TEXT, companys TEXT
             );
             """)
+            self._create_natural_keys(cursor)
+            # 대시보드가 날짜/기간으로 박스오피스를 조회할 때 쓰는 인덱스 (target_dt에 함수를 씌우지 않고 범위로 비교)
+            cursor.execute("CREATE INDEX IF NOT EXISTS boxoffice_target_dt ON boxoffice (target_dt)")
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS goods_event (
                 event_id TEXT PRIMARY KEY,
@@ -55,14 +68,70 @@ class SQLiteConnector(BaseDatabaseConnector):
                 spmtl_no TEXT
             );
             """)
+            self._create_stock_tables(cursor)
+            # 이벤트별 마지막 재고 응답 해시. 응답이 같으면 goods_stock에 쓰지 않고 checked_at만 갱신합니다.
             cursor.execute("""
-            CREATE TABLE IF NOT EXISTS goods_stock (
-                scraped_at DATETIME,
-                theater_name TEXT,
+            CREATE TABLE IF NOT EXISTS goods_stock_hash (
+                theater_chain TEXT,
                 event_id TEXT,
+                response_hash TEXT,
+                checked_at DATETIME,
+                changed_at DATETIME,
+                PRIMARY KEY (theater_chain, event_id)
+            );
+            """)
+            # 날짜/영화별 박스오피스 행 해시. 다시 받은 행 중 해시가 바뀐(정정된) 행만 boxoffice에 씁니다.
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS boxoffice_hash (
+                target_dt DATE,
+                movie_cd TEXT,
+                row_hash TEXT,
+                changed_at DATETIME,
+                PRIMARY KEY (target_dt, movie_cd)
+            );
+            """)
+            self._create_boxoffice_change_log(cursor)
+            # 백필 CLI(src/scripts/backfill.py)의 구간별 진행 상태. 끝난 구간은 다시 실행할 때 건너뜁니다.
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_checkpoint (
+                job_name TEXT,
+                chunk_key TEXT,
                 status TEXT,
-                quantity TEXT,
-                total_quantity INTEGER
+                rows INTEGER,
+                attempts INTEGER,
+                error TEXT,
+                updated_at DATETIME,
+                PRIMARY KEY (job_name, chunk_key)
+            );
+            """)
+            # 실행 임대(lease). 영화관별 재고 조회가 겹쳐 실행되지 않게 합니다. (RunLease)
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS run_lease (
+                lease_name TEXT PRIMARY KEY,
+                holder TEXT,
+                acquired_at DATETIME,
+                expires_at DATETIME
+            );
+            """)
+            # 적응형 재고 조회 스케줄러의 이벤트별 조회 간격과 다음 조회 시각
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS goods_stock_poll (
+                theater_chain TEXT,
+                event_id TEXT PRIMARY KEY,
+                interval_seconds INTEGER,
+                last_polled_at DATETIME,
+                next_poll_at DATETIME
+            );
+            """)
+            # 영화관별 스크레이퍼 회로 차단기 상태
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scraper_circuit_state (
+                theater_chain TEXT PRIMARY KEY,
+                state TEXT,
+                consecutive_failures INTEGER,
+                opened_at DATETIME,
+                last_error TEXT,
+                updated_at DATETIME
             );
             """)
             conn.commit()
@@ -70,8 +139,210 @@ class SQLiteConnector(BaseDatabaseConnector):
             cursor.close()
             conn.close()
 
+    def _create_natural_keys(self, cursor):
+        """
+        boxoffice/movie에 자연 키 유니크 인덱스를 만듭니다.
+        인덱스를 처음 만들 때는 같은 키의 중복 행 중 마지막으로 들어온 행만 남깁니다.
+        """
+        for table_name, key_columns in self.NATURAL_KEYS.items():
+            index_name = f"{table_name}_natural_key"
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index_name,))
+            if cursor.fetchone():
+                continue
+            key = ", ".join(key_columns)
+            cursor.execute(f"DELETE FROM {table_name} WHERE rowid NOT IN (SELECT MAX(rowid) FROM {table_name} GROUP BY {key})")
+            cursor.execute(f"CREATE UNIQUE INDEX {index_name} ON {table_name} ({key})")
+
+    def _create_boxoffice_change_log(self, cursor):
+        """
+        박스오피스 행의 변경 기록(boxoffice_change)을 만듭니다. replicated 모드에서 SupabaseReplicator가 seq 순서대로 Supabase에 반영합니다.
+        boxoffice는 AUTOINCREMENT가 아니라서 가장 큰 rowid의 행을 지우면 그 rowid를 다시 쓰므로, rowid 대신 단조 증가하는 seq로 복제합니다.
+        변경 기록을 처음 만들 때는 예전 삭제 기록(boxoffice_deletion)과 기존 행을 차례로 옮겨 한 번 전체를 다시 복제합니다.
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'boxoffice_change'")
+        if cursor.fetchone():
+            return
+        cursor.execute("""
+        CREATE TABLE boxoffice_change (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            target_dt DATE,
+            movie_cd TEXT,
+            op TEXT,
+            changed_at DATETIME
+        );
+        """)
+        changed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'boxoffice_deletion'")
+        if cursor.fetchone():
+            cursor.execute("""
+            INSERT INTO boxoffice_change (target_dt, movie_cd, op, changed_at)
+            SELECT target_dt, movie_cd, 'delete', deleted_at FROM boxoffice_deletion ORDER BY rowid
+            """)
+            cursor.execute("DROP TABLE boxoffice_deletion")
+        cursor.execute("""
+        INSERT INTO boxoffice_change (target_dt, movie_cd, op, changed_at)
+        SELECT target_dt, movie_cd, 'upsert', ? FROM boxoffice ORDER BY rowid
+        """, (changed_at,))
+
+    def _replace_rows(self, table_name: str, df: pd.DataFrame):
+        """
+        df의 행을 자연 키(NATURAL_KEYS) 기준으로 덮어씁니다. 같은 df를 여러 번 넣어도 결과가 같습니다.
+        INSERT OR REPLACE는 기존 행을 지우고 새 rowid로 넣으므로, 바뀐 행도 SupabaseReplicator가 다시 복제합니다.
+        boxoffice는 같은 트랜잭션에서 boxoffice_change에 변경을 기록합니다.
+        """
+        if df.empty:
+            return
+        df = df.rename(columns=self._get_db_column_name)
+        for col in df.select_dtypes(include=["datetime", "datetimetz"]).columns:
+            # to_sql로 넣던 기존 행과 같은 문자열 형식
+            df[col] = df[col].dt.strftime("%Y-%m-%d %H:%M:%S.%f")
+        df = df.astype(object).where(df.notna(), None)
+        columns = ", ".join(df.columns)
+        placeholders = ", ".join("?" * len(df.columns))
+        conn = self._get_connection()
+        try:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table_name} ({columns}) VALUES ({placeholders})",
+                df.itertuples(index=False, name=None),
+            )
+            if table_name == "boxoffice":
+                changed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+                conn.executemany(
+                    "INSERT INTO boxoffice_change (target_dt, movie_cd, op, changed_at) VALUES (?, ?, 'upsert', ?)",
+                    [(target_dt, movie_cd, changed_at) for target_dt, movie_cd in zip(df["target_dt"], df["movie_cd"])],
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _create_stock_tables(self, cursor):
+        """
+        재고는 정수 컬럼만 가진 goods_stock_fact에 저장하고, 지점/이벤트/상태 문자열은 차원 테이블에 한 번만 저장합니다.
+        - theater: 영화관별 지점 (theater_id)
+        - goods_event_key: 이벤트 ID 문자열의 정수 대리키 (event_key)
+        - stock_status: 재고 상태 코드 (status_code)
+        - goods_stock_fact.scraped_at: 수집 시각을 1970-01-01 00:00 기준 초로 저장합니다. (시간대 변환 없음)
+          초 미만은 버리므로 같은 이벤트/지점을 1초 안에 두 번 수집하면 나중 값만 남습니다.
+        기존 쿼리는 같은 컬럼을 제공하는 goods_stock 뷰로 조회합니다.
+        예전 goods_stock 테이블이 남아 있으면 뷰를 만들지 않으므로, migrate_legacy_goods_stock()을 한 번 실행해야 합니다.
+        """
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS theater (
+            theater_id INTEGER PRIMARY KEY,
+            theater_chain TEXT NOT NULL DEFAULT '',
+            theater_name TEXT NOT NULL,
+            UNIQUE (theater_chain, theater_name)
+        );
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS goods_event_key (
+            event_key INTEGER PRIMARY KEY,
+            event_id TEXT NOT NULL UNIQUE
+        );
+        """)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stock_status (
+            status_code INTEGER PRIMARY KEY,
+            status TEXT NOT NULL UNIQUE
+        );
+        """)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO stock_status (status_code, status) VALUES (?, ?)",
+            [(code, status) for status, code in self.STOCK_STATUSES.items()],
+        )
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS goods_stock_fact (
+            scraped_at INTEGER NOT NULL,
+            event_key INTEGER NOT NULL,
+            theater_id INTEGER NOT NULL,
+            status_code INTEGER,
+            quantity INTEGER,
+            total_quantity INTEGER,
+            PRIMARY KEY (event_key, theater_id, scraped_at)
+        );
+        """)
+        # 최근 구간만 읽는 조회(StockPollScheduler.load_stock_metrics)용 인덱스
+        cursor.execute("CREATE INDEX IF NOT EXISTS goods_stock_fact_scraped_at ON goods_stock_fact (scraped_at)")
+
+        if self._has_legacy_goods_stock(cursor):
+            logger.warning(
+                "예전 goods_stock 테이블이 남아 있어 goods_stock 뷰를 만들지 않았습니다. "
+                "python -m src.scripts.migrate_goods_stock 으로 새 테이블로 옮기세요."
+            )
+            return
+        self._create_stock_view(cursor)
+
+    @staticmethod
+    def _has_legacy_goods_stock(cursor) -> bool:
+        legacy = cursor.execute("SELECT type FROM sqlite_master WHERE name = 'goods_stock'").fetchone()
+        return bool(legacy) and legacy[0] == 'table'
+
+    def _create_stock_view(self, cursor):
+        cursor.execute("""
+        CREATE VIEW IF NOT EXISTS goods_stock AS
+        SELECT datetime(f.scraped_at, 'unixepoch') AS scraped_at,
+               t.theater_name,
+               k.event_id,
+               s.status,
+               CAST(f.quantity AS TEXT) AS quantity,
+               f.total_quantity
+        FROM goods_stock_fact f
+        JOIN theater t ON t.theater_id = f.theater_id
+        JOIN goods_event_key k ON k.event_key = f.event_key
+        LEFT JOIN stock_status s ON s.status_code = f.status_code;
+        """)
+
+    def migrate_legacy_goods_stock(self) -> int:
+        """
+        문자열 컬럼으로 저장하던 예전 goods_stock 테이블을 차원/팩트 테이블로 옮기고, 옮긴 행 수를 반환합니다.
+        예전 테이블은 지우지 않고 goods_stock_legacy로 이름을 바꾼 뒤 그 자리에 goods_stock 뷰를 만듭니다.
+        scraped_at의 초 미만은 버리며, insert_goods_stock과 같이 같은 초에 수집한 행은 나중 값이 남습니다. 옮길 테이블이 없으면 아무것도 하지 않고 0을 반환합니다.
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            if not self._has_legacy_goods_stock(cursor):
+                return 0
+            self._copy_legacy_goods_stock(cursor)
+            migrated = cursor.execute("SELECT COUNT(*) FROM goods_stock").fetchone()[0]
+            cursor.execute("ALTER TABLE goods_stock RENAME TO goods_stock_legacy")
+            self._create_stock_view(cursor)
+            conn.commit()
+            return migrated
+        finally:
+            conn.close()
+
+    def _copy_legacy_goods_stock(self, cursor):
+        cursor.execute("""
+            INSERT OR IGNORE INTO theater (theater_chain, theater_name)
+            SELECT DISTINCT COALESCE(e.theater_chain, ''), s.theater_name
+            FROM goods_stock s LEFT JOIN goods_event e ON e.event_id = CAST(s.event_id AS TEXT)
+            WHERE s.theater_name IS NOT NULL
+        """)
+        cursor.execute("""
+            INSERT OR IGNORE INTO goods_event_key (event_id)
+            SELECT DISTINCT CAST(event_id AS TEXT) FROM goods_stock WHERE event_id IS NOT NULL
+        """)
+        cursor.execute("""
+            INSERT OR IGNORE INTO stock_status (status)
+            SELECT DISTINCT status FROM goods_stock WHERE status IS NOT NULL
+        """)
+        cursor.execute("""
+            INSERT OR REPLACE INTO goods_stock_fact (scraped_at, event_key, theater_id, status_code, quantity, total_quantity)
+            SELECT CAST(strftime('%s', s.scraped_at) AS INTEGER), k.event_key, t.theater_id, st.status_code,
+                   CAST(CAST(NULLIF(s.quantity, '') AS REAL) AS INTEGER), s.total_quantity
+            FROM goods_stock s
+            LEFT JOIN goods_event e ON e.event_id = CAST(s.event_id AS TEXT)
+            JOIN theater t ON t.theater_chain = COALESCE(e.theater_chain, '') AND t.theater_name = s.theater_name
+            JOIN goods_event_key k ON k.event_id = CAST(s.event_id AS TEXT)
+            LEFT JOIN stock_status st ON st.status = s.status
+            WHERE s.scraped_at IS NOT NULL
+            ORDER BY julianday(s.scraped_at)
+        """)
+
     def insert_boxoffice(self, df: pd.DataFrame):
-        df.to_sql("boxoffice", self.engine, if_exists='append', index=False)
+        """박스오피스 행을 (movie_cd, target_dt) 기준으로 upsert합니다."""
+        self._replace_rows("boxoffice", df)
 
     def insert_goods_event(self, events: List[Dict]):
         """굿즈 이벤트 정보를 DB에 저장합니다. ON CONFLICT를 사용하여 업데이트합니다."""
@@ -114,21 +385,300 @@ class SQLiteConnector(BaseDatabaseConnector):
             conn.close()
 
     def insert_goods_stock(self, df: pd.DataFrame):
-        """굿즈 재고 정보를 DB에 저장합니다."""
-        df.to_sql("goods_stock", self.engine, if_exists='append', index=False, dtype={
-            'scraped_at': types.DateTime,
+        """
+        굿즈 재고 정보(scraped_at, event_id, theater_name, status, quantity, total_quantity[, theater_chain])를
+        차원 키로 바꿔 goods_stock_fact에 저장합니다. 수집 시각은 초 단위로 자르고, 같은 (이벤트, 지점, 수집 시각)은 덮어씁니다.
+        INSERT OR REPLACE는 덮어쓴 행도 새 rowid로 넣으므로, SupabaseReplicator가 rowid 기준 증분 복제로 다시 보냅니다.
+        """
+        if df.empty:
+            return
+
+        scraped_at = pd.to_datetime(df["scraped_at"], format='ISO8601')
+        if scraped_at.dt.tz is not None:
+            scraped_at = scraped_at.dt.tz_localize(None)
+        stocks = pd.DataFrame({
+            "scraped_at": scraped_at.astype('datetime64[s]').astype('int64'),
+            "theater_chain": df["theater_chain"].fillna("") if "theater_chain" in df.columns else "",
+            "theater_name": df["theater_name"],
+            "event_id": df["event_id"].astype(str),
+            "status": df["status"],
+            "quantity": pd.to_numeric(df["quantity"], errors='coerce').round().astype('Int64'),
+            "total_quantity": pd.to_numeric(df["total_quantity"], errors='coerce').round().astype('Int64')
+            if "total_quantity" in df.columns else pd.NA,
         })
+        stocks = stocks.astype(object).where(stocks.notna(), None)
+
+        conn = self._get_connection()
+        try:
+            theaters = stocks[["theater_chain", "theater_name"]].drop_duplicates()
+            conn.executemany(
+                "INSERT OR IGNORE INTO theater (theater_chain, theater_name) VALUES (?, ?)",
+                theaters.itertuples(index=False),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO goods_event_key (event_id) VALUES (?)",
+                [(event_id,) for event_id in stocks["event_id"].unique()],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO stock_status (status) VALUES (?)",
+                [(status,) for status in stocks["status"].dropna().unique()],
+            )
+            theater_ids = {(chain, name): theater_id for theater_id, chain, name in conn.execute(
+                "SELECT theater_id, theater_chain, theater_name FROM theater"
+            )}
+            event_keys = dict(conn.execute("SELECT event_id, event_key FROM goods_event_key"))
+            status_codes = dict(conn.execute("SELECT status, status_code FROM stock_status"))
+
+            conn.executemany("""
+                INSERT OR REPLACE INTO goods_stock_fact (scraped_at, event_key, theater_id, status_code, quantity, total_quantity)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (r.scraped_at, event_keys[r.event_id], theater_ids[(r.theater_chain, r.theater_name)],
+                 status_codes.get(r.status), r.quantity, r.total_quantity)
+                for r in stocks.itertuples(index=False)
+            ])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def upsert_stock_response_hashes(self, records: List[Dict]):
+        """이벤트별 재고 응답 해시와 확인/변경 시각을 저장합니다."""
+        if not records:
+            return
+
+        conn = self._get_connection()
+        try:
+            conn.executemany("""
+                INSERT INTO goods_stock_hash (theater_chain, event_id, response_hash, checked_at, changed_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(theater_chain, event_id) DO UPDATE SET
+                    response_hash = excluded.response_hash,
+                    checked_at = excluded.checked_at,
+                    changed_at = excluded.changed_at
+            """, [
+                (r["theater_chain"], str(r["event_id"]), r["response_hash"], r["checked_at"], r["changed_at"])
+                for r in records
+            ])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def upsert_boxoffice_hashes(self, records: List[Dict]):
+        """박스오피스 행 해시를 (target_dt, movie_cd) 기준으로 저장합니다."""
+        if records:
+            self._replace_rows("boxoffice_hash", pd.DataFrame(records))
+
+    def delete_boxoffice_rows(self, target_dt: str, movie_cds: List[str]):
+        """
+        target_dt 하루의 박스오피스 행과 행 해시 중 movie_cds 영화의 것을 지웁니다.
+        rowid 증분 복제로는 삭제가 전달되지 않으므로, 지운 (target_dt, movie_cd)를 같은 트랜잭션에서 boxoffice_change에 기록합니다.
+        """
+        if not movie_cds:
+            return
+        movie_cds = [str(code) for code in movie_cds]
+        placeholders = ", ".join("?" * len(movie_cds))
+        deleted_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                f"DELETE FROM boxoffice WHERE target_dt >= date(?) AND target_dt < date(?, '+1 day') "
+                f"AND movie_cd IN ({placeholders})",
+                (target_dt, target_dt, *movie_cds),
+            )
+            conn.execute(
+                f"DELETE FROM boxoffice_hash WHERE target_dt = ? AND movie_cd IN ({placeholders})",
+                (target_dt, *movie_cds),
+            )
+            conn.executemany(
+                "INSERT INTO boxoffice_change (target_dt, movie_cd, op, changed_at) VALUES (?, ?, 'delete', ?)",
+                [(target_dt, movie_cd, deleted_at) for movie_cd in movie_cds],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def upsert_backfill_checkpoints(self, records: List[Dict]):
+        """백필 구간 상태를 (job_name, chunk_key) 기준으로 저장합니다."""
+        if records:
+            self._replace_rows("backfill_checkpoint", pd.DataFrame(records))
+
+    def upsert_stock_poll_state(self, records: List[Dict]):
+        """이벤트별 재고 조회 간격과 다음 조회 시각을 저장합니다."""
+        if not records:
+            return
+
+        conn = self._get_connection()
+        try:
+            conn.executemany("""
+                INSERT INTO goods_stock_poll (theater_chain, event_id, interval_seconds, last_polled_at, next_poll_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(event_id) DO UPDATE SET
+                    theater_chain = excluded.theater_chain,
+                    interval_seconds = excluded.interval_seconds,
+                    last_polled_at = excluded.last_polled_at,
+                    next_poll_at = excluded.next_poll_at
+            """, [
+                (r["theater_chain"], str(r["event_id"]), r["interval_seconds"], r["last_polled_at"], r["next_poll_at"])
+                for r in records
+            ])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def upsert_scraper_circuit_state(self, records: List[Dict]):
+        """영화관별 회로 차단기 상태를 저장합니다."""
+        if not records:
+            return
+
+        conn = self._get_connection()
+        try:
+            conn.executemany("""
+                INSERT INTO scraper_circuit_state (theater_chain, state, consecutive_failures, opened_at, last_error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(theater_chain) DO UPDATE SET
+                    state = excluded.state,
+                    consecutive_failures = excluded.consecutive_failures,
+                    opened_at = excluded.opened_at,
+                    last_error = excluded.last_error,
+                    updated_at = excluded.updated_at
+            """, [
+                (r["theater_chain"], r["state"], r["consecutive_failures"], r["opened_at"], r["last_error"], r["updated_at"])
+                for r in records
+            ])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def try_acquire_lease(self, lease_name: str, holder: str, acquired_at: str, expires_at: str) -> bool:
+        """조건부 upsert 한 문장으로 임대를 얻으므로 여러 프로세스가 동시에 시도해도 하나만 성공합니다."""
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute("""
+                INSERT INTO run_lease (lease_name, holder, acquired_at, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(lease_name) DO UPDATE SET
+                    holder = excluded.holder,
+                    acquired_at = excluded.acquired_at,
+                    expires_at = excluded.expires_at
+                WHERE run_lease.expires_at <= excluded.acquired_at OR run_lease.holder = excluded.holder
+            """, (lease_name, holder, acquired_at, expires_at))
+            conn.commit()
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def release_leases(self, prefix: str, holder: str, released_at: str):
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                "UPDATE run_lease SET expires_at = ? WHERE lease_name LIKE ? AND holder = ? AND expires_at > ?",
+                (released_at, prefix + "%", holder, released_at),
+            )
+            conn.commit()
+        finally:
+            conn.close()
 
     def insert_movie(self, df: pd.DataFrame):
-        df.columns = [self._get_db_column_name(col) for col in df.columns]
-        df.to_sql("movie", self.engine, if_exists='append', index=False)
+        """영화 목록을 movie_cd 기준으로 upsert합니다."""
+        self._replace_rows("movie", df)
 
-    def select_query(self, query: str) -> pd.DataFrame:
+    def select_query(self, query: str, params: tuple = None) -> pd.DataFrame:
         conn = self._get_connection()
         try:
-            return pd.read_sql_query(query, conn)
+            return pd.read_sql_query(query, conn, params=params)
         finally:
             conn.close()
 
+    def get_daily_totals(self, start_date: str, end_date: str) -> pd.DataFrame:
+        query = """
+            SELECT date(target_dt) AS target_dt, SUM(audi_cnt) AS audi_cnt, SUM(sales_amt) AS sales_amt
+            FROM boxoffice
+            WHERE target_dt >= date(?) AND target_dt < date(?, '+1 day')
+            GROUP BY date(target_dt)
+            ORDER BY date(target_dt)
+        """
+        return self.select_query(query, (str(start_date), str(end_date)))
+
+    def get_top_movies(self, start_date: str, end_date: str, top_n: int = 10) -> pd.DataFrame:
+        query = """
+            SELECT movie_nm, SUM(audi_cnt) AS audi_cnt
+            FROM boxoffice
+            WHERE target_dt >= date(?) AND target_dt < date(?, '+1 day')
+            GROUP BY movie_nm
+            ORDER BY audi_cnt DESC
+            LIMIT ?
+        """
+        return self.select_query(query, (str(start_date), str(end_date), top_n))
+
+    def get_genre_distribution(self, start_date: str, end_date: str, top_n: int = 3) -> pd.DataFrame:
+        query = """
+            SELECT rep_genre_nm,
+                   COUNT(DISTINCT movie_nm) AS movie_count,
+                   GROUP_CONCAT(movie_nm, ', ') AS movie_list
+            FROM (
+                SELECT DISTINCT m.rep_genre_nm, p.movie_nm
+                FROM (
+                    SELECT DISTINCT movie_cd, movie_nm
+                    FROM boxoffice
+                    WHERE target_dt >= date(?) AND target_dt < date(?, '+1 day')
+                ) p
+                JOIN movie m ON m.movie_cd = p.movie_cd
+                WHERE m.rep_genre_nm IS NOT NULL AND m.rep_genre_nm != ''
+                ORDER BY p.movie_nm
+            )
+            GROUP BY rep_genre_nm
+            ORDER BY movie_count DESC
+            LIMIT ?
+        """
+        return self.select_query(query, (str(start_date), str(end_date), top_n))
+
+    def get_boxoffice_date_range(self) -> pd.DataFrame:
+        # boxoffice_target_dt 인덱스의 양 끝만 읽습니다.
+        return self.select_query("SELECT MIN(target_dt) AS min_dt, MAX(target_dt) AS max_dt FROM boxoffice")
+
+    def get_boxoffice(self, start_date: str, end_date: str, movie_nms: Optional[List[str]] = None) -> pd.DataFrame:
+        query = """
+            SELECT target_dt, rank, movie_nm, audi_cnt, audi_inten, audi_acc, sales_amt, open_dt, movie_cd
+            FROM boxoffice
+            WHERE target_dt >= date(?) AND target_dt < date(?, '+1 day')
+        """
+        params = [str(start_date), str(end_date)]
+        if movie_nms is not None:
+            if not movie_nms:
+                return pd.DataFrame()
+            query += f" AND movie_nm IN ({', '.join('?' * len(movie_nms))})"
+            params.extend(movie_nms)
+        query += " ORDER BY target_dt DESC, rank ASC"
+        return self.select_query(query, tuple(params))
+
+    def get_movie_details(self, movie_cds: List[str]) -> pd.DataFrame:
+        if not movie_cds:
+            return pd.DataFrame()
+        query = f"""
+            SELECT movie_cd, rep_genre_nm, genre_alt, rep_nation_nm, directors
+            FROM movie
+            WHERE movie_cd IN ({', '.join('?' * len(movie_cds))})
+        """
+        return self.select_query(query, tuple(str(code) for code in movie_cds))
+
+    def get_latest_stock(self, event_id: str) -> pd.DataFrame:
+        # goods_stock 뷰 대신 팩트 테이블의 기본키 (event_key, theater_id, scraped_at)로 바로 조회합니다.
+        query = """
+            WITH ranked_stock AS (
+                SELECT f.*,
+                       ROW_NUMBER() OVER(PARTITION BY f.theater_id ORDER BY f.scraped_at DESC) AS rn
+                FROM goods_stock_fact f
+                WHERE f.event_key = (SELECT event_key FROM goods_event_key WHERE event_id = ?)
+            )
+            SELECT datetime(r.scraped_at, 'unixepoch') AS scraped_at, t.theater_name, k.event_id,
+                   s.status, CAST(r.quantity AS TEXT) AS quantity, r.total_quantity
+            FROM ranked_stock r
+            JOIN theater t ON t.theater_id = r.theater_id
+            JOIN goods_event_key k ON k.event_key = r.event_key
+            LEFT JOIN stock_status s ON s.status_code = r.status_code
+            WHERE r.rn = 1
+        """
+        return self.select_query(query, (str(event_id),))
+
     def _get_db_column_name(self, logical_name: str) -> str:
         return logical_name
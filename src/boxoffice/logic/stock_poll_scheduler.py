@@ -0,0 +1,233 @@
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import pandas as pd
+from .base_connector import BaseDatabaseConnector
+from .config import StockPollConfig
+
+logger = logging.getLogger(__name__)
+
+# goods_stock_fact.scraped_at의 기준 시각 (시간대 변환 없음)
+EPOCH = datetime(1970, 1, 1)
+
+
+def _to_naive_datetime(series: pd.Series) -> pd.Series:
+    """SQLite 문자열/Supabase ISO 문자열을 모두 tz 없는 datetime으로 변환합니다."""
+    converted = pd.to_datetime(series, errors='coerce', format='mixed')
+    if getattr(converted.dt, "tz", None) is not None:
+        converted = converted.dt.tz_convert(None)
+    return converted
+
+
+class StockPollScheduler:
+    """
+    이벤트별 재고 조회 주기를 정하는 스케줄러.
+
+    최근 재고 변화 속도, 남은 재고, 이벤트 경과일로 이벤트마다 조회 간격을 계산하고
+    (빠르게 소진 중인 이벤트는 1분, 변화가 없는 이벤트는 최대 수 시간),
+    전체 요청 수가 시간당 예산(request_budget_per_hour)을 넘지 않도록 간격을 늘립니다.
+    이벤트별 다음 조회 시각은 goods_stock_poll 테이블에 기록합니다.
+    """
+
+    MIN_INTERVAL_SECONDS = 60
+    MAX_INTERVAL_SECONDS = 4 * 60 * 60
+    # 조회 이력이 없는 이벤트의 간격
+    DEFAULT_INTERVAL_SECONDS = 10 * 60
+    # 시작한 지 NEW_EVENT_HOURS 이내인 이벤트는 변화가 없어도 이 간격보다 길게 두지 않습니다.
+    NEW_EVENT_HOURS = 24
+    NEW_EVENT_MAX_INTERVAL_SECONDS = 10 * 60
+    # 조회 사이에 재고(또는 지점 상태)가 이 비율 이상 바뀌지 않도록 간격을 정합니다.
+    TARGET_CHANGE_PER_POLL = 0.05
+    # 예상 소진 시점까지 최소 이 횟수만큼은 조회합니다.
+    POLLS_BEFORE_SELLOUT = 4
+    # 변화가 없는 이벤트는 마지막 변경 이후 경과 시간의 이 비율만큼 간격을 늘립니다.
+    STALE_BACKOFF_RATIO = 0.25
+    # 변화 속도를 계산할 최근 구간
+    VELOCITY_WINDOW_HOURS = 3
+    SOLD_OUT_STATUSES = {"소진", "품절"}
+
+    def __init__(self, db_connector: BaseDatabaseConnector, request_budget_per_hour: Optional[int] = None,
+                 tick_seconds: int = 60):
+        self.db = db_connector
+        self.request_budget_per_hour = request_budget_per_hour or StockPollConfig().request_budget_per_hour
+        self.tick_seconds = tick_seconds
+
+    # --- 데이터 조회 ---
+
+    def load_active_events(self, now: datetime) -> pd.DataFrame:
+        events_df = self.db.select_query("SELECT event_id, theater_chain, start_date, end_date FROM goods_event")
+        if events_df.empty:
+            return events_df
+        events_df["event_id"] = events_df["event_id"].astype(str)
+        end_dt = pd.to_datetime(events_df["end_date"], errors='coerce')
+        return events_df[end_dt >= pd.Timestamp(now).normalize()].reset_index(drop=True)
+
+    def load_stock_metrics(self, now: datetime) -> Dict[str, Dict]:
+        """
+        최근 VELOCITY_WINDOW_HOURS 동안의 재고 스냅샷으로 이벤트별 지표를 계산합니다.
+        - change_rate: 시간당 변화 비율 (수량이 있으면 소진 수량/처음 수량, 없으면 상태가 바뀐 지점 비율)
+        - units_per_hour / remaining: 수량이 있는 영화관의 시간당 소진 수량과 남은 수량
+        - sold_out: 마지막 스냅샷에서 모든 지점이 소진 상태인지
+        """
+        # goods_stock 뷰의 scraped_at은 계산된 값이라 범위 조건이 인덱스를 타지 못하므로,
+        # 팩트 테이블의 정수 scraped_at(1970-01-01 00:00 기준 초)에 바로 조건을 겁니다.
+        since = int((now - timedelta(hours=self.VELOCITY_WINDOW_HOURS) - EPOCH).total_seconds())
+        stock_df = self.db.select_query(f"""
+            SELECT k.event_id, f.theater_id, s.status, f.quantity, f.scraped_at
+            FROM goods_stock_fact f
+            JOIN goods_event_key k ON k.event_key = f.event_key
+            LEFT JOIN stock_status s ON s.status_code = f.status_code
+            WHERE f.scraped_at >= {since}
+        """)
+        if stock_df.empty:
+            return {}
+
+        stock_df["event_id"] = stock_df["event_id"].astype(str)
+        stock_df["scraped_at"] = pd.to_datetime(pd.to_numeric(stock_df["scraped_at"], errors='coerce'), unit='s')
+        stock_df["quantity"] = pd.to_numeric(stock_df["quantity"], errors='coerce')
+
+        metrics = {}
+        for event_id, event_df in stock_df.groupby("event_id"):
+            snapshots = sorted(event_df["scraped_at"].dropna().unique())
+            if not snapshots:
+                continue
+            first = event_df[event_df["scraped_at"] == snapshots[0]].set_index("theater_id")
+            last = event_df[event_df["scraped_at"] == snapshots[-1]].set_index("theater_id")
+            hours = (snapshots[-1] - snapshots[0]) / pd.Timedelta(hours=1)
+
+            sold_out = bool(len(last)) and (
+                last["status"].isin(self.SOLD_OUT_STATUSES).all()
+                or (last["quantity"].notna().all() and (last["quantity"] <= 0).all())
+            )
+            remaining = last["quantity"].sum() if last["quantity"].notna().any() else None
+
+            change_rate = units_per_hour = 0.0
+            if hours > 0:
+                if first["quantity"].notna().any() and last["quantity"].notna().any():
+                    depleted = max(first["quantity"].sum() - last["quantity"].sum(), 0)
+                    units_per_hour = depleted / hours
+                    change_rate = depleted / max(first["quantity"].sum(), 1) / hours
+                else:
+                    common = first.index.intersection(last.index)
+                    changed = (first.loc[common, "status"] != last.loc[common, "status"]).sum() if len(common) else 0
+                    change_rate = changed / max(len(last), 1) / hours
+
+            metrics[event_id] = {
+                "change_rate": float(change_rate),
+                "units_per_hour": float(units_per_hour),
+                "remaining": None if remaining is None else float(remaining),
+                "sold_out": bool(sold_out),
+            }
+        return metrics
+
+    def load_last_changes(self) -> Dict[str, datetime]:
+        """goods_stock_hash의 마지막 응답 변경 시각 {event_id: changed_at}"""
+        hash_df = self.db.select_query("SELECT event_id, changed_at FROM goods_stock_hash")
+        if hash_df.empty:
+            return {}
+        hash_df["changed_at"] = _to_naive_datetime(hash_df["changed_at"])
+        return {str(r["event_id"]): r["changed_at"] for r in hash_df.to_dict('records') if pd.notna(r["changed_at"])}
+
+    def load_poll_state(self) -> Dict[str, datetime]:
+        """goods_stock_poll의 다음 조회 시각 {event_id: next_poll_at}"""
+        state_df = self.db.select_query("SELECT event_id, next_poll_at FROM goods_stock_poll")
+        if state_df.empty:
+            return {}
+        state_df["next_poll_at"] = _to_naive_datetime(state_df["next_poll_at"])
+        return {str(r["event_id"]): r["next_poll_at"] for r in state_df.to_dict('records') if pd.notna(r["next_poll_at"])}
+
+    # --- 간격 계산 ---
+
+    def compute_interval(self, metrics: Optional[Dict], last_changed_at: Optional[datetime],
+                         start_date: Optional[datetime], now: datetime) -> int:
+        """이벤트 하나의 조회 간격(초)을 계산합니다. 예산 적용 전 값입니다."""
+        if metrics and metrics["sold_out"]:
+            interval = self.MAX_INTERVAL_SECONDS
+        elif metrics and metrics["change_rate"] > 0:
+            interval = self.TARGET_CHANGE_PER_POLL / metrics["change_rate"] * 3600
+            if metrics["remaining"] is not None and metrics["units_per_hour"] > 0:
+                hours_to_sellout = metrics["remaining"] / metrics["units_per_hour"]
+                interval = min(interval, hours_to_sellout * 3600 / self.POLLS_BEFORE_SELLOUT)
+        elif last_changed_at is not None:
+            interval = (now - last_changed_at).total_seconds() * self.STALE_BACKOFF_RATIO
+        else:
+            interval = self.DEFAULT_INTERVAL_SECONDS
+
+        is_sold_out = bool(metrics and metrics["sold_out"])
+        if not is_sold_out and start_date is not None and now - start_date < timedelta(hours=self.NEW_EVENT_HOURS):
+            interval = min(interval, self.NEW_EVENT_MAX_INTERVAL_SECONDS)
+
+        return int(min(max(interval, self.MIN_INTERVAL_SECONDS), self.MAX_INTERVAL_SECONDS))
+
+    def _apply_budget(self, intervals: Dict[str, int]) -> Dict[str, int]:
+        """간격 합산 요청률이 시간당 예산을 넘으면 모든 간격을 같은 비율로 늘립니다."""
+        requests_per_hour = sum(3600 / interval for interval in intervals.values())
+        if requests_per_hour <= self.request_budget_per_hour:
+            return intervals
+        scale = requests_per_hour / self.request_budget_per_hour
+        logger.info(f"재고 조회 예산 초과 (시간당 {requests_per_hour:.0f}건 > {self.request_budget_per_hour}건), 간격을 {scale:.2f}배로 늘립니다.")
+        return {
+            event_id: int(min(math.ceil(interval * scale), self.MAX_INTERVAL_SECONDS))
+            for event_id, interval in intervals.items()
+        }
+
+    def plan(self, now: datetime) -> List[Dict]:
+        """활성 이벤트마다 조회 간격과 다음 조회 시각을 계산합니다."""
+        events_df = self.load_active_events(now)
+        if events_df.empty:
+            return []
+
+        metrics = self.load_stock_metrics(now)
+        last_changes = self.load_last_changes()
+        next_polls = self.load_poll_state()
+        start_dates = pd.to_datetime(events_df["start_date"], errors='coerce')
+
+        intervals = {}
+        for event, start_date in zip(events_df.to_dict('records'), start_dates):
+            event_id = event["event_id"]
+            intervals[event_id] = self.compute_interval(
+                metrics.get(event_id), last_changes.get(event_id),
+                None if pd.isna(start_date) else start_date.to_pydatetime(), now,
+            )
+        intervals = self._apply_budget(intervals)
+
+        plans = []
+        for event in events_df.to_dict('records'):
+            event_id = event["event_id"]
+            next_poll_at = next_polls.get(event_id)
+            plans.append({
+                "theater_chain": event["theater_chain"],
+                "event_id": event_id,
+                "interval_seconds": intervals[event_id],
+                "next_poll_at": next_poll_at,
+                # 처음 보는 이벤트는 바로 조회합니다.
+                "overdue_seconds": (now - next_poll_at).total_seconds() if next_poll_at is not None else math.inf,
+            })
+        return plans
+
+    def select_due_events(self, now: datetime) -> List[Dict]:
+        """
+        다음 조회 시각이 지난 이벤트를 고릅니다. 한 틱에 보낼 수 있는 요청 수는
+        시간당 예산을 틱 간격으로 나눈 값으로 제한하며, 오래 밀린 이벤트부터 선택합니다.
+        """
+        due = [plan for plan in self.plan(now) if plan["overdue_seconds"] >= 0]
+        due.sort(key=lambda plan: (-plan["overdue_seconds"], plan["interval_seconds"]))
+        max_per_tick = max(1, math.ceil(self.request_budget_per_hour * self.tick_seconds / 3600))
+        if len(due) > max_per_tick:
+            logger.info(f"조회 대상 {len(due)}건 중 예산 내 {max_per_tick}건만 이번 틱에 조회합니다.")
+        return due[:max_per_tick]
+
+    def mark_dispatched(self, plans: List[Dict], now: datetime):
+        """조회를 요청한 이벤트의 다음 조회 시각을 기록합니다."""
+        timestamp_format = "%Y-%m-%d %H:%M:%S.%f"
+        self.db.upsert_stock_poll_state([
+            {
+                "theater_chain": plan["theater_chain"],
+                "event_id": plan["event_id"],
+                "interval_seconds": plan["interval_seconds"],
+                "last_polled_at": now.strftime(timestamp_format),
+                "next_poll_at": (now + timedelta(seconds=plan["interval_seconds"])).strftime(timestamp_format),
+            }
+            for plan in plans
+        ])
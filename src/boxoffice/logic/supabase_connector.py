@@ -1,13 +1,32 @@
 from supabase import create_client, Client
 from .config import SupabaseConfig
 from .base_connector import BaseDatabaseConnector
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime, date # datetime과 date import 추가
 
+class SupabaseWriteError(Exception):
+    """Supabase 쓰기 요청이 실패했습니다. (HTTP 오류, 네트워크 오류 등)"""
+
+
 class SupabaseConnector(BaseDatabaseConnector):
-    def __init__(self):
-        self.config = SupabaseConfig()
+    # float로 올라오더라도 정수로 저장해야 하는 컬럼
+    INTEGER_COLUMNS = {'quantity', 'total_quantity'}
+    # upsert 요청 한 번에 전송할 최대 행 수
+    UPSERT_BATCH_SIZE = 1000
+
+    def __init__(self, client: Optional[Client] = None, config: Optional[SupabaseConfig] = None):
+        """
+        :param client: 이미 생성된 Supabase 클라이언트. 지정하지 않으면 secrets.toml 설정으로 생성합니다.
+                       (테스트/벤치마크에서는 src/test/supabase_standin.py의 대역을 주입합니다.)
+        :param config: Supabase 설정. client를 주입하고 config를 주지 않으면 None으로 둡니다.
+        """
+        self.config = config
+        if client is not None:
+            self.client = client
+            return
+        self.config = config or SupabaseConfig()
         self.client = self._get_supabase_client()
 
     def _get_supabase_client(self) -> Client:
@@ -23,66 +42,170 @@ class SupabaseConnector(BaseDatabaseConnector):
             
         return create_client(url, key)
 
-    def _upsert_data(self, table_name: str, data: list[dict], conflict_column: str):
+    def _serialize_frame(self, df: pd.DataFrame) -> bytes:
+        """
+        DataFrame을 PostgREST 요청 본문(JSON bytes)으로 직렬화합니다.
+        셀 단위 루프 대신 컬럼 단위로 한 번씩 변환합니다.
+          - 컬럼명: DB 컬럼명(소문자)으로 변환
+          - 날짜/시간: ISO 8601 문자열
+          - 정수 컬럼: float로 올라온 값을 nullable 정수로 변환
+          - NaN/NaT: null
+        """
+        df = df.rename(columns=self._get_db_column_name)
+        converted = {}
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                series = self._datetime_to_iso(series)
+            elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) in ('date', 'datetime'):
+                series = series.map(lambda v: v.isoformat() if isinstance(v, (datetime, date)) else v)
+            elif col in self.INTEGER_COLUMNS and pd.api.types.is_float_dtype(series):
+                series = series.round().astype('Int64')
+            converted[col] = series
+        # NaN/NaT/None은 to_json에서 모두 null로 직렬화됩니다.
+        payload = pd.DataFrame(converted, index=df.index).to_json(
+            orient='records', force_ascii=False, double_precision=15
+        )
+        return payload.encode('utf-8')
+
+    @staticmethod
+    def _datetime_to_iso(series: pd.Series) -> pd.Series:
+        """datetime64 컬럼을 ISO 8601 문자열로 변환합니다. (Series.dt.strftime보다 수십 배 빠름)"""
+        timezone = 'naive'
+        if getattr(series.dt, 'tz', None) is not None:
+            series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+            timezone = 'UTC'
+        iso = np.datetime_as_string(series.to_numpy(dtype='datetime64[us]'), unit='us', timezone=timezone)
+        return pd.Series(iso, index=series.index, dtype=object).where(series.notna(), None)
+
+    def _post_json(self, path: str, payload: bytes, params: Optional[Dict] = None, prefer: Optional[str] = None):
+        """
+        직렬화된 JSON bytes를 PostgREST 엔드포인트에 그대로 POST합니다.
+        supabase-py의 공개 API(table().upsert, rpc)는 dict 목록을 다시 직렬화하므로,
+        postgrest 클라이언트의 HTTP 세션을 쓰는 곳은 이 메서드 하나로 모았습니다.
+        요청이 실패하면 SupabaseWriteError를 발생시킵니다.
+        """
+        headers = {"Content-Type": "application/json"}
+        if prefer:
+            headers["Prefer"] = prefer
+        try:
+            response = self.client.postgrest.session.post(path, content=payload, params=params, headers=headers)
+            response.raise_for_status()
+        except Exception as e:
+            raise SupabaseWriteError(f"POST {path} failed: {e}") from e
+        return response
+
+    def _upsert_data(self, table_name: str, df: pd.DataFrame, conflict_column: str):
         """
         Supabase 테이블에 데이터를 upsert합니다.
+        직렬화된 JSON bytes를 UPSERT_BATCH_SIZE 행 단위로 PostgREST 엔드포인트에 바로 전송합니다.
+        배치 하나라도 실패하면 SupabaseWriteError를 발생시킵니다. (앞서 성공한 배치는 upsert이므로 재시도해도 안전)
 
         :param table_name: 데이터를 삽입할 테이블 이름
-        :param data: 삽입할 데이터 (딕셔너리의 리스트)
+        :param df: 삽입할 데이터
         :param conflict_column: 중복 확인의 기준이 될 컬럼명
         """
+        # conflict_column을 소문자로 변환
+        db_conflict_column = ','.join([col.strip().lower() for col in conflict_column.split(',')])
+        for start in range(0, len(df), self.UPSERT_BATCH_SIZE):
+            self._post_json(
+                f"/{table_name}",
+                self._serialize_frame(df.iloc[start:start + self.UPSERT_BATCH_SIZE]),
+                params={"on_conflict": db_conflict_column},
+                prefer="resolution=merge-duplicates,return=minimal",
+            )
+
+    def _post_rpc_rows(self, function_name: str, df: pd.DataFrame):
+        """
+        행 목록을 인자(rows jsonb)로 받는 Postgres 함수를 UPSERT_BATCH_SIZE 행 단위로 호출합니다.
+        _upsert_data와 같이 직렬화된 JSON bytes를 그대로 전송하며, 실패하면 SupabaseWriteError를 발생시킵니다.
+        """
+        for start in range(0, len(df), self.UPSERT_BATCH_SIZE):
+            payload = self._serialize_frame(df.iloc[start:start + self.UPSERT_BATCH_SIZE])
+            self._post_json(f"/rpc/{function_name}", b'{"rows":' + payload + b'}')
+
+    def upsert_rows(self, table_name: str, df: pd.DataFrame, conflict_columns: str):
+        """임의 테이블에 df를 conflict_columns 기준으로 upsert합니다. (SupabaseReplicator용, 실패하면 SupabaseWriteError)"""
+        if not df.empty:
+            self._upsert_data(table_name, df, conflict_columns)
+
+    def sync_dimension_sequences(self):
+        """복제된 재고 차원 키(theater, goods_event_key, stock_status) 뒤로 identity 시퀀스를 옮깁니다."""
         try:
-            processed_data = []
-            for record in data:
-                processed_record = {}
-                for k, v in record.items():
-                    # datetime 객체를 ISO 8601 문자열로 변환
-                    if isinstance(v, (datetime, date)):
-                        processed_record[self._get_db_column_name(k)] = v.isoformat()
-                    elif pd.isna(v):
-                        processed_record[self._get_db_column_name(k)] = None # NaN 값을 None으로 명시적으로 변환
-                    elif self._get_db_column_name(k) == 'total_quantity' and isinstance(v, float):
-                        processed_record[self._get_db_column_name(k)] = int(v) # float 형태의 정수를 int로 변환
-                    else:
-                        processed_record[self._get_db_column_name(k)] = v
-                processed_data.append(processed_record)
-
-            # conflict_column을 소문자로 변환
-            db_conflict_column = ','.join([col.strip().lower() for col in conflict_column.split(',')])
-            response = self.client.table(table_name).upsert(processed_data, on_conflict=db_conflict_column).execute()
-            return response
+            self.client.rpc('sync_dimension_sequences', {}).execute()
         except Exception as e:
-            print(f"An error occurred during upsert: {e}")
-            return None
+            raise SupabaseWriteError(f"rpc 'sync_dimension_sequences' failed: {e}") from e
 
     def insert_boxoffice(self, df: pd.DataFrame):
         print(f"[SupabaseConnector] Attempting to insert {len(df)} rows into boxoffice.")
         if not df.empty:
-            self._upsert_data('boxoffice', df.to_dict(orient='records'), 'movie_cd,target_dt')
+            self._upsert_data('boxoffice', df, 'movie_cd,target_dt')
 
     def insert_movie(self, df: pd.DataFrame):
         print(f"[SupabaseConnector] Attempting to insert {len(df)} rows into movie.")
         if not df.empty:
-            self._upsert_data('movie', df.to_dict(orient='records'), 'movie_cd')
+            self._upsert_data('movie', df, 'movie_cd')
 
     def insert_goods_event(self, events: List[Dict]):
         print(f"[SupabaseConnector] Attempting to insert {len(events)} rows into goods_event.")
         if events:
-            self._upsert_data('goods_event', events, 'event_id')
+            self._upsert_data('goods_event', pd.DataFrame(events), 'event_id')
 
     def insert_goods_stock(self, df: pd.DataFrame):
         print(f"[SupabaseConnector] Attempting to insert {len(df)} rows into goods_stock.")
         if not df.empty:
-            df.columns = [self._get_db_column_name(col) for col in df.columns]
-            # quantity 컬럼의 NaN 값을 빈 문자열로 변환
-            if 'quantity' in df.columns:
-                df['quantity'] = df['quantity'].fillna("")
-            
-            # total_quantity 컬럼의 NaN 값을 None으로 변환
-            if 'total_quantity' in df.columns:
-                df['total_quantity'] = df['total_quantity'].where(pd.notna(df['total_quantity']), None)
+            # 지점/이벤트/상태를 차원 키로 바꿔 goods_stock_fact에 저장하는 함수 (db/supabase/tables.sql)
+            self._post_rpc_rows('insert_goods_stock', df)
+
+    def upsert_stock_response_hashes(self, records: List[Dict]):
+        if records:
+            self._upsert_data('goods_stock_hash', pd.DataFrame(records), 'theater_chain,event_id')
 
-            self._upsert_data('goods_stock', df.to_dict(orient='records'), 'event_id,theater_name,scraped_at')
+    def upsert_boxoffice_hashes(self, records: List[Dict]):
+        if records:
+            self._upsert_data('boxoffice_hash', pd.DataFrame(records), 'target_dt,movie_cd')
+
+    def delete_boxoffice_rows(self, target_dt: str, movie_cds: List[str]):
+        if not movie_cds:
+            return
+        # 박스오피스 행과 행 해시를 한 번에 지우는 함수 (db/supabase/tables.sql)
+        try:
+            self.client.rpc('delete_boxoffice_rows', {
+                'p_target_dt': target_dt, 'p_movie_cds': [str(code) for code in movie_cds],
+            }).execute()
+        except Exception as e:
+            raise SupabaseWriteError(f"rpc 'delete_boxoffice_rows' failed: {e}") from e
+
+    def upsert_backfill_checkpoints(self, records: List[Dict]):
+        if records:
+            self._upsert_data('backfill_checkpoint', pd.DataFrame(records), 'job_name,chunk_key')
+
+    def upsert_stock_poll_state(self, records: List[Dict]):
+        if records:
+            self._upsert_data('goods_stock_poll', pd.DataFrame(records), 'event_id')
+
+    def upsert_scraper_circuit_state(self, records: List[Dict]):
+        if records:
+            self._upsert_data('scraper_circuit_state', pd.DataFrame(records), 'theater_chain')
+
+    def try_acquire_lease(self, lease_name: str, holder: str, acquired_at: str, expires_at: str) -> bool:
+        # 조건부 upsert를 원자적으로 실행하는 함수 (db/supabase/tables.sql)
+        try:
+            response = self.client.rpc('try_acquire_lease', {
+                'p_lease_name': lease_name, 'p_holder': holder,
+                'p_acquired_at': acquired_at, 'p_expires_at': expires_at,
+            }).execute()
+            return bool(response.data)
+        except Exception as e:
+            print(f"An error occurred during rpc 'try_acquire_lease': {e}")
+            return False
+
+    def release_leases(self, prefix: str, holder: str, released_at: str):
+        try:
+            self.client.table('run_lease').update({'expires_at': released_at}) \
+                .like('lease_name', prefix + '%').eq('holder', holder).gt('expires_at', released_at).execute()
+        except Exception as e:
+            print(f"An error occurred while releasing leases '{prefix}': {e}")
 
     def select_query(self, sql: str) -> pd.DataFrame:
         """
@@ -132,6 +255,51 @@ class SupabaseConnector(BaseDatabaseConnector):
             print(f"An error occurred during paginated select_query: {e}")
             return pd.DataFrame()
 
+    def _call_rpc(self, function_name: str, params: dict) -> pd.DataFrame:
+        """
+        db/supabase/dashboard_functions.sql에 정의된 집계 함수를 호출합니다.
+        집계 결과만 전송되므로 페이지네이션이 필요 없습니다.
+        """
+        try:
+            response = self.client.rpc(function_name, params).execute()
+            return pd.DataFrame(response.data or [])
+        except Exception as e:
+            print(f"An error occurred during rpc '{function_name}': {e}")
+            return pd.DataFrame()
+
+    def get_daily_totals(self, start_date: str, end_date: str) -> pd.DataFrame:
+        return self._call_rpc('boxoffice_daily_totals', {
+            'start_date': str(start_date), 'end_date': str(end_date),
+        })
+
+    def get_top_movies(self, start_date: str, end_date: str, top_n: int = 10) -> pd.DataFrame:
+        return self._call_rpc('boxoffice_top_movies', {
+            'start_date': str(start_date), 'end_date': str(end_date), 'top_n': top_n,
+        })
+
+    def get_genre_distribution(self, start_date: str, end_date: str, top_n: int = 3) -> pd.DataFrame:
+        return self._call_rpc('boxoffice_genre_distribution', {
+            'start_date': str(start_date), 'end_date': str(end_date), 'top_n': top_n,
+        })
+
+    def get_boxoffice_date_range(self) -> pd.DataFrame:
+        return self._call_rpc('boxoffice_date_range', {})
+
+    def get_boxoffice(self, start_date: str, end_date: str, movie_nms: Optional[List[str]] = None) -> pd.DataFrame:
+        if movie_nms is not None and not movie_nms:
+            return pd.DataFrame()
+        return self._call_rpc('boxoffice_between', {
+            'start_date': str(start_date), 'end_date': str(end_date), 'movie_nms': movie_nms,
+        })
+
+    def get_movie_details(self, movie_cds: List[str]) -> pd.DataFrame:
+        if not movie_cds:
+            return pd.DataFrame()
+        return self._call_rpc('movie_details', {'movie_cds': [str(code) for code in movie_cds]})
+
+    def get_latest_stock(self, event_id: str) -> pd.DataFrame:
+        return self._call_rpc('goods_stock_latest', {'p_event_id': str(event_id)})
+
     def _get_db_column_name(self, logical_name: str) -> str:
         """논리적 컬럼 이름을 Supabase DB의 실제 컬럼 이름(소문자)으로 변환합니다."""
         return logical_name.lower()
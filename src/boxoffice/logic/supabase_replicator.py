@@ -0,0 +1,199 @@
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+import pandas as pd
+from .config import ReplicationConfig
+from .sqlite_connector import SQLiteConnector
+from .supabase_connector import SupabaseConnector, SupabaseWriteError
+
+logger = logging.getLogger(__name__)
+
+
+class SupabaseReplicator:
+    """
+    로컬 SQLite에 적재된 데이터를 Supabase로 배치 복제합니다.
+
+    테이블별 high-water mark(SQLite rowid, 변경 기록은 seq)를 replication_state 테이블에 기록하며,
+    배치 업로드가 성공한 경우에만 전진시킵니다. 따라서 Supabase 장애 중에 실패한
+    배치는 다음 실행에서 그대로 재시도됩니다. 모든 쓰기는 upsert이므로 재전송되어도 안전합니다.
+    """
+
+    # 테이블명: (Supabase 충돌 기준 컬럼, 복제 모드)
+    # - incremental: append 전용 테이블이나 INSERT OR REPLACE로 갱신하는 테이블(갱신된 행은 새 rowid를 받음).
+    #   rowid 기준으로 새 행만 전송합니다.
+    # - full: ON CONFLICT DO UPDATE로 기존 행이 갱신되는 작은 테이블. 매번 전체를 upsert합니다.
+    # - changelog: 행을 지우기도 하는 테이블. rowid는 지운 뒤 다시 쓰일 수 있으므로 변경 기록의 seq 순서대로 upsert와 삭제를 반영합니다.
+    TABLES = {
+        "movie": ("movie_cd", "incremental"),
+        "boxoffice": ("movie_cd,target_dt", "changelog"),
+        "goods_event": ("event_id", "full"),
+        # 재고 차원 테이블은 추가만 되므로(정수 키 = rowid) 팩트보다 먼저 증분 복제합니다.
+        "theater": ("theater_id", "incremental"),
+        "goods_event_key": ("event_key", "incremental"),
+        "stock_status": ("status_code", "incremental"),
+        "goods_stock_fact": ("event_key,theater_id,scraped_at", "incremental"),
+        "goods_stock_hash": ("theater_chain,event_id", "full"),
+        "scraper_circuit_state": ("theater_chain", "full"),
+    }
+    # Supabase에서 identity 키를 쓰는 차원 테이블. 복제한 뒤 시퀀스를 최대 키 뒤로 옮깁니다.
+    DIMENSION_TABLES = ("theater", "goods_event_key", "stock_status")
+    # changelog 모드 테이블의 변경 기록 (SQLiteConnector가 같은 트랜잭션에서 씀). high-water mark는 변경 기록 이름으로 저장합니다.
+    CHANGE_TABLES = {"boxoffice": "boxoffice_change"}
+    # 변경 기록 도입 전의 boxoffice rowid / 삭제 기록 high-water mark. 변경 기록으로 한 번 전체를 다시 보내므로 지웁니다.
+    STALE_STATES = ("boxoffice", "boxoffice_deletion")
+
+    def __init__(self, source: Optional[SQLiteConnector] = None, target: Optional[SupabaseConnector] = None):
+        self.config = ReplicationConfig()
+        self.source = source or SQLiteConnector()
+        self.target = target or SupabaseConnector()
+        self._ensure_state_table()
+
+    def _ensure_state_table(self):
+        conn = self.source._get_connection()
+        try:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS replication_state (
+                table_name TEXT PRIMARY KEY,
+                last_rowid INTEGER NOT NULL DEFAULT 0,
+                last_synced_at DATETIME,
+                last_error TEXT
+            );
+            """)
+            conn.execute(
+                f"DELETE FROM replication_state WHERE table_name IN ({', '.join('?' * len(self.STALE_STATES))})",
+                self.STALE_STATES,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_high_water_mark(self, table_name: str) -> int:
+        df = self.source.select_query(
+            "SELECT last_rowid FROM replication_state WHERE table_name = ?", (table_name,)
+        )
+        return int(df["last_rowid"].iloc[0]) if not df.empty else 0
+
+    def _save_state(self, table_name: str, last_rowid: int, error: Optional[str] = None):
+        conn = self.source._get_connection()
+        try:
+            conn.execute("""
+                INSERT INTO replication_state (table_name, last_rowid, last_synced_at, last_error)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(table_name) DO UPDATE SET
+                    last_rowid = excluded.last_rowid,
+                    last_synced_at = CASE WHEN excluded.last_error IS NULL
+                                          THEN excluded.last_synced_at
+                                          ELSE replication_state.last_synced_at END,
+                    last_error = excluded.last_error
+            """, (table_name, last_rowid, datetime.now().isoformat(sep=" "), error))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def sync_table(self, table_name: str) -> int:
+        """테이블 하나를 복제하고, 전송한 행 수를 반환합니다."""
+        conflict_columns, mode = self.TABLES[table_name]
+        if mode == "changelog":
+            return self.sync_changes(table_name)
+        batch_size = self.config.batch_size
+        last_rowid = 0 if mode == "full" else self.get_high_water_mark(table_name)
+        synced_rows = 0
+
+        for _ in range(self.config.max_batches):
+            batch = self.source.select_query(
+                f"SELECT rowid AS _rowid, * FROM {table_name} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, batch_size),
+            )
+            if batch.empty:
+                break
+
+            batch_max_rowid = int(batch["_rowid"].iloc[-1])
+            try:
+                self.target.upsert_rows(table_name, batch.drop(columns=["_rowid"]), conflict_columns)
+            except SupabaseWriteError as e:
+                # 실패한 배치는 high-water mark를 전진시키지 않고 다음 실행에서 재시도합니다.
+                message = f"{table_name} 배치 업로드 실패 (rowid > {last_rowid}): {e}"
+                logger.warning(message)
+                self._save_state(table_name, last_rowid if mode == "incremental" else 0, message)
+                return synced_rows
+
+            last_rowid = batch_max_rowid
+            synced_rows += len(batch)
+            if mode == "incremental":
+                self._save_state(table_name, last_rowid)
+
+            if len(batch) < batch_size:
+                break
+
+        if mode == "full":
+            self._save_state(table_name, 0)
+        return synced_rows
+
+    def sync_changes(self, table_name: str) -> int:
+        """
+        변경 기록을 seq 순서대로 반영하고, 반영한 변경 수를 반환합니다.
+        연속한 같은 종류의 변경을 묶어, upsert는 그 키의 현재 행을 보내고(이미 지워졌으면 건너뜀) 삭제는 Supabase에서도 지웁니다.
+        실패하면 그 앞까지만 high-water mark를 전진시키고, 나머지는 다음 실행에서 같은 순서로 재시도합니다.
+        """
+        conflict_columns, _ = self.TABLES[table_name]
+        change_table = self.CHANGE_TABLES[table_name]
+        batch_size = self.config.batch_size
+        last_seq = self.get_high_water_mark(change_table)
+        synced_changes = 0
+
+        for _ in range(self.config.max_batches):
+            changes = self.source.select_query(
+                f"SELECT seq, target_dt, movie_cd, op FROM {change_table} WHERE seq > ? ORDER BY seq LIMIT ?",
+                (last_seq, batch_size),
+            )
+            if changes.empty:
+                break
+
+            run_ids = (changes["op"] != changes["op"].shift()).cumsum()
+            for _, run in changes.groupby(run_ids, sort=False):
+                try:
+                    if run["op"].iloc[0] == "delete":
+                        for target_dt, day_df in run.groupby("target_dt", sort=False):
+                            self.target.delete_boxoffice_rows(str(target_dt), day_df["movie_cd"].astype(str).tolist())
+                    else:
+                        rows = self.source.select_query(f"""
+                            SELECT DISTINCT t.* FROM {change_table} c
+                            JOIN {table_name} t ON t.movie_cd = c.movie_cd AND t.target_dt = c.target_dt
+                            WHERE c.seq BETWEEN ? AND ? AND c.op = 'upsert'
+                        """, (int(run["seq"].iloc[0]), int(run["seq"].iloc[-1])))
+                        if not rows.empty:
+                            self.target.upsert_rows(table_name, rows, conflict_columns)
+                except SupabaseWriteError as e:
+                    message = f"{table_name} 변경 반영 실패 (seq > {last_seq}): {e}"
+                    logger.warning(message)
+                    self._save_state(change_table, last_seq, message)
+                    return synced_changes
+
+                last_seq = int(run["seq"].iloc[-1])
+                synced_changes += len(run)
+                self._save_state(change_table, last_seq)
+
+            if len(changes) < batch_size:
+                break
+        return synced_changes
+
+    def sync_all(self) -> Dict[str, int]:
+        """모든 복제 대상 테이블을 순서대로 동기화합니다."""
+        results = {}
+        for table_name in self.TABLES:
+            try:
+                results[table_name] = self.sync_table(table_name)
+                logger.info(f"{table_name}: {results[table_name]}건 Supabase로 복제")
+            except Exception as e:
+                logger.error(f"{table_name} 복제 중 오류 발생: {e}", exc_info=True)
+                results[table_name] = 0
+        if any(results.get(table_name) for table_name in self.DIMENSION_TABLES):
+            try:
+                self.target.sync_dimension_sequences()
+            except SupabaseWriteError as e:
+                logger.error(f"차원 테이블 시퀀스 갱신 중 오류 발생: {e}")
+        return results
+
+    def get_status(self) -> pd.DataFrame:
+        """테이블별 복제 상태(high-water mark, 마지막 성공 시각, 마지막 오류)를 반환합니다."""
+        return self.source.select_query("SELECT * FROM replication_state ORDER BY table_name")
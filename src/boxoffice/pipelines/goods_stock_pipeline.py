@@ -1,36 +1,190 @@
-from dagster import job, op, In, Out, get_dagster_logger, ScheduleDefinition
+from dagster import (
+    job, op, sensor, schedule, run_failure_sensor, In, Out, Output, DynamicOut, DynamicOutput, Config, RunRequest, SkipReason,
+    DefaultSensorStatus, get_dagster_logger, ScheduleDefinition, multiprocess_executor,
+)
+import time
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from ..logic.database_manager import get_database_connector
+from ..logic.circuit_breaker import CircuitBreaker
+from ..logic.db_sink import BatchSink
+from ..logic.run_lease import RunLease
+from ..logic.stock_poll_scheduler import StockPollScheduler
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 from ..logic.movie_events_scraper import (
+    TheaterEventScraper,
     CGVScraper,
     LotteCinemaScraper,
     MegaboxScraper,
-    UnifiedEvent,
 )
 
 SCRAPERS = [CGVScraper(), LotteCinemaScraper(), MegaboxScraper()]
 
-@op(out=Out(List[Dict]))
-def get_all_events() -> List[UnifiedEvent]:
-    """모든 영화관의 현재 진행중인 굿즈 이벤트를 수집합니다."""
+# 영화관별 동시 재고 조회 수 (사이트 부하를 고려한 상한)
+CHAIN_CONCURRENCY = {"CGV": 4, "롯데시네마": 2, "메가박스": 3}
+DEFAULT_CHAIN_CONCURRENCY = 2
+# 재고 조회 샤드 하나에 담는 최대 이벤트 수
+STOCK_SHARD_SIZE = 25
+# 영화관별로 동시에 실행하는 재고 조회 샤드 op 수 (multiprocess executor의 theater_chain 태그 한도)
+CHAIN_SHARD_CONCURRENCY = {"CGV": 2, "롯데시네마": 1, "메가박스": 1}
+# op 이름/동적 출력 이름에 쓰는 영화관 키 (Dagster 이름에는 영문만 쓸 수 있습니다)
+CHAIN_KEYS = {"CGV": "cgv", "롯데시네마": "lotte", "메가박스": "megabox"}
+CHAIN_TAG = "theater_chain"
+STOCK_COLUMNS = ["scraped_at", "event_id", "theater_chain", "theater_name", "status", "quantity", "total_quantity"]
+# 10분 주기 스케줄과 겹치지 않도록 재고 조회 전체에 거는 마감 시간
+STOCK_RUN_DEADLINE_SECONDS = 420
+# 영화관별 재고 조회 임대(run_lease) 이름 접두어와 유효 시간(초).
+# 유효 시간은 실행 마감보다 길게 잡고, 실행이 비정상 종료해 반납하지 못한 임대는 이 시간이 지나면 만료됩니다.
+STOCK_LEASE_PREFIX = "goods_stock"
+STOCK_LEASE_TTL_SECONDS = 600
+# 영화관별 실행 마감 시간(초). 이 시간이 지나면 해당 영화관은 남은 요청을 보내지 않고 실패 처리합니다.
+EVENT_CHAIN_DEADLINE_SECONDS = 900
+STOCK_CHAIN_DEADLINE_SECONDS = 300
+# 재고 조회 샤드가 회로 차단기 상태를 저장소와 다시 맞추기 전에 조회하는 이벤트 수 (샤드 스레드 수보다 작으면 스레드 수)
+STOCK_CIRCUIT_SYNC_EVENTS = 5
+# 이벤트 수집 결과를 DB에 나눠 쓰는 배치 크기와, 배치가 덜 찼더라도 기록하는 주기(초)
+EVENT_SINK_BATCH_SIZE = 20
+SINK_FLUSH_INTERVAL_SECONDS = 5
+# 적응형 재고 조회 센서의 평가 주기 (가장 짧은 조회 간격과 같음)
+STOCK_POLL_TICK_SECONDS = 60
+
+
+class StockTargetConfig(Config):
+    """재고를 조회할 이벤트 ID 목록. 비워 두면 종료되지 않은 모든 이벤트를 조회합니다."""
+    event_ids: Optional[List[str]] = None
+
+def _load_known_events() -> Dict[str, Dict[str, Dict]]:
+    """DB에 저장된 이벤트의 굿즈 정보를 영화관별 {event_id: {...}} 형태로 가져옵니다."""
+    db = get_database_connector()
+    known_df = db.select_query("SELECT event_id, theater_chain, goods_id, goods_name, spmtl_no FROM goods_event")
+    known_events: Dict[str, Dict[str, Dict]] = {}
+    if known_df.empty:
+        return known_events
+
+    known_df = known_df.astype(object).where(known_df.notna(), None)
+    for record in known_df.to_dict('records'):
+        known_events.setdefault(record["theater_chain"], {})[str(record["event_id"])] = record
+    return known_events
+
+def _load_stock_hashes() -> Dict[Tuple[str, str], Dict]:
+    """이벤트별 마지막 재고 응답 해시를 {(theater_chain, event_id): {...}} 형태로 가져옵니다."""
+    db = get_database_connector()
+    hash_df = db.select_query("SELECT theater_chain, event_id, response_hash, changed_at FROM goods_stock_hash")
+    if hash_df.empty:
+        return {}
+    return {
+        (record["theater_chain"], str(record["event_id"])): record
+        for record in hash_df.to_dict('records')
+    }
+
+def _load_circuit_records(db) -> Dict[str, Dict]:
+    """scraper_circuit_state 테이블의 {영화관: 저장된 회로 차단기 상태}. 읽지 못하면 빈 dict를 반환합니다."""
+    try:
+        state_df = db.select_query("SELECT * FROM scraper_circuit_state")
+    except Exception as e:
+        get_dagster_logger().warning(f"회로 차단기 상태를 불러오지 못해 기존 상태로 진행합니다: {e}")
+        return {}
+    if state_df.empty:
+        return {}
+    return {record["theater_chain"]: record for record in state_df.to_dict('records')}
+
+def _restore_circuit_states(db, scrapers: List[TheaterEventScraper]):
+    """scraper_circuit_state 테이블에 저장된 회로 차단기 상태를 스크레이퍼에 복원합니다."""
+    records = _load_circuit_records(db)
+    for scraper in scrapers:
+        if scraper.chain_name in records:
+            scraper.circuit_breaker.restore(records[scraper.chain_name])
+
+def _save_circuit_states(db, scrapers: List[TheaterEventScraper]):
+    """
+    회로 차단기 상태를 scraper_circuit_state 테이블에 저장하고, 닫혀 있지 않은 영화관을 로그로 남깁니다.
+    같은 영화관의 다른 샤드가 그사이 저장한 상태를 다시 읽어 합치므로(CircuitBreaker.merge),
+    다른 샤드가 연 차단기는 이 프로세스의 닫힌 상태로 덮어쓰지 않고 이 프로세스의 차단기에 반영합니다.
+    """
     logger = get_dagster_logger()
-    all_events = []
-    for scraper in SCRAPERS:
-        try:
-            logger.info(f"{scraper.chain_name} 이벤트 수집 시작...")
-            events = scraper.get_events()
-            all_events.extend(events)
-            logger.info(f"{scraper.chain_name} 이벤트 {len(events)}건 수집 완료.")
-        except Exception as e:
-            logger.error(f"{scraper.chain_name} 이벤트 수집 중 오류 발생: {e}", exc_info=True)
-    return all_events
+    stored = _load_circuit_records(db)
+    records = []
+    for scraper in scrapers:
+        if scraper.circuit_breaker.merge(stored.get(scraper.chain_name)):
+            continue
+        record = scraper.circuit_breaker.snapshot()
+        previous = stored.get(scraper.chain_name)
+        if previous and all(
+            str(previous.get(key)) == str(record[key]) for key in ("state", "consecutive_failures", "opened_at", "last_error")
+        ):
+            continue
+        records.append(record)
+    for record in records:
+        if record["state"] != CircuitBreaker.CLOSED:
+            logger.warning(
+                f"{record['theater_chain']} 회로 차단기 {record['state']} "
+                f"(연속 실패 {record['consecutive_failures']}회, 열린 시각 {record['opened_at']}, 마지막 오류: {record['last_error']})"
+            )
+    try:
+        db.upsert_scraper_circuit_state(records)
+    except Exception as e:
+        logger.error(f"회로 차단기 상태 저장 중 오류 발생: {e}", exc_info=True)
+
+def _is_circuit_open(scraper: TheaterEventScraper) -> bool:
+    if scraper.circuit_breaker.current_state() != CircuitBreaker.OPEN:
+        return False
+    get_dagster_logger().warning(
+        f"{scraper.chain_name} 회로 차단기가 열려 있어 이번 실행에서 건너뜁니다. "
+        f"(마지막 오류: {scraper.circuit_breaker.last_error})"
+    )
+    return True
+
+@op(out=Out(Dict))
+def collect_events_to_db() -> Dict[str, int]:
+    """
+    모든 영화관의 현재 진행중인 굿즈 이벤트를 수집하여 DB에 저장/업데이트합니다.
+    이미 DB에 있는 이벤트는 상세 페이지 요청을 생략하고 저장된 굿즈 정보를 재사용합니다.
+
+    이벤트는 파싱되는 대로 BatchSink를 거쳐 작은 배치로 기록되고, 영화관마다 수집이 끝나면 남은 이벤트를 기록합니다.
+    따라서 뒤에 수집되는 영화관이 실패해도 앞서 수집한 결과는 남습니다. 영화관별 저장 건수를 반환합니다.
+
+    회로 차단기가 열린 영화관은 건너뛰고, 각 영화관은 EVENT_CHAIN_DEADLINE_SECONDS 안에서만 요청을 보냅니다.
+    """
+    db = get_database_connector()
+    _restore_circuit_states(db, SCRAPERS)
+    known_events = _load_known_events()
+    TheaterEventScraper.share_title_index(SCRAPERS)
+    results = {}
+    try:
+        for scraper in SCRAPERS:
+            results[scraper.chain_name] = _collect_chain_events(db, scraper, known_events.get(scraper.chain_name, {}))
+    finally:
+        _save_circuit_states(db, SCRAPERS)
+    return results
+
+def _collect_chain_events(db, scraper: TheaterEventScraper, known_events: Dict[str, Dict]) -> int:
+    """영화관 하나의 이벤트를 수집하여 저장하고 저장 건수를 반환합니다."""
+    logger = get_dagster_logger()
+    if _is_circuit_open(scraper):
+        return 0
+
+    scraper.begin_run(EVENT_CHAIN_DEADLINE_SECONDS)
+    sink = BatchSink(
+        db.insert_goods_event, batch_size=EVENT_SINK_BATCH_SIZE,
+        flush_interval=SINK_FLUSH_INTERVAL_SECONDS, name=f"{scraper.chain_name} goods_event",
+    )
+    try:
+        logger.info(f"{scraper.chain_name} 이벤트 수집 시작...")
+        with sink:
+            for event in scraper.iter_events(known_events=known_events):
+                sink.add(event)
+        logger.info(f"{scraper.chain_name} 이벤트 {sink.written}건 저장 완료. ({sink.flushes}회 기록)")
+    except Exception as e:
+        logger.error(f"{scraper.chain_name} 이벤트 수집 중 오류 발생 (저장된 {sink.written}건은 유지): {e}", exc_info=True)
+    finally:
+        scraper.begin_run(None)
+    return sink.written
 
 @op(out=Out(List[Dict]))
-def get_events_from_db() -> List[Dict]:
-    """DB에 저장된 이벤트 목록 중 종료되지 않은 이벤트만 가져옵니다."""
+def get_events_from_db(config: StockTargetConfig) -> List[Dict]:
+    """DB에 저장된 이벤트 목록 중 종료되지 않은 이벤트만 가져옵니다. (config.event_ids가 있으면 해당 이벤트만)"""
     logger = get_dagster_logger()
     db = get_database_connector()
     events_df = db.select_query("SELECT * FROM goods_event")
@@ -43,87 +197,294 @@ def get_events_from_db() -> List[Dict]:
     # errors='coerce'는 잘못된 날짜 형식을 NaT (Not a Time)으로 변환하여 오류를 방지합니다.
     events_df['end_date_dt'] = pd.to_datetime(events_df['end_date'], errors='coerce')
     active_events_df = events_df[events_df['end_date_dt'] >= pd.Timestamp.now().normalize()].copy()
+    if config.event_ids is not None:
+        active_events_df = active_events_df[active_events_df['event_id'].astype(str).isin(config.event_ids)]
     
     logger.info(f"{len(active_events_df)}개의 이벤트를 대상으로 재고를 조회합니다.")
     
     return active_events_df.to_dict('records')
 
-@op(ins={"events": In(List[Dict])}, out=Out(List[Dict]))
-def get_all_stocks(events: List[Dict]) -> List[Dict]:
-    """수집된 모든 이벤트에 대해 재고 정보를 수집합니다."""
+def _fetch_event_stocks(scraper, event: Dict, previous: Optional[Dict] = None) -> Tuple[List[Dict], Optional[Dict]]:
+    """
+    이벤트 하나의 재고를 조회하여 저장용 형태로 변환합니다. (워커 스레드에서 실행)
+    응답이 이전 실행과 같으면 재고는 비워 두고, 해시 레코드의 checked_at만 갱신합니다.
+    """
     logger = get_dagster_logger()
-    if not events:
-        logger.info("수집된 이벤트가 없어 재고 조회를 건너뜁니다.")
-        return []
+    logger.info(f"'{event.get('goods_name', 'N/A')}' 재고 조회 시작...")
+    previous_hash = previous["response_hash"] if previous else None
+    stocks, response_hash = scraper.get_goods_stock_if_changed(event, previous_hash)
+    if response_hash is None:
+        return [], None
+
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+    hash_record = {
+        "theater_chain": event["theater_chain"],
+        "event_id": str(event["event_id"]),
+        "response_hash": response_hash,
+        "checked_at": now,
+        "changed_at": now if stocks is not None else previous["changed_at"],
+    }
+    if stocks is None:
+        logger.info(f"'{event.get('goods_name', 'N/A')}' 재고 변경 없음. 파싱과 저장을 생략합니다.")
+        return [], hash_record
+
+    logger.info(f"'{event.get('goods_name', 'N/A')}' 재고 {len(stocks)}건 조회 완료.")
+    scraped_at = datetime.now()
+    return [
+        {
+            "scraped_at": scraped_at,
+            "event_id": event["event_id"],
+            "theater_chain": event["theater_chain"],
+            "theater_name": stock["theater_name"],
+            "status": stock["status"],
+            "quantity": stock["quantity"],
+            "total_quantity": stock.get("total_quantity")
+        }
+        for stock in stocks
+    ], hash_record
+
+def _stocks_frame(stocks: List[Dict]) -> pd.DataFrame:
+    """조회한 재고 목록을 샤드 간에 넘길 DataFrame으로 만듭니다."""
+    stocks_df = pd.DataFrame(stocks, columns=STOCK_COLUMNS)
+    stocks_df["event_id"] = stocks_df["event_id"].astype(str)
+    # 영화관마다 수량이 숫자/문자열로 섞여 있어 Parquet로 넘기기 전에 숫자로 맞춥니다. (insert_goods_stock과 같은 변환)
+    for col in ["quantity", "total_quantity"]:
+        stocks_df[col] = pd.to_numeric(stocks_df[col], errors='coerce')
+    return stocks_df
+
+def _stock_lease(db) -> RunLease:
+    return RunLease(db, STOCK_LEASE_PREFIX, STOCK_LEASE_TTL_SECONDS)
 
-    all_stocks_enriched = []
-    scraper_map = {scraper.chain_name: scraper for scraper in SCRAPERS}
+def _remaining_run_seconds(context) -> float:
+    """STOCK_RUN_DEADLINE_SECONDS 중 이번 실행에 남은 시간. 늦게 시작한 샤드도 실행 전체의 마감을 지킵니다."""
+    run_record = context.instance.get_run_record_by_id(context.run_id)
+    started_at = run_record.start_time if run_record and run_record.start_time else time.time()
+    return STOCK_RUN_DEADLINE_SECONDS - (time.time() - started_at)
 
+@op(out={
+    **{CHAIN_KEYS[scraper.chain_name]: DynamicOut(List[Dict]) for scraper in SCRAPERS},
+    "lease_held_events": Out(Dict),
+})
+def shard_events(context, events: List[Dict]):
+    """
+    재고를 조회할 이벤트를 영화관별로 나누고 STOCK_SHARD_SIZE개씩 샤드로 묶어 내보냅니다.
+    동적 출력이 비면 저장 op까지 건너뛰어지므로, 이벤트가 없는 영화관도 빈 샤드 하나를 내보냅니다.
+
+    영화관마다 임대(run_lease)를 이번 실행 이름으로 얻고, 이전 실행이 아직 임대 중인 영화관의 이벤트는 조회하지 않습니다.
+    따라서 영화관별 재고 조회 실행은 항상 하나뿐입니다. 건너뛴 이벤트 수는 lease_held_events로 내보냅니다.
+    """
+    logger = get_dagster_logger()
+    events_by_chain = {scraper.chain_name: [] for scraper in SCRAPERS}
     for event in events:
-        scraper = scraper_map.get(event["theater_chain"])
-        if not scraper:
-            logger.warning(f"'{event['theater_chain']}'에 해당하는 스크레이퍼를 찾을 수 없습니다.")
+        chain_name = event["theater_chain"]
+        if chain_name not in events_by_chain:
+            logger.warning(f"'{chain_name}'에 해당하는 스크레이퍼를 찾을 수 없습니다.")
             continue
-        
-        try:
-            logger.info(f"'{event.get('goods_name', 'N/A')}' 재고 조회 시작...")
-            stocks = scraper.get_goods_stock(event)
-            logger.info(f"'{event.get('goods_name', 'N/A')}' 재고 {len(stocks)}건 조회 완료.")
-            
-            for stock in stocks:
-                enriched_stock = {
-                    "event_id": event["event_id"],
-                    "theater_name": stock["theater_name"],
-                    "status": stock["status"],
-                    "quantity": stock["quantity"],
-                    "total_quantity": stock.get("total_quantity")
-                }
-                all_stocks_enriched.append(enriched_stock)
-        except Exception as e:
-            logger.error(f"'{event.get('goods_name', 'N/A')}' 재고 조회 중 오류 발생: {e}", exc_info=True)
-
-    return all_stocks_enriched
-
-@op(ins={"events": In(List[Dict])})
-def save_events_to_db(events: List[Dict]):
-    """수집된 이벤트 정보를 데이터베이스에 저장하거나 업데이트합니다."""
+        events_by_chain[chain_name].append(event)
+
+    lease = _stock_lease(get_database_connector())
+    lease_held_events = {}
+    for chain_name, chain_events in events_by_chain.items():
+        if chain_events and not lease.acquire(chain_name, context.run_id):
+            logger.warning(f"{chain_name} 재고 조회를 다른 실행이 진행 중이라 이벤트 {len(chain_events)}개를 건너뜁니다.")
+            lease_held_events[chain_name] = len(chain_events)
+            events_by_chain[chain_name] = []
+    yield Output(lease_held_events, output_name="lease_held_events")
+
+    for chain_name, chain_events in events_by_chain.items():
+        chain_key = CHAIN_KEYS[chain_name]
+        shards = [chain_events[i:i + STOCK_SHARD_SIZE] for i in range(0, len(chain_events), STOCK_SHARD_SIZE)] or [[]]
+        logger.info(f"{chain_name} 이벤트 {len(chain_events)}개를 {len(shards)}개 샤드로 나눕니다.")
+        for index, shard in enumerate(shards):
+            yield DynamicOutput(shard, output_name=chain_key, mapping_key=f"{chain_key}_{index}")
+
+def _fetch_shard_stocks(context, scraper: TheaterEventScraper, events: List[Dict]) -> Tuple[pd.DataFrame, Dict]:
+    """
+    영화관 하나의 이벤트 샤드에 대해 재고를 조회합니다. 저장은 하지 않고 재고와 조회 결과 요약을 반환합니다.
+    샤드 안에서는 CHAIN_CONCURRENCY를 샤드 동시 실행 수로 나눈 만큼의 스레드로 조회하므로,
+    영화관별 동시 요청 수는 샤드가 몇 개 동시에 돌든 CHAIN_CONCURRENCY를 넘지 않습니다.
+
+    회로 차단기가 열린 영화관은 조회하지 않고, 요청은 STOCK_CHAIN_DEADLINE_SECONDS와 실행 전체에 남은 시간 안에서만 보냅니다.
+    마감 시간 안에 끝나지 않은 조회는 버리고 완료된 결과만 반환합니다.
+    이미 실행 중인 조회가 끝날 때까지는 마감 시각을 풀지 않으므로, 마감 이후에 새 요청이 나가지 않습니다.
+    이벤트는 STOCK_CIRCUIT_SYNC_EVENTS개씩 나눠 조회하고, 배치 사이마다 같은 영화관의 다른 샤드와 차단기 상태를 맞춥니다.
+    """
     logger = get_dagster_logger()
+    chain_name = scraper.chain_name
+    report = {"events": 0, "unchanged_events": 0, "skipped_events": 0, "circuit_open_events": 0, "hash_records": []}
     if not events:
-        logger.info("저장할 이벤트 정보가 없습니다.")
-        return
+        return _stocks_frame([]), report
 
     db = get_database_connector()
-    db.insert_goods_event(events)
-    logger.info(f"총 {len(events)}건의 이벤트 정보를 DB에 저장/업데이트했습니다.")
+    _restore_circuit_states(db, [scraper])
+    if _is_circuit_open(scraper):
+        report["circuit_open_events"] = len(events)
+        return _stocks_frame([]), report
+    remaining_seconds = _remaining_run_seconds(context)
+    if remaining_seconds <= 0:
+        logger.warning(f"실행 마감 시간({STOCK_RUN_DEADLINE_SECONDS}초)이 지나 {chain_name} 이벤트 {len(events)}개를 건너뜁니다.")
+        report["skipped_events"] = len(events)
+        return _stocks_frame([]), report
+
+    stock_hashes = _load_stock_hashes()
+    workers = max(1, CHAIN_CONCURRENCY.get(chain_name, DEFAULT_CHAIN_CONCURRENCY) // CHAIN_SHARD_CONCURRENCY.get(chain_name, 1))
+    batch_size = max(workers, STOCK_CIRCUIT_SYNC_EVENTS)
+    deadline = time.monotonic() + remaining_seconds
+    scraper.begin_run(min(STOCK_CHAIN_DEADLINE_SECONDS, remaining_seconds))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"stock-{CHAIN_KEYS[chain_name]}")
+    future_to_event = {}
+    next_index = 0
+    stocks = []
+    try:
+        while next_index < len(events):
+            if next_index:
+                # 배치마다 차단기 상태를 저장소와 맞춰, 같은 영화관의 다른 샤드가 차단기를 열었으면 남은 이벤트를 조회하지 않습니다.
+                _save_circuit_states(db, [scraper])
+                if _is_circuit_open(scraper):
+                    report["circuit_open_events"] = len(events) - next_index
+                    break
+            batch = events[next_index:next_index + batch_size]
+            next_index += len(batch)
+            future_to_event = {
+                executor.submit(_fetch_event_stocks, scraper, event, stock_hashes.get((chain_name, str(event["event_id"])))): event
+                for event in batch
+            }
+            for future in as_completed(future_to_event, timeout=max(0.0, deadline - time.monotonic())):
+                event = future_to_event[future]
+                report["events"] += 1
+                try:
+                    event_stocks, hash_record = future.result()
+                    stocks.extend(event_stocks)
+                    if hash_record:
+                        report["hash_records"].append(hash_record)
+                        previous = stock_hashes.get((hash_record["theater_chain"], hash_record["event_id"]))
+                        if previous and previous["response_hash"] == hash_record["response_hash"]:
+                            report["unchanged_events"] += 1
+                except Exception as e:
+                    logger.error(f"'{event.get('goods_name', 'N/A')}' 재고 조회 중 오류 발생: {e}", exc_info=True)
+    except FuturesTimeoutError:
+        report["skipped_events"] = sum(not future.done() for future in future_to_event) + len(events) - next_index
+        logger.warning(f"마감 시간 초과로 {chain_name} 이벤트 {report['skipped_events']}개의 재고 조회를 건너뜁니다.")
+    finally:
+        # 아직 시작하지 않은 작업은 취소하고, 실행 중인 작업이 끝난 뒤에 마감 시각을 풉니다.
+        # 마감 이후의 요청은 ChainDeadlineExceeded로 바로 실패하고 진행 중인 요청도 남은 시간으로 줄인 타임아웃을 쓰므로,
+        # 기다리는 시간은 요청 하나의 타임아웃(REQUEST_TIMEOUT_SECONDS) 이내입니다.
+        executor.shutdown(wait=True, cancel_futures=True)
+        scraper.begin_run(None)
+        _save_circuit_states(db, [scraper])
+
+    logger.info(f"{chain_name} 샤드 {report['events']}/{len(events)}개 이벤트의 재고 {len(stocks)}건 조회 완료.")
+    return _stocks_frame(stocks), report
 
-@op(ins={"stocks": In(List[Dict])}, out=Out(pd.DataFrame))
-def save_stocks_to_db(stocks: List[Dict]):
-    """재고 정보를 데이터베이스에 저장합니다."""
+def _build_fetch_stocks_op(scraper: TheaterEventScraper):
+    """영화관별 재고 조회 op. theater_chain 태그로 영화관마다 동시에 실행되는 샤드 수를 제한합니다."""
+    chain_key = CHAIN_KEYS[scraper.chain_name]
+
+    @op(
+        name=f"fetch_{chain_key}_stocks",
+        description=f"{scraper.chain_name} 이벤트 샤드 하나의 재고를 조회합니다.",
+        tags={CHAIN_TAG: chain_key},
+        out={"stocks": Out(pd.DataFrame), "report": Out(Dict)},
+    )
+    def fetch_chain_stocks(context, events: List[Dict]):
+        return _fetch_shard_stocks(context, scraper, events)
+
+    return fetch_chain_stocks
+
+FETCH_STOCKS_OPS = {scraper.chain_name: _build_fetch_stocks_op(scraper) for scraper in SCRAPERS}
+
+@op(
+    ins={
+        **{
+            f"{CHAIN_KEYS[scraper.chain_name]}_{name}": In(List[Dict] if name == "reports" else List[pd.DataFrame])
+            for scraper in SCRAPERS for name in ("stocks", "reports")
+        },
+        "lease_held_events": In(Dict),
+    },
+    out=Out(Dict),
+)
+def save_stocks_to_db(context, lease_held_events: Dict[str, int], **shard_results) -> Dict[str, int]:
+    """
+    모든 샤드의 재고를 모아 한 번에 저장하고, 이번 실행이 얻은 영화관 임대를 반납합니다.
+    응답 해시는 재고가 기록된 뒤에만 쓰므로, 재고 저장에 실패하면 해시를 쓰지 않고 op를 실패시킵니다.
+    (해시가 갱신되지 않은 응답은 다음 실행에서 다시 파싱되어 저장됩니다)
+    조회는 이미 끝났으므로 저장에 실패해도 임대는 바로 반납합니다. 실행이 중간에 죽으면 STOCK_LEASE_TTL_SECONDS 뒤에 만료됩니다.
+    """
     logger = get_dagster_logger()
-    if not stocks:
-        logger.info("저장할 재고 정보가 없습니다.")
-        return pd.DataFrame()
+    stock_frames = [df for name, frames in shard_results.items() if name.endswith("_stocks") for df in frames if not df.empty]
+    reports = [report for name, chain_reports in shard_results.items() if name.endswith("_reports") for report in chain_reports]
+    stocks_df = pd.concat(stock_frames, ignore_index=True) if stock_frames else pd.DataFrame(columns=STOCK_COLUMNS)
+    hash_records = [record for report in reports for record in report["hash_records"]]
 
     db = get_database_connector()
-    stocks_df = pd.DataFrame(stocks)
-    stocks_df["scraped_at"] = datetime.now()
-    
-    db.insert_goods_stock(stocks_df)
-    logger.info(f"총 {len(stocks_df)}건의 재고 정보를 DB에 저장했습니다.")
-    return stocks_df
+    try:
+        if not stocks_df.empty:
+            db.insert_goods_stock(stocks_df)
+        if hash_records:
+            db.upsert_stock_response_hashes(hash_records)
+    except Exception as e:
+        logger.error(f"재고 {len(stocks_df)}건 저장에 실패해 응답 해시 {len(hash_records)}건을 기록하지 않습니다: {e}")
+        raise
+    finally:
+        _stock_lease(db).release(context.run_id)
+
+    summary = {
+        key: sum(report[key] for report in reports)
+        for key in ["events", "unchanged_events", "skipped_events", "circuit_open_events"]
+    }
+    summary["lease_held_events"] = sum(lease_held_events.values())
+    summary["stock_rows"] = len(stocks_df)
+    logger.info(
+        f"{summary['events']}개 이벤트의 재고 {summary['stock_rows']}건 저장 완료. "
+        f"(변경 없음 {summary['unchanged_events']}건, 응답 해시 {len(hash_records)}건 갱신, "
+        f"마감으로 건너뜀 {summary['skipped_events']}건, 차단기로 건너뜀 {summary['circuit_open_events']}건, "
+        f"임대 중이라 건너뜀 {summary['lease_held_events']}건)"
+    )
+    return summary
+
+# 재고 조회 샤드는 별도 프로세스에서 병렬로 실행하되, 영화관별 동시 실행 수는 theater_chain 태그로 제한합니다.
+stock_executor = multiprocess_executor.configured(
+    {
+        "max_concurrent": sum(CHAIN_SHARD_CONCURRENCY.values()),
+        "tag_concurrency_limits": [
+            {"key": CHAIN_TAG, "value": CHAIN_KEYS[chain_name], "limit": limit}
+            for chain_name, limit in CHAIN_SHARD_CONCURRENCY.items()
+        ],
+    },
+    name="stock_multiprocess_executor",
+)
 
 @job
 def goods_events_job():
     """매일 아침 영화관 굿즈 이벤트를 수집하여 저장하는 작업"""
-    events = get_all_events()
-    save_events_to_db(events)
+    collect_events_to_db()
 
-@job
+@job(executor_def=stock_executor)
 def goods_stock_check_job():
-    """영화관 굿즈 재고를 주기적으로 확인하고 저장하는 작업"""
-    events = get_events_from_db()
-    stocks = get_all_stocks(events)
-    stocks_df_result = save_stocks_to_db(stocks)
+    """영화관 굿즈 재고를 주기적으로 확인하고 저장하는 작업. 영화관별 샤드 op가 병렬로 조회하고 결과는 한 번에 저장합니다."""
+    shards = shard_events(get_events_from_db())
+    shard_results = {"lease_held_events": shards.lease_held_events}
+    for scraper in SCRAPERS:
+        chain_key = CHAIN_KEYS[scraper.chain_name]
+        stocks, report = getattr(shards, chain_key).map(FETCH_STOCKS_OPS[scraper.chain_name])
+        shard_results[f"{chain_key}_stocks"] = stocks.collect()
+        shard_results[f"{chain_key}_reports"] = report.collect()
+    save_stocks_to_db(**shard_results)
+
+@run_failure_sensor(
+    monitored_jobs=[goods_stock_check_job],
+    default_status=DefaultSensorStatus.RUNNING,
+)
+def release_stock_leases_on_failure(context):
+    """
+    실패한 재고 조회 실행이 얻은 영화관 임대를 반납합니다.
+    샤드 op가 실패하면 save_stocks_to_db가 실행되지 않아 임대가 STOCK_LEASE_TTL_SECONDS 동안 남으므로, 실행이 끝나면 바로 반납합니다.
+    (op 실패 훅은 다른 샤드가 아직 조회 중일 때 불려 임대를 일찍 놓게 되므로 실행 단위 센서를 씁니다)
+    데몬이 꺼져 있으면 임대는 기존처럼 유효 시간이 지나 만료됩니다.
+    """
+    run_id = context.dagster_run.run_id
+    _stock_lease(get_database_connector()).release(run_id)
+    context.log.info(f"실패한 재고 조회 실행 {run_id[:8]}의 영화관 임대를 반납했습니다.")
 
 goods_events_schedule = ScheduleDefinition(
     job=goods_events_job,
@@ -132,9 +493,50 @@ goods_events_schedule = ScheduleDefinition(
     execution_timezone="Asia/Seoul"
 )
 
-goods_stock_schedule = ScheduleDefinition(
+@sensor(
+    job=goods_stock_check_job,
+    minimum_interval_seconds=STOCK_POLL_TICK_SECONDS,
+    default_status=DefaultSensorStatus.STOPPED,
+)
+def adaptive_goods_stock_sensor(context):
+    """
+    이벤트별로 계산한 조회 간격(StockPollScheduler)에 따라 다음 조회 시각이 지난 이벤트만 재고를 조회합니다.
+    periodic_goods_stock_check 스케줄을 대체하므로 둘 중 하나만 켜서 사용합니다.
+    """
+    db = get_database_connector()
+    scheduler = StockPollScheduler(db, tick_seconds=STOCK_POLL_TICK_SECONDS)
+    now = datetime.now()
+    due_events = scheduler.select_due_events(now)
+    if not due_events:
+        return SkipReason("다음 조회 시각이 지난 이벤트가 없습니다.")
+
+    # 아직 조회 중인 영화관의 이벤트는 다음 조회 시각을 그대로 두어 다음 틱에 다시 고릅니다.
+    held_leases = _stock_lease(db).held(now)
+    due_events = [plan for plan in due_events if plan["theater_chain"] not in held_leases]
+    if not due_events:
+        return SkipReason("재고 조회 대상 영화관을 모두 이전 실행이 조회 중입니다: " + ", ".join(RunLease.describe(held_leases)))
+
+    scheduler.mark_dispatched(due_events, now)
+    context.log.info(
+        "재고 조회 요청: " + ", ".join(f"{p['event_id']}({p['interval_seconds']}초)" for p in due_events)
+    )
+    return RunRequest(
+        run_config={"ops": {"get_events_from_db": {"config": {"event_ids": [p["event_id"] for p in due_events]}}}},
+        tags={"stock_poll/event_count": str(len(due_events))},
+    )
+
+@schedule(
     job=goods_stock_check_job,
     cron_schedule="*/10 * * * *",  # 10분마다 실행
     name="periodic_goods_stock_check",
     execution_timezone="Asia/Seoul"
-)
\ No newline at end of file
+)
+def goods_stock_schedule(context):
+    """
+    10분마다 재고를 조회합니다. 모든 영화관을 이전 실행이 아직 조회 중(임대 중)이면
+    실행을 만들지 않고 건너뛴 이유를 틱 기록에 남깁니다. 일부 영화관만 임대 중이면 나머지 영화관만 조회합니다.
+    """
+    held_leases = _stock_lease(get_database_connector()).held()
+    if all(scraper.chain_name in held_leases for scraper in SCRAPERS):
+        return SkipReason("이전 재고 조회 실행이 아직 모든 영화관을 조회 중입니다: " + ", ".join(RunLease.describe(held_leases)))
+    return RunRequest()
\ No newline at end of file
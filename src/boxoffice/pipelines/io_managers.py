@@ -0,0 +1,113 @@
+import json
+import os
+from typing import Any, Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dagster import (
+    ConfigurableIOManagerFactory, IOManager, InputContext, OutputContext, InitResourceContext, MetadataValue,
+)
+
+# list[dict] 출력을 표로 저장했다는 표시. 읽을 때 다시 list[dict]로 돌려줍니다.
+RECORDS_KIND_KEY = b"boxoffice.kind"
+RECORDS_KIND = b"records"
+
+
+class DataFrameFileIOManager(IOManager):
+    """
+    op 사이에 넘기는 DataFrame(과 list[dict])을 pickle 대신 Parquet 또는 Arrow IPC 파일로 저장합니다.
+    나머지 작은 출력(요약 dict 등)은 JSON으로 저장합니다.
+    저장할 때마다 행 수와 파일 크기를 출력 메타데이터로 남깁니다.
+    """
+
+    def __init__(self, base_dir: str, file_format: str = "parquet", compression: Optional[str] = "zstd"):
+        if file_format not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported file format: {file_format}. Must be 'parquet' or 'arrow'.")
+        self.base_dir = base_dir
+        self.file_format = file_format
+        self.compression = compression
+
+    def _base_path(self, context) -> str:
+        if isinstance(context, InputContext):
+            context = context.upstream_output
+        identifier = context.get_asset_identifier() if context.has_asset_key else context.get_identifier()
+        return os.path.join(self.base_dir, *identifier)
+
+    # --- 저장 ---
+
+    def handle_output(self, context: OutputContext, obj: Any):
+        base_path = self._base_path(context)
+        os.makedirs(os.path.dirname(base_path), exist_ok=True)
+        table = self._to_table(obj)
+        if table is None:
+            path = f"{base_path}.json"
+            with open(path, "w", encoding="utf8") as f:
+                json.dump(obj, f, ensure_ascii=False)
+            metadata = {}
+        else:
+            path = f"{base_path}.{self.file_format}"
+            self._write_table(table, path)
+            metadata = {"rows": table.num_rows}
+        metadata.update({
+            "bytes": os.path.getsize(path),
+            "format": os.path.splitext(path)[1][1:],
+            "path": MetadataValue.path(path),
+        })
+        context.add_output_metadata(metadata)
+
+    def _to_table(self, obj: Any) -> Optional[pa.Table]:
+        if isinstance(obj, pd.DataFrame):
+            return pa.Table.from_pandas(obj)
+        if isinstance(obj, list) and all(isinstance(record, dict) for record in obj):
+            table = pa.Table.from_pandas(pd.DataFrame.from_records(obj), preserve_index=False)
+            return table.replace_schema_metadata({**(table.schema.metadata or {}), RECORDS_KIND_KEY: RECORDS_KIND})
+        return None
+
+    def _write_table(self, table: pa.Table, path: str):
+        if self.file_format == "parquet":
+            pq.write_table(table, path, compression=self.compression or "none")
+            return
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+
+    # --- 읽기 ---
+
+    def load_input(self, context: InputContext) -> Any:
+        base_path = self._base_path(context)
+        for file_format in (self.file_format, "parquet", "arrow"):
+            path = f"{base_path}.{file_format}"
+            if os.path.exists(path):
+                return self._from_table(self._read_table(path, file_format))
+        with open(f"{base_path}.json", "r", encoding="utf8") as f:
+            return json.load(f)
+
+    def _read_table(self, path: str, file_format: str) -> pa.Table:
+        if file_format == "parquet":
+            return pq.read_table(path)
+        # 압축하지 않은 Arrow IPC 파일은 메모리 매핑으로 복사 없이 읽습니다.
+        with pa.memory_map(path, "r") as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def _from_table(self, table: pa.Table) -> Any:
+        metadata = table.schema.metadata or {}
+        df = table.to_pandas()
+        if metadata.get(RECORDS_KIND_KEY) == RECORDS_KIND:
+            return df.to_dict("records")
+        return df
+
+
+class ParquetIOManager(ConfigurableIOManagerFactory):
+    """
+    DataFrameFileIOManager 리소스.
+    base_dir을 비우면 Dagster 인스턴스 저장소 아래(storage/dataframes)에 저장합니다.
+    file_format="arrow"로 두면 Arrow IPC 파일로 저장하며, compression을 None으로 두어야 메모리 매핑으로 읽을 수 있습니다.
+    """
+
+    base_dir: Optional[str] = None
+    file_format: str = "parquet"
+    compression: Optional[str] = "zstd"
+
+    def create_io_manager(self, context: InitResourceContext) -> DataFrameFileIOManager:
+        base_dir = self.base_dir or os.path.join(context.instance.storage_directory(), "dataframes")
+        return DataFrameFileIOManager(base_dir, self.file_format, self.compression)
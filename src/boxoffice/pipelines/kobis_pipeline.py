@@ -1,96 +1,266 @@
-from dagster import job, op, In, Out, get_dagster_logger, ScheduleDefinition
+from dagster import (
+    asset, define_asset_job, schedule,
+    DailyPartitionsDefinition, TimeWindowPartitionsDefinition,
+    Config, MaterializeResult, RunRequest, RetryPolicy, Failure, get_dagster_logger,
+)
+import hashlib
+import json
 from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple
+import pandas as pd
+from ..logic.config import KobisConfig
 from ..logic.kobisdata_extractor import KobisDataExtractor
 from ..logic.database_manager import get_database_connector
-import pandas as pd
-from typing import List, Dict
 
-@op(out={"boxoffice_df": Out(pd.DataFrame), "movie_df": Out(pd.DataFrame)})
-def extract_kobis_data(context):
+KOBIS_TIMEZONE = "Asia/Seoul"
+BOXOFFICE_START_DATE = "2025-01-01"
+MOVIE_START_YEAR = "2025"
+# 백필 때 KOBIS API를 동시에 호출하는 실행 수는 Dagster pool 한도로 제한합니다. (예: dagster instance concurrency set kobis_api 4)
+KOBIS_POOL = "kobis_api"
+# 영화 증분 동기화 한 번에 상세정보 API로 채우는 박스오피스 누락 영화 수
+MISSING_MOVIES_PER_RUN = 50
+
+# 파티션 하나 = target_dt 하루. 마지막 파티션은 어제입니다.
+boxoffice_partitions = DailyPartitionsDefinition(start_date=BOXOFFICE_START_DATE, timezone=KOBIS_TIMEZONE)
+# 파티션 하나 = 개봉 연도. 아직 끝나지 않은 올해도 포함합니다.
+movie_partitions = TimeWindowPartitionsDefinition(
+    start=MOVIE_START_YEAR, cron_schedule="0 0 1 1 *", fmt="%Y", timezone=KOBIS_TIMEZONE, end_offset=1
+)
+
+
+@asset(
+    partitions_def=boxoffice_partitions,
+    group_name="kobis",
+    pool=KOBIS_POOL,
+    retry_policy=RetryPolicy(max_retries=2, delay=60),
+)
+def boxoffice(context) -> MaterializeResult:
+    """
+    KOBIS 일별 박스오피스. 파티션 날짜의 순위를 받아 (movie_cd, target_dt) 기준으로 upsert하므로
+    같은 파티션을 다시 실행해도 결과가 같습니다.
+    KOBIS는 최근 며칠의 수치를 사후 정정하므로 daily_kobis_schedule이 최근 파티션을 다시 실행하며,
+    이때 행 해시(boxoffice_hash)가 바뀐 행만 쓰고, 다시 받은 응답에서 빠진 영화의 행은 지웁니다.
+    """
     logger = get_dagster_logger()
-    extractor = KobisDataExtractor()
+    target_dt = datetime.strptime(context.partition_key, "%Y-%m-%d")
     db = get_database_connector()
 
-    # --- Box Office Backfill Logic ---
-    yesterday = datetime.now() - timedelta(days=1)
-    
-    # DB에서 가장 최근 데이터 날짜 조회
-    latest_date_df = db.select_query("SELECT MAX(target_dt) as max_date FROM boxoffice")
-    
-    start_date = None
-    # DB에 데이터가 없거나 날짜가 없는 경우, 최근 7일치 수집
-    if latest_date_df.empty or pd.isna(latest_date_df['max_date'].iloc[0]):
-        logger.info("박스오피스 데이터가 없습니다. 최근 7일치 데이터를 수집합니다.")
-        start_date = (yesterday - timedelta(days=6)).date()
-    else:
-        # 마지막 날짜의 다음날부터 수집 시작
-        latest_date_in_db = pd.to_datetime(latest_date_df['max_date'].iloc[0]).date()
-        start_date = (latest_date_in_db + timedelta(days=1))
-
-    boxoffice_df = pd.DataFrame()
-    all_boxoffice_dfs = []
-    # 수집 시작일이 어제보다 이전일 경우에만 데이터 수집
-    if start_date <= yesterday.date():
-        logger.info(f"박스오피스 데이터 수집 기간: {start_date.strftime('%Y-%m-%d')} ~ {yesterday.strftime('%Y-%m-%d')}")
-        current_date = start_date
-        while current_date <= yesterday.date():
-            daily_df = extractor.get_DailyBoxOffice(datetime.combine(current_date, datetime.min.time()))
-            if not daily_df.empty:
-                all_boxoffice_dfs.append(daily_df)
-            current_date += timedelta(days=1)
-        
-        if all_boxoffice_dfs:
-            boxoffice_df = pd.concat(all_boxoffice_dfs, ignore_index=True)
-        else:
-            boxoffice_df = pd.DataFrame(columns=['rnum', 'rank', 'rank_inten', 'rank_old_and_new', 'movie_cd', 'movie_nm', 'open_dt', 'sales_amt', 'sales_share', 'sales_inten', 'sales_change', 'sales_acc', 'audi_cnt', 'audi_inten', 'audi_change', 'audi_acc', 'scrn_cnt', 'show_cnt'])
-        logger.info(f"박스오피스 수집 완료. {len(boxoffice_df)}건")
-    else:
-        logger.info("박스오피스 데이터가 최신 상태입니다. 수집을 건너뜁니다.")
-        boxoffice_df = pd.DataFrame(columns=['rnum', 'rank', 'rank_inten', 'rank_old_and_new', 'movie_cd', 'movie_nm', 'open_dt', 'sales_amt', 'sales_share', 'sales_inten', 'sales_change', 'sales_acc', 'audi_cnt', 'audi_inten', 'audi_change', 'audi_acc', 'scrn_cnt', 'show_cnt'])
-
-    # 2. movie list
-    current_year = datetime.now().year
-    movie_df = extractor.get_MovieList(current_year)
-    logger.info(f"영화목록 수집 완료. {len(movie_df)}건")
-    
+    boxoffice_df = KobisDataExtractor().get_DailyBoxOffice(target_dt)
+    if boxoffice_df.empty:
+        # 지난 날짜의 박스오피스가 비어 있으면 API 오류이므로 실패로 남겨 재시도/재백필 대상이 되게 합니다.
+        raise Failure(description=f"{context.partition_key} 박스오피스 응답이 비어 있습니다.")
+
+    written_rows, revised_rows, deleted_rows = save_boxoffice_day(db, context.partition_key, boxoffice_df)
+    logger.info(
+        f"{context.partition_key} 박스오피스 {len(boxoffice_df)}건 중 {written_rows}건 저장 "
+        f"(정정 {revised_rows}건, 응답에서 빠져 삭제 {deleted_rows}건)"
+    )
+    return MaterializeResult(metadata={
+        "rows": len(boxoffice_df),
+        "written_rows": written_rows,
+        "revised_rows": revised_rows,
+        "deleted_rows": deleted_rows,
+        "audi_cnt": int(boxoffice_df["audi_cnt"].sum()),
+    })
+
+
+def save_boxoffice_day(db, target_dt: str, boxoffice_df: pd.DataFrame) -> Tuple[int, int, int]:
+    """
+    target_dt(YYYY-MM-DD) 하루의 박스오피스 중 행 해시가 바뀐 행만 upsert하고 (저장 행 수, 정정 행 수, 삭제 행 수)를 반환합니다.
+    boxoffice_df는 그날의 전체 응답이어야 합니다. 응답에서 빠진 영화(정정으로 순위에서 밀려난 영화)의 행과 해시는 지웁니다.
+    boxoffice 자산과 백필 CLI(src/scripts/backfill.py)가 함께 사용합니다.
+    """
+    movie_cds = boxoffice_df["movie_cd"].astype(str)
+    row_hashes = _row_hashes(boxoffice_df)
+    previous_hashes = _load_boxoffice_hashes(db, target_dt)
+    previous = movie_cds.map(previous_hashes)
+    changed = previous.isna() | (previous != row_hashes)
+    revised_rows = int((changed & previous.notna()).sum())
+
+    if changed.any():
+        # 저장에 실패하면 예외가 그대로 올라가 해시를 쓰지 않으므로, 다음 실행에서 같은 행을 다시 씁니다.
+        db.insert_boxoffice(boxoffice_df[changed])
+        changed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+        db.upsert_boxoffice_hashes([
+            {"target_dt": target_dt, "movie_cd": movie_cd, "row_hash": row_hash, "changed_at": changed_at}
+            for movie_cd, row_hash in zip(movie_cds[changed], row_hashes[changed])
+        ])
+
+    stale_movie_cds = sorted((_load_boxoffice_movie_codes(db, target_dt) | set(previous_hashes)) - set(movie_cds))
+    if stale_movie_cds:
+        db.delete_boxoffice_rows(target_dt, stale_movie_cds)
+    return int(changed.sum()), revised_rows, len(stale_movie_cds)
+
+
+def _row_hashes(boxoffice_df: pd.DataFrame) -> pd.Series:
+    """행마다 모든 컬럼 값으로 만든 SHA-1 해시 (컬럼 순서와 무관)"""
+    records = boxoffice_df.astype(object).where(boxoffice_df.notna(), None).to_dict("records")
+    return pd.Series(
+        [hashlib.sha1(json.dumps(record, sort_keys=True, default=str, ensure_ascii=False).encode("utf8")).hexdigest()
+         for record in records],
+        index=boxoffice_df.index,
+    )
+
+
+def _load_boxoffice_hashes(db, target_dt: str) -> Dict[str, str]:
+    """target_dt 하루의 {movie_cd: row_hash}"""
+    hash_df = db.select_query(f"SELECT movie_cd, row_hash FROM boxoffice_hash WHERE target_dt = '{target_dt}'")
+    if hash_df.empty:
+        return {}
+    return dict(zip(hash_df["movie_cd"].astype(str), hash_df["row_hash"]))
+
+
+def _load_boxoffice_movie_codes(db, target_dt: str) -> Set[str]:
+    """boxoffice에 저장된 target_dt 하루의 movie_cd (target_dt에 함수를 씌우지 않고 범위로 비교)"""
+    next_dt = (datetime.strptime(target_dt, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    movie_df = db.select_query(
+        f"SELECT movie_cd FROM boxoffice WHERE target_dt >= '{target_dt}' AND target_dt < '{next_dt}'"
+    )
+    return set(movie_df["movie_cd"].astype(str)) if not movie_df.empty else set()
+
+
+class MovieSyncConfig(Config):
+    """full_reload=False이면 새 페이지와 박스오피스에만 있는 영화만 가져옵니다. (백필/정기 점검은 전체 다시 받기)"""
+    full_reload: bool = True
 
-    if movie_df.empty:
-        movie_df = pd.DataFrame(columns=['movie_cd', 'movie_nm', 'movie_nm_en', 'prdt_year', 'open_dt', 'type_nm', 'prdt_stat_nm', 'nation_alt', 'genre_alt', 'rep_nation_nm', 'rep_genre_nm', 'directors', 'companys'])
 
-    return boxoffice_df, movie_df
+def _known_movie_codes(db, movie_cds: List[str]) -> Set[str]:
+    """movie_cds 중 movie 테이블에 이미 있는 코드"""
+    if not movie_cds:
+        return set()
+    codes = ", ".join("'" + str(code).replace("'", "''") + "'" for code in movie_cds)
+    known_df = db.select_query(f"SELECT movie_cd FROM movie WHERE movie_cd IN ({codes})")
+    return set(known_df["movie_cd"].astype(str)) if not known_df.empty else set()
 
-@op(
-    ins={"boxoffice_df": In(pd.DataFrame), "movie_df": In(pd.DataFrame)}
+
+def _missing_boxoffice_movie_codes(db) -> List[str]:
+    """박스오피스에는 있지만 movie 테이블에는 없는 movie_cd"""
+    missing_df = db.select_query("""
+        SELECT DISTINCT b.movie_cd
+        FROM boxoffice b
+        LEFT JOIN movie m ON m.movie_cd = b.movie_cd
+        WHERE m.movie_cd IS NULL AND b.movie_cd IS NOT NULL
+    """)
+    return missing_df["movie_cd"].astype(str).tolist() if not missing_df.empty else []
+
+
+def _sync_new_movies(db, extractor: KobisDataExtractor, year: int) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    영화목록을 앞 페이지부터 받아 DB에 없는 영화만 모으고, 새 영화가 하나도 없는 페이지가 나오면 멈춥니다.
+    (KOBIS 영화목록은 최근 등록된 영화가 앞에 온다고 보고, 뒤쪽 페이지의 변경은 full_reload로 맞춥니다)
+    이어서 박스오피스에 올랐지만 movie에 없는 영화를 상세정보 API로 MISSING_MOVIES_PER_RUN개까지 채웁니다.
+    """
+    new_pages = []
+    pages = 0
+    for page_df in extractor.iter_movie_list_pages(year):
+        pages += 1
+        known_codes = _known_movie_codes(db, page_df["movie_cd"].astype(str).tolist())
+        unknown_df = page_df[~page_df["movie_cd"].astype(str).isin(known_codes)]
+        # 필터(성인물 등)로 저장하지 않는 영화는 매번 새 영화로 보이므로, 가공한 뒤에 남는 영화로 판단합니다.
+        new_df = extractor.clean_movie_list(unknown_df) if not unknown_df.empty else unknown_df
+        if new_df.empty:
+            break
+        new_pages.append(new_df)
+    new_codes = {str(code) for df in new_pages for code in df["movie_cd"]}
+
+    missing_codes = [code for code in _missing_boxoffice_movie_codes(db) if code not in new_codes]
+    missing_movies = extractor.get_movies_by_code(missing_codes[:MISSING_MOVIES_PER_RUN])
+
+    frames = [df for df in [*new_pages, missing_movies] if not df.empty]
+    movie_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return movie_df, {
+        "list_pages": pages,
+        "new_movies": len(new_codes),
+        "missing_movies": len(missing_movies),
+        "missing_codes": len(missing_codes),
+    }
+
+
+@asset(
+    partitions_def=movie_partitions,
+    group_name="kobis",
+    pool=KOBIS_POOL,
+    retry_policy=RetryPolicy(max_retries=2, delay=60),
 )
-def save_kobis_data(boxoffice_df, movie_df):
+def movie(context, config: MovieSyncConfig) -> MaterializeResult:
+    """
+    KOBIS 영화 목록. 파티션 연도에 개봉(예정)인 영화를 movie_cd 기준으로 upsert합니다.
+    full_reload=False이면 연도 전체 대신 새로 등록된 영화와 박스오피스에만 있는 영화만 가져옵니다.
+    """
     logger = get_dagster_logger()
+    year = int(context.partition_key)
+    extractor = KobisDataExtractor()
     db = get_database_connector()
 
-    # 1. boxoffice 삽입
-    if not boxoffice_df.empty:
-        db.insert_boxoffice(boxoffice_df)
-        logger.info(f"{len(boxoffice_df)}건 boxoffice 삽입 완료")
-    else:
-        logger.info("삽입할 신규 박스오피스 데이터가 없습니다.")
-
-    # 2. movie: 중복제거 후 삽입
-    exist_movie_df = db.select_query("SELECT movie_cd FROM movie")
-    exist_codes = set()
-    if not exist_movie_df.empty and "movie_cd" in exist_movie_df.columns:
-        exist_codes = set(exist_movie_df["movie_cd"].unique())
-    new_movie_df = movie_df[~movie_df["movie_cd"].isin(exist_codes)].copy()
-
-    db.insert_movie(new_movie_df)
-    logger.info(f"{len(new_movie_df)}건 신규 movie 삽입 완료")
-
-@job
-def kobis_daily_job():
-    boxoffice_df, movie_df = extract_kobis_data()
-    save_kobis_data(boxoffice_df, movie_df)
-
-kobis_daily_schedule = ScheduleDefinition(
-    job=kobis_daily_job,
+    if not config.full_reload:
+        movie_df, stats = _sync_new_movies(db, extractor, year)
+        if not movie_df.empty:
+            db.insert_movie(movie_df)
+        logger.info(
+            f"{year}년 영화 증분 동기화: 목록 {stats['list_pages']}페이지, 신규 {stats['new_movies']}건, "
+            f"박스오피스 누락 {stats['missing_movies']}/{stats['missing_codes']}건 저장"
+        )
+        return MaterializeResult(metadata={"rows": len(movie_df), "full_reload": False, **stats})
+
+    movie_df = extractor.get_MovieList(year)
+    if movie_df.empty:
+        raise Failure(description=f"{year}년 영화 목록 응답이 비어 있습니다.")
+
+    db.insert_movie(movie_df)
+    logger.info(f"{year}년 영화 {len(movie_df)}건 저장 완료")
+    return MaterializeResult(metadata={"rows": len(movie_df), "full_reload": True})
+
+
+kobis_boxoffice_job = define_asset_job("kobis_boxoffice_job", selection=[boxoffice])
+kobis_movie_job = define_asset_job("kobis_movie_job", selection=[movie])
+
+@schedule(
+    job=kobis_boxoffice_job,
     cron_schedule="0 8 * * *",
     name="daily_kobis_schedule",
-    execution_timezone="Asia/Seoul"
-)
\ No newline at end of file
+    execution_timezone=KOBIS_TIMEZONE,
+)
+def kobis_daily_schedule(context):
+    """
+    매일 08시에 어제 파티션과 그 전 며칠(KobisConfig.revision_window_days일까지)의 파티션을 materialize합니다.
+    다시 받은 날짜는 정정된 행만 쓰입니다.
+    """
+    scheduled_at = context.scheduled_execution_time
+    yesterday = (scheduled_at - timedelta(days=1)).date()
+    start_date = datetime.strptime(BOXOFFICE_START_DATE, "%Y-%m-%d").date()
+    for offset in range(max(1, KobisConfig().revision_window_days)):
+        target_date = yesterday - timedelta(days=offset)
+        if target_date < start_date:
+            break
+        yield RunRequest(
+            run_key=f"boxoffice_{scheduled_at:%Y%m%d}_{target_date:%Y%m%d}",
+            partition_key=target_date.strftime("%Y-%m-%d"),
+        )
+
+
+@schedule(
+    job=kobis_movie_job,
+    cron_schedule="0 8 * * *",
+    name="daily_kobis_movie_schedule",
+    execution_timezone=KOBIS_TIMEZONE,
+)
+def kobis_movie_schedule(context):
+    """올해 영화 목록에 새로 등록된 영화와 박스오피스에만 있는 영화를 매일 가져옵니다."""
+    scheduled_at = context.scheduled_execution_time
+    return RunRequest(
+        run_key=f"movie_{scheduled_at:%Y%m%d}",
+        partition_key=str(scheduled_at.year),
+        run_config={"ops": {"movie": {"config": {"full_reload": False}}}},
+    )
+
+
+@schedule(
+    job=kobis_movie_job,
+    cron_schedule="0 6 * * 0",
+    name="weekly_kobis_movie_reconcile",
+    execution_timezone=KOBIS_TIMEZONE,
+)
+def kobis_movie_reconcile_schedule(context):
+    """매주 일요일 올해 영화 목록 전체를 다시 받아 증분 동기화가 놓친 변경(개봉일, 제작상태 등)을 맞춥니다."""
+    scheduled_at = context.scheduled_execution_time
+    return RunRequest(run_key=f"movie_reconcile_{scheduled_at:%Y%m%d}", partition_key=str(scheduled_at.year))
@@ -0,0 +1,29 @@
+from dagster import job, op, Out, get_dagster_logger, ScheduleDefinition
+from typing import Dict
+from ..logic.supabase_replicator import SupabaseReplicator
+
+@op(out=Out(Dict))
+def sync_sqlite_to_supabase() -> Dict[str, int]:
+    """로컬 SQLite에 새로 적재된 행을 Supabase로 복제합니다. (database.type = 'replicated')"""
+    logger = get_dagster_logger()
+    replicator = SupabaseReplicator()
+    results = replicator.sync_all()
+
+    status_df = replicator.get_status()
+    for _, row in status_df.iterrows():
+        if row["last_error"]:
+            logger.warning(f"{row['table_name']} 복제 지연: {row['last_error']} (마지막 성공: {row['last_synced_at']})")
+    logger.info(f"Supabase 복제 완료: {results}")
+    return results
+
+@job
+def supabase_sync_job():
+    """로컬 SQLite → Supabase 비동기 복제 작업"""
+    sync_sqlite_to_supabase()
+
+supabase_sync_schedule = ScheduleDefinition(
+    job=supabase_sync_job,
+    cron_schedule="*/5 * * * *",  # 5분마다 실행
+    name="periodic_supabase_sync",
+    execution_timezone="Asia/Seoul"
+)
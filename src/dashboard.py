@@ -70,82 +70,91 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# 박스오피스는 페이지마다 선택한 날짜/기간만 DB에서 가져옵니다. (target_dt 인덱스로 범위 조회)
+# 전체 기간을 한 번에 읽지 않으므로 데이터가 쌓여도 첫 로딩 시간과 메모리가 늘지 않습니다.
+
 @st.cache_data(ttl=600) # Cache data for 10 minutes
-def load_data():
-    """Loads filtered data from the database for efficiency."""
+def load_boxoffice_date_range():
+    """박스오피스가 있는 첫 날짜와 마지막 날짜. 데이터가 없으면 (None, None)"""
     db = get_database_connector()
-    
-    # 1. 박스오피스: 필요한 컬럼만 선택하여 모든 기간의 데이터를 로드
-    boxoffice_query = """
-    SELECT 
-        target_dt, rank, movie_nm, audi_cnt, 
-        audi_inten, audi_acc, sales_amt, open_dt, movie_cd
-    FROM boxoffice
-    ORDER BY target_dt DESC, rank ASC
-    """
-    boxoffice_df = db.select_query(boxoffice_query)
+    range_df = db.get_boxoffice_date_range()
+    if range_df.empty or pd.isna(range_df['max_dt'].iloc[0]):
+        return None, None
+    return pd.to_datetime(range_df['min_dt'].iloc[0]).date(), pd.to_datetime(range_df['max_dt'].iloc[0]).date()
+
+@st.cache_data(ttl=600) # Cache data for 10 minutes
+def load_boxoffice(start_date, end_date, movie_nms=None):
+    """기간 내 박스오피스 행. movie_nms(tuple)를 주면 해당 영화만 가져옵니다."""
+    db = get_database_connector()
+    df = db.get_boxoffice(start_date, end_date, list(movie_nms) if movie_nms is not None else None)
+    if not df.empty:
+        df['target_dt_date'] = pd.to_datetime(df['target_dt']).dt.date
+    return df
+
+@st.cache_data(ttl=600) # Cache data for 10 minutes
+def load_movie_details(movie_cds):
+    """화면에 보이는 영화(movie_cds, tuple)의 장르 등 상세 정보"""
+    db = get_database_connector()
+    return db.get_movie_details(list(movie_cds))
 
-    # 2. 굿즈 이벤트: 종료되지 않은 이벤트만 로드 (타입 변환 추가)
+@st.cache_data(ttl=600) # Cache data for 10 minutes
+def load_active_events():
+    """종료되지 않은 굿즈 이벤트"""
+    db = get_database_connector()
     event_query = """
     SELECT * FROM goods_event
     WHERE CAST(end_date AS date) >= date('now')
     ORDER BY start_date DESC
     """
-    event_df = db.select_query(event_query)
-    
-    # 3. 영화 상세 정보 (장르)
-    movie_details_df = db.select_query("SELECT movie_cd, rep_genre_nm FROM movie")
-    
-    return boxoffice_df, event_df, movie_details_df
+    return db.select_query(event_query)
+
+@st.cache_data(ttl=600) # Cache data for 10 minutes
+def load_period_aggregates(start_date, end_date):
+    """기간별 집계(일별 합계, 상위 영화, 장르 분포)를 DB에서 계산하여 가져옵니다."""
+    db = get_database_connector()
+    daily_totals_df = db.get_daily_totals(start_date, end_date)
+    top_movies_df = db.get_top_movies(start_date, end_date, top_n=10)
+    genre_df = db.get_genre_distribution(start_date, end_date, top_n=3)
+
+    if not daily_totals_df.empty:
+        daily_totals_df['target_dt_date'] = pd.to_datetime(daily_totals_df['target_dt']).dt.date
+    return daily_totals_df, top_movies_df, genre_df
 
 @st.cache_data(ttl=60) # Cache stock data for 1 minute
 def get_stock_data_for_event(event_id: str):
     """Fetches the latest stock data for a specific event_id."""
     db = get_database_connector()
-    stock_query = f"""
-    WITH ranked_stock AS (
-        SELECT
-            s.*,
-            CAST(s.event_id AS TEXT) as event_id_str, -- event_id를 문자열로 캐스팅
-            ROW_NUMBER() OVER(PARTITION BY s.event_id, s.theater_name ORDER BY s.scraped_at DESC) as rn
-        FROM
-            goods_stock s
-    )
-    SELECT *
-    FROM ranked_stock
-    WHERE rn = 1 AND event_id_str = '{event_id}'
-    """
-    stock_df = db.select_query(stock_query)
-    return stock_df
+    return db.get_latest_stock(event_id)
 
 @st.cache_data(ttl=60) # Cache for 1 minute
 def get_latest_overall_stock_scrape_time():
-    """Fetches the latest scraped_at timestamp from the entire goods_stock table."""
+    """
+    Fetches the latest stock check time.
+    Unchanged responses are not written to goods_stock, so goods_stock_hash.checked_at is included.
+    """
     db = get_database_connector()
     query = """
-    SELECT MAX(scraped_at) as latest_scrape_time
-    FROM goods_stock
+    SELECT MAX(latest_scrape_time) as latest_scrape_time
+    FROM (
+        SELECT MAX(scraped_at) as latest_scrape_time FROM goods_stock
+        UNION ALL
+        SELECT MAX(checked_at) as latest_scrape_time FROM goods_stock_hash
+    ) t
     """
     result = db.select_query(query)
     if not result.empty and result['latest_scrape_time'].iloc[0]:
         return pd.to_datetime(result['latest_scrape_time'].iloc[0])
     return None
 
-def show_boxoffice_dashboard(df):
+def show_boxoffice_dashboard():
     """Displays the daily box office dashboard."""
     st.title("📊 일일 박스오피스")
 
-    if df.empty:
+    min_date, max_date = load_boxoffice_date_range()
+    if max_date is None:
         st.warning("박스오피스 데이터가 없습니다.")
         return
 
-    df['target_dt_date'] = pd.to_datetime(df['target_dt']).dt.date
-    
-    # Date selector
-    available_dates = df['target_dt_date'].unique()
-    min_date = available_dates.min()
-    max_date = available_dates.max()
-    
     selected_date = st.date_input(
         "날짜 선택",
         value=max_date,
@@ -155,7 +164,10 @@ def show_boxoffice_dashboard(df):
 
     st.header(f"🗓️ {selected_date.strftime('%Y-%m-%d')} 기준")
 
-    display_df = df[df['target_dt_date'] == selected_date]
+    display_df = load_boxoffice(selected_date, selected_date)
+    if display_df.empty:
+        st.warning("선택한 날짜의 박스오피스 데이터가 없습니다.")
+        return
 
     # Top 3 movies
     cols = st.columns(3)
@@ -200,12 +212,19 @@ def show_boxoffice_dashboard(df):
     display_columns = {
         "rank": "순위",
         "movie_nm": "영화명",
+        "rep_genre_nm": "장르",
         "audi_cnt": "일일 관객수",
         "audi_acc": "누적 관객수",
         "sales_amt": "일일 매출액",
         "open_dt": "개봉일",
     }
     
+    # 장르는 이 날짜에 보이는 영화만 조회해서 붙입니다.
+    movie_details_df = load_movie_details(tuple(display_df['movie_cd'].astype(str)))
+    genre_by_movie_cd = {} if movie_details_df.empty else dict(
+        zip(movie_details_df['movie_cd'].astype(str), movie_details_df['rep_genre_nm'])
+    )
+    display_df['rep_genre_nm'] = display_df['movie_cd'].astype(str).map(genre_by_movie_cd)
     display_df_formatted = display_df[list(display_columns.keys())].rename(columns=display_columns)
     
     # 날짜 형식 변경
@@ -217,18 +236,15 @@ def show_boxoffice_dashboard(df):
         "일일 매출액": "{:,.0f}",
     }), hide_index=True)
 
-def show_overall_boxoffice_dashboard(df, movie_details_df):
+def show_overall_boxoffice_dashboard():
     """Displays the overall box office analysis dashboard."""
     st.title("📈 기간별 박스오피스")
 
-    if df.empty:
+    min_db_date, max_db_date = load_boxoffice_date_range()
+    if max_db_date is None:
         st.warning("박스오피스 데이터가 없습니다.")
         return
 
-    df['target_dt_date'] = pd.to_datetime(df['target_dt']).dt.date
-    min_db_date = df['target_dt_date'].min()
-    max_db_date = df['target_dt_date'].max()
-
     # 1. Date _range Selector
     st.header("기간 선택")
     cols = st.columns(2)
@@ -242,18 +258,16 @@ def show_overall_boxoffice_dashboard(df, movie_details_df):
         st.error("시작일은 종료일보다 이전이어야 합니다.")
         return
 
-    # Filter data based on selected date range
-    filtered_df = df[(df['target_dt_date'] >= start_date) & (df['target_dt_date'] <= end_date)]
-
-    # Calculate top performing movies for multiselect options
-    top_movies_by_audience = filtered_df.groupby('movie_nm')['audi_cnt'].sum().nlargest(10).reset_index()
+    # 기간별 집계는 DB에서 계산된 결과만 가져옵니다.
+    daily_total_audience, top_movies_by_audience, top_3_genres_data = load_period_aggregates(start_date, end_date)
 
     # --- KPIs ---
     st.subheader("✨ 기간별 핵심 지표")
 
     # KPI 1: 기간 중 관객수가 가장 많았던 날짜
-    if not filtered_df.empty:
-        top_3_dates_data = filtered_df.groupby('target_dt_date')['audi_cnt'].sum().nlargest(3).reset_index()
+    if not daily_total_audience.empty:
+        top_3_dates_data = daily_total_audience.nlargest(3, 'audi_cnt').reset_index(drop=True)
+        top_3_dates_data = top_3_dates_data[['target_dt_date', 'audi_cnt']]
         top_3_dates_data.columns = ['date', 'audi_cnt']
         
         date_kpi_parts = [
@@ -269,8 +283,7 @@ def show_overall_boxoffice_dashboard(df, movie_details_df):
         date_kpi_html = '<div class="summary-card"><div class="card-title"><span class="icon">🗓️</span> 관객수 최고 기록일</div><ul class="card-list"><li class="card-list-item">데이터 없음</li></ul></div>'
 
     # KPI 2: 가장 인기 있는 영화 (Top 3)
-    top_3_movies_data = filtered_df.groupby('movie_nm')['audi_cnt'].sum().nlargest(3).reset_index()
-    top_3_movies_data.columns = ['movie_nm', 'audi_cnt']
+    top_3_movies_data = top_movies_by_audience.head(3)
 
     movie_kpi_parts = [
         '<div class="summary-card">',
@@ -283,18 +296,7 @@ def show_overall_boxoffice_dashboard(df, movie_details_df):
     movie_kpi_html = "".join(movie_kpi_parts)
 
     # KPI 3: 주요 장르 (Top 3)
-    unique_movies_in_period = filtered_df[['movie_cd', 'movie_nm']].drop_duplicates()
-    movies_with_genre = pd.merge(unique_movies_in_period, movie_details_df, on='movie_cd', how='left')
-    movies_with_genre = movies_with_genre[movies_with_genre['rep_genre_nm'].notna() & (movies_with_genre['rep_genre_nm'] != '')]
-
-    if not movies_with_genre.empty:
-        genre_summary = movies_with_genre.groupby('rep_genre_nm').agg(
-            movie_count=('movie_nm', 'nunique'),
-            movie_list=('movie_nm', lambda x: ', '.join(sorted(x.unique())))
-        ).reset_index()
-        
-        top_3_genres_data = genre_summary.sort_values(by='movie_count', ascending=False).nlargest(3, 'movie_count').reset_index(drop=True)
-
+    if not top_3_genres_data.empty:
         genre_kpi_parts = [
             '<div class="summary-card">',
             '<div class="card-title"><span class="icon">🎭</span> 주요 상영 장르</div>',
@@ -324,18 +326,17 @@ def show_overall_boxoffice_dashboard(df, movie_details_df):
     # Combined Trend Chart
     st.subheader("📊 박스오피스 흥행 추이")
 
-    # Calculate total daily audience for the overall trend (bar chart)
-    daily_total_audience = filtered_df.groupby('target_dt_date')['audi_cnt'].sum().reset_index()
-
     # Get top movie names for multiselect
     top_movie_names = top_movies_by_audience['movie_nm'].tolist()
     selected_movies = st.multiselect("비교할 영화를 선택하세요:", options=top_movie_names, default=top_movie_names[:3], key="movie_selection_overall")
 
-    # Filter for selected movies
-    movie_trend_df = filtered_df[filtered_df['movie_nm'].isin(selected_movies)]
+    # 선택한 영화의 기간 내 행만 가져옵니다.
+    movie_trend_df = load_boxoffice(start_date, end_date, tuple(selected_movies))
+    if movie_trend_df.empty:
+        movie_trend_df = pd.DataFrame(columns=['target_dt_date', 'movie_nm', 'audi_cnt'])
 
     # Overall total audience trend (left Y-axis, bar chart)
-    overall_trend_chart = alt.Chart(daily_total_audience).mark_bar().encode(
+    overall_trend_chart = alt.Chart(daily_total_audience[['target_dt_date', 'audi_cnt']]).mark_bar().encode(
         x=alt.X('target_dt_date:T', title='날짜'),
         y=alt.Y('audi_cnt:Q', title='총 관객수 (전체 영화)', axis=alt.Axis(format='~s')),
         tooltip=[
@@ -604,19 +605,17 @@ def show_ai_chat_dashboard():
         st.session_state.ai_messages.append({"role": "assistant", "content": answer, "sql": sql_query})
 
 def main():
-    boxoffice_df, event_df, movie_details_df = load_data()
-
     st.sidebar.title("대시보드 선택")
     page = st.sidebar.radio("이동", ["영화 데이터 챗봇", "기간별 박스오피스", "일일 박스오피스", "굿즈 재고 현황"])
 
     if page == "영화 데이터 챗봇":
         show_ai_chat_dashboard()
     elif page == "기간별 박스오피스":
-        show_overall_boxoffice_dashboard(boxoffice_df, movie_details_df)
+        show_overall_boxoffice_dashboard()
     elif page == "일일 박스오피스":
-        show_boxoffice_dashboard(boxoffice_df)
+        show_boxoffice_dashboard()
     elif page == "굿즈 재고 현황":
-        show_goods_stock_dashboard(event_df)
+        show_goods_stock_dashboard(load_active_events())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
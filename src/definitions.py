@@ -1,8 +1,14 @@
 from dagster import Definitions
-from src.boxoffice.pipelines.kobis_pipeline import kobis_daily_job, kobis_daily_schedule
-from src.boxoffice.pipelines.goods_stock_pipeline import goods_events_job, goods_stock_check_job, goods_events_schedule, goods_stock_schedule
+from src.boxoffice.pipelines.kobis_pipeline import boxoffice, movie, kobis_daily_schedule, kobis_movie_schedule, kobis_movie_reconcile_schedule
+from src.boxoffice.pipelines.goods_stock_pipeline import goods_events_job, goods_stock_check_job, goods_events_schedule, goods_stock_schedule, adaptive_goods_stock_sensor, release_stock_leases_on_failure
+from src.boxoffice.pipelines.replication_pipeline import supabase_sync_job, supabase_sync_schedule
+from src.boxoffice.pipelines.io_managers import ParquetIOManager
 
 defs = Definitions(
-    jobs=[kobis_daily_job, goods_events_job, goods_stock_check_job],
-    schedules=[kobis_daily_schedule, goods_events_schedule, goods_stock_schedule],
-)
\ No newline at end of file
+    assets=[boxoffice, movie],
+    jobs=[goods_events_job, goods_stock_check_job, supabase_sync_job],
+    schedules=[kobis_daily_schedule, kobis_movie_schedule, kobis_movie_reconcile_schedule, goods_events_schedule, goods_stock_schedule, supabase_sync_schedule],
+    sensors=[adaptive_goods_stock_sensor, release_stock_leases_on_failure],
+    # op 사이에 넘기는 DataFrame/이벤트 목록은 pickle 대신 zstd 압축 Parquet로 저장합니다.
+    resources={"io_manager": ParquetIOManager()},
+)
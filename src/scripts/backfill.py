@@ -0,0 +1,139 @@
+"""
+박스오피스/영화/굿즈 이벤트 백필 CLI.
+
+기간을 구간(chunk)으로 나눠 여러 워커로 병렬 실행하고, 끝난 구간을 backfill_checkpoint 테이블에 기록합니다.
+중간에 멈추면 같은 명령을 다시 실행해 남은 구간부터 이어서 채웁니다. 모든 저장은 upsert이며, 박스오피스는 받은 날짜의 응답에서 빠진 영화의 행만 지웁니다.
+
+사용 예:
+    python -m src.scripts.backfill boxoffice --start 20250101 --end 20250630 --chunk-days 7 --workers 4
+    python -m src.scripts.backfill movie --start-year 2024 --end-year 2025
+    python -m src.scripts.backfill goods-events
+    python -m src.scripts.backfill all
+"""
+import argparse
+import logging
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, Tuple
+from src.boxoffice.logic.backfill_runner import BackfillRunner, date_chunks, year_chunks
+from src.boxoffice.logic.database_manager import get_database_connector
+from src.boxoffice.logic.kobisdata_extractor import KobisDataExtractor
+from src.boxoffice.logic.movie_events_scraper import (
+    TheaterEventScraper,
+    CGVScraper,
+    LotteCinemaScraper,
+    MegaboxScraper,
+)
+from src.boxoffice.pipelines.kobis_pipeline import BOXOFFICE_START_DATE, MOVIE_START_YEAR, save_boxoffice_day
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("Backfill")
+
+DEFAULT_CHUNK_DAYS = 7
+# KOBIS API 호출 한도를 고려한 기본 워커 수
+DEFAULT_WORKERS = 4
+
+
+def backfill_boxoffice(db, start: date, end: date, chunk_days: int, workers: int, restart: bool) -> Dict[str, int]:
+    """start~end 일별 박스오피스를 chunk_days일 구간으로 나눠 채웁니다. 응답이 빈 날이 있으면 그 구간은 실패로 남깁니다."""
+    extractor = KobisDataExtractor()
+
+    def run_chunk(date_range: Tuple[date, date]) -> int:
+        chunk_start, chunk_end = date_range
+        written = 0
+        for offset in range((chunk_end - chunk_start).days + 1):
+            target_dt = datetime.combine(chunk_start + timedelta(days=offset), datetime.min.time())
+            boxoffice_df = extractor.get_DailyBoxOffice(target_dt)
+            if boxoffice_df.empty:
+                raise ValueError(f"{target_dt:%Y-%m-%d} 박스오피스 응답이 비어 있습니다.")
+            written += save_boxoffice_day(db, target_dt.strftime("%Y-%m-%d"), boxoffice_df)[0]
+        return written
+
+    runner = BackfillRunner(db, "boxoffice", workers)
+    return runner.run(date_chunks(start, end, chunk_days), run_chunk, restart=restart)
+
+
+def backfill_movies(db, start_year: int, end_year: int, workers: int, restart: bool) -> Dict[str, int]:
+    """start_year~end_year 영화 목록을 연도별 구간으로 채웁니다."""
+    extractor = KobisDataExtractor()
+
+    def run_chunk(year: int) -> int:
+        movie_df = extractor.get_MovieList(year)
+        if movie_df.empty:
+            raise ValueError(f"{year}년 영화 목록 응답이 비어 있습니다.")
+        db.insert_movie(movie_df)
+        return len(movie_df)
+
+    runner = BackfillRunner(db, "movie", workers)
+    return runner.run(year_chunks(start_year, end_year), run_chunk, restart=restart)
+
+
+def backfill_goods_events(db, workers: int, restart: bool) -> Dict[str, int]:
+    """
+    영화관별로 현재 진행 중인 이벤트를 수집합니다. 구간은 (영화관, 오늘)이므로 같은 날 다시 실행하면 실패한 영화관만 다시 수집합니다.
+    이미 DB에 있는 이벤트는 상세 페이지 요청을 생략하고 저장된 굿즈 정보를 재사용합니다.
+    """
+    scrapers = {scraper.chain_name: scraper for scraper in [CGVScraper(), LotteCinemaScraper(), MegaboxScraper()]}
+    TheaterEventScraper.share_title_index(list(scrapers.values()))
+    known_df = db.select_query("SELECT event_id, theater_chain, goods_id, goods_name, spmtl_no FROM goods_event")
+    known_events: Dict[str, Dict[str, Dict]] = {}
+    if not known_df.empty:
+        known_df = known_df.astype(object).where(known_df.notna(), None)
+        for record in known_df.to_dict('records'):
+            known_events.setdefault(record["theater_chain"], {})[str(record["event_id"])] = record
+
+    def run_chunk(chain_name: str) -> int:
+        events = scrapers[chain_name].get_events(known_events=known_events.get(chain_name, {}))
+        db.insert_goods_event(events)
+        return len(events)
+
+    today = datetime.now().strftime("%Y%m%d")
+    runner = BackfillRunner(db, "goods_events", workers)
+    return runner.run([(f"{chain_name}:{today}", chain_name) for chain_name in scrapers], run_chunk, restart=restart)
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value.replace("-", ""), "%Y%m%d").date()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
+    parser = argparse.ArgumentParser(prog="boxoffice-backfill", description="재개 가능한 박스오피스/영화/굿즈 이벤트 백필")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="동시에 실행할 구간 수")
+    parser.add_argument("--restart", action="store_true", help="완료 기록과 관계없이 모든 구간을 다시 실행 (데이터는 지우지 않음)")
+    subparsers = parser.add_subparsers(dest="target", required=True)
+
+    for name in ("boxoffice", "all"):
+        sub = subparsers.add_parser(name, help="일별 박스오피스" if name == "boxoffice" else "영화 → 박스오피스 → 굿즈 이벤트 순서로 모두")
+        sub.add_argument("--start", type=_parse_date, default=_parse_date(BOXOFFICE_START_DATE), help="시작일 (YYYYMMDD)")
+        sub.add_argument("--end", type=_parse_date, default=_parse_date(yesterday), help="종료일 (YYYYMMDD, 기본: 어제)")
+        sub.add_argument("--chunk-days", type=int, default=DEFAULT_CHUNK_DAYS, help="구간 하나의 일수")
+        if name == "all":
+            sub.add_argument("--start-year", type=int, default=int(MOVIE_START_YEAR))
+            sub.add_argument("--end-year", type=int, default=datetime.now().year)
+
+    sub = subparsers.add_parser("movie", help="연도별 영화 목록")
+    sub.add_argument("--start-year", type=int, default=int(MOVIE_START_YEAR), help="시작 연도 (YYYY)")
+    sub.add_argument("--end-year", type=int, default=datetime.now().year, help="종료 연도 (YYYY, 기본: 올해)")
+
+    subparsers.add_parser("goods-events", help="영화관별 진행 중인 굿즈 이벤트")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    db = get_database_connector()
+    summaries = []
+    if args.target in ("movie", "all"):
+        summaries.append(backfill_movies(db, args.start_year, args.end_year, args.workers, args.restart))
+    if args.target in ("boxoffice", "all"):
+        summaries.append(backfill_boxoffice(db, args.start, args.end, args.chunk_days, args.workers, args.restart))
+    if args.target in ("goods-events", "all"):
+        summaries.append(backfill_goods_events(db, args.workers, args.restart))
+    # 실패한 구간이 있으면 0이 아닌 값으로 종료합니다. (같은 명령을 다시 실행하면 실패한 구간부터 이어서 실행)
+    return 1 if any(summary["failed"] for summary in summaries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""
+예전 goods_stock 테이블(문자열 컬럼)을 goods_stock_fact와 차원 테이블로 옮기는 일회성 마이그레이션.
+
+SQLite DB에 예전 goods_stock 테이블이 남아 있을 때 한 번만 실행합니다. 예전 테이블은 goods_stock_legacy로 이름만 바꿔 남겨 두며,
+결과를 확인한 뒤 직접 지우면 됩니다. 수집 시각의 초 미만은 버립니다. Supabase는 db/supabase/tables.sql을 다시 실행하면 같은 작업을 합니다.
+
+사용 예:
+    python -m src.scripts.migrate_goods_stock
+"""
+import logging
+import sys
+from src.boxoffice.logic.sqlite_connector import SQLiteConnector
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("MigrateGoodsStock")
+
+
+def main() -> int:
+    migrated = SQLiteConnector().migrate_legacy_goods_stock()
+    if migrated:
+        logger.info(f"goods_stock {migrated}건을 goods_stock_fact로 옮기고 예전 테이블을 goods_stock_legacy로 남겼습니다.")
+    else:
+        logger.info("옮길 goods_stock 테이블이 없습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import os
+import time
+from bs4 import BeautifulSoup
+from ..boxoffice.logic.html_parser import BACKENDS
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "megabox")
+REPEAT = 20
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf8") as f:
+        return f.read()
+
+
+def legacy_parse(fixtures: dict):
+    """기존 MegaboxScraper의 BeautifulSoup 전체 파싱 (비교용)"""
+    BeautifulSoup(fixtures["event_list.html"], 'html.parser').select("div.event-list > div.item")
+    BeautifulSoup(fixtures["event_detail.html"], 'html.parser').find("button", id="btnSelectGoodsStock")
+    BeautifulSoup(fixtures["goods_stock.html"], 'html.parser').find_all("li", class_="brch")
+
+
+def measure(func, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """저장된 메가박스 HTML fixture로 파서 백엔드별 처리량을 측정합니다."""
+    fixtures = {name: read_fixture(name) for name in ("event_list.html", "event_detail.html", "goods_stock.html")}
+    total_bytes = sum(len(text.encode("utf8")) for text in fixtures.values())
+
+    print(f"[메가박스 HTML 파싱 벤치마크] fixture {total_bytes / 1024:.0f} KB, best of {REPEAT}")
+    baseline = measure(legacy_parse, fixtures)
+    print(f"{'bs4 (legacy full parse)':<26} {baseline * 1000:8.2f} ms  {total_bytes / baseline / 1e6:6.1f} MB/s")
+
+    for name, backend_cls in BACKENDS.items():
+        try:
+            backend = backend_cls()
+        except ImportError:
+            print(f"{name:<26} (설치되지 않음)")
+            continue
+
+        def parse_all():
+            backend.parse_event_items(fixtures["event_list.html"])
+            backend.parse_goods_button(fixtures["event_detail.html"])
+            backend.parse_branch_stocks(fixtures["goods_stock.html"])
+
+        elapsed = measure(parse_all)
+        print(f"{name:<26} {elapsed * 1000:8.2f} ms  {total_bytes / elapsed / 1e6:6.1f} MB/s  x{baseline / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
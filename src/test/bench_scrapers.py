@@ -0,0 +1,70 @@
+import logging
+import time
+import pandas as pd
+from ..boxoffice.logic.movie_title_index import MovieTitleIndex
+from .http_replay import HttpFixtureStore, ReplaySession, use_session
+from .record_scraper_fixtures import SCRAPER_CLASSES
+
+# 스크레이퍼 모듈이 INFO로 설정한 로그는 측정 결과만 보이도록 낮춥니다.
+logging.getLogger().setLevel(logging.WARNING)
+
+LATENCIES = [0.0, 0.05]  # 초 단위 왕복 지연 (fixture 재생 시 주입)
+MAX_STOCK_EVENTS = 5  # record_scraper_fixtures의 기본값과 같아야 합니다.
+
+
+def measure(session: ReplaySession, func) -> tuple:
+    session.reset_counters()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    return result, elapsed, session.request_count, session.transport_seconds
+
+
+def run_case(scraper_cls, latency: float) -> list:
+    store = HttpFixtureStore.for_scraper(scraper_cls).load()
+    session = ReplaySession(store, latency=latency)
+    scraper = use_session(scraper_cls(), session)
+    # 영화 제목 색인은 DB 조회 대신 빈 색인을 사용해 HTTP/파싱 구간만 측정합니다.
+    scraper.title_index = MovieTitleIndex([], [])
+
+    events, events_elapsed, events_requests, events_transport = measure(session, scraper.get_events)
+    stock_events = [event for event in events if event.get("goods_id")][:MAX_STOCK_EVENTS]
+    stocks, stock_elapsed, stock_requests, stock_transport = measure(
+        session, lambda: [stock for event in stock_events for stock in scraper.get_goods_stock(event)]
+    )
+
+    rows = []
+    for phase, result, elapsed, requests_sent, transport in [
+        ("get_events", events, events_elapsed, events_requests, events_transport),
+        ("get_goods_stock", stocks, stock_elapsed, stock_requests, stock_transport),
+    ]:
+        rows.append({
+            "chain": scraper.chain_name,
+            "phase": phase,
+            "latency_ms": latency * 1000,
+            "requests": requests_sent,
+            "rows": len(result),
+            "wall_ms": elapsed * 1000,
+            "parse_ms": (elapsed - transport) * 1000,
+            "rows_per_sec": len(result) / elapsed if elapsed else 0,
+        })
+    return rows
+
+
+def main():
+    """
+    기록된 HTTP fixture를 재생하여 영화관별 get_events / get_goods_stock의 요청 수, 파싱 시간, 처리량을 측정합니다.
+    fixture가 없는 영화관은 건너뜁니다. (python -m src.test.record_scraper_fixtures로 기록)
+    """
+    results = []
+    for chain_name, scraper_cls in SCRAPER_CLASSES.items():
+        if not HttpFixtureStore.for_scraper(scraper_cls).exists():
+            print(f"{chain_name}: fixture가 없어 건너뜁니다.")
+            continue
+        for latency in LATENCIES:
+            results.extend(run_case(scraper_cls, latency))
+    print(pd.DataFrame(results).to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+
+
+if __name__ == "__main__":
+    main()
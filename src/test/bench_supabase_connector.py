@@ -0,0 +1,65 @@
+import os
+import tempfile
+import time
+import logging
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from ..boxoffice.logic.supabase_connector import SupabaseConnector
+from .supabase_standin import SupabaseStandIn
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+ROW_COUNTS = [1_000, 10_000, 50_000]
+LATENCIES = [0.0, 0.02, 0.08]  # 초 단위 왕복 지연 (로컬, 같은 리전, 해외 리전 가정)
+
+
+def make_stock_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    total_quantity = rng.integers(50, 500, n_rows).astype(float)
+    total_quantity[rng.random(n_rows) < 0.5] = np.nan
+    return pd.DataFrame({
+        "event_id": rng.integers(10000, 10100, n_rows).astype(str),
+        "theater_name": [f"지점{i}" for i in range(n_rows)],
+        "status": rng.choice(["보유", "소진중", "소량보유", "소진"], n_rows),
+        "quantity": rng.integers(0, 100, n_rows).astype(str),
+        "total_quantity": total_quantity,
+        "scraped_at": datetime.now(),
+    })
+
+
+def run_case(n_rows: int, latency: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        standin = SupabaseStandIn(os.path.join(tmp_dir, "standin.sqlite"), latency=latency)
+        connector = SupabaseConnector(client=standin)
+        df = make_stock_frame(n_rows)
+
+        start = time.perf_counter()
+        connector.insert_goods_stock(df)
+        insert_elapsed = time.perf_counter() - start
+        insert_requests = standin.request_count
+
+        standin.reset_counters()
+        start = time.perf_counter()
+        result = connector.select_query("SELECT * FROM goods_stock ORDER BY theater_name")
+        select_elapsed = time.perf_counter() - start
+
+        assert len(result) == n_rows
+        return {
+            "rows": n_rows,
+            "latency_ms": latency * 1000,
+            "insert_requests": insert_requests,
+            "insert_rows_per_sec": n_rows / insert_elapsed,
+            "select_requests": standin.request_count,
+            "select_rows_per_sec": n_rows / select_elapsed,
+        }
+
+
+def main():
+    """SupabaseConnector의 insert_goods_stock / select_query 처리량을 행 수와 지연별로 측정합니다."""
+    results = [run_case(n_rows, latency) for latency in LATENCIES for n_rows in ROW_COUNTS]
+    print(pd.DataFrame(results).to_string(index=False, float_format=lambda v: f"{v:,.0f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import time
+import logging
+from datetime import datetime, date
+import numpy as np
+import pandas as pd
+from ..boxoffice.logic.supabase_connector import SupabaseConnector
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+N_ROWS = 100_000
+REPEAT = 3
+
+
+def make_stock_frame(n_rows: int) -> pd.DataFrame:
+    """goods_stock 적재 직전과 같은 형태의 DataFrame을 생성합니다."""
+    rng = np.random.default_rng(42)
+    quantity = rng.integers(0, 100, n_rows).astype(float)
+    quantity[rng.random(n_rows) < 0.3] = np.nan  # 메가박스처럼 수량이 없는 행
+    total_quantity = rng.integers(50, 500, n_rows).astype(float)
+    total_quantity[rng.random(n_rows) < 0.5] = np.nan
+    return pd.DataFrame({
+        "event_id": rng.integers(10000, 20000, n_rows).astype(str),
+        "theater_name": [f"지점{i % 400}" for i in range(n_rows)],
+        "status": rng.choice(["보유", "소진중", "소량보유", "소진"], n_rows),
+        "quantity": quantity,
+        "total_quantity": total_quantity,
+        "scraped_at": datetime.now(),
+    })
+
+
+def legacy_serialize(connector: SupabaseConnector, df: pd.DataFrame) -> list:
+    """기존 _upsert_data의 셀 단위 변환 로직 (비교용)"""
+    processed_data = []
+    for record in df.to_dict(orient='records'):
+        processed_record = {}
+        for k, v in record.items():
+            if isinstance(v, (datetime, date)):
+                processed_record[connector._get_db_column_name(k)] = v.isoformat()
+            elif pd.isna(v):
+                processed_record[connector._get_db_column_name(k)] = None
+            elif connector._get_db_column_name(k) == 'total_quantity' and isinstance(v, float):
+                processed_record[connector._get_db_column_name(k)] = int(v)
+            else:
+                processed_record[connector._get_db_column_name(k)] = v
+        processed_data.append(processed_record)
+    return processed_data
+
+
+def timeit(label: str, func, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:10.1f} ms  ({N_ROWS / best:,.0f} rows/sec)")
+    return best
+
+
+def main():
+    # 네트워크 연결 없이 직렬화만 측정하기 위해 __init__을 건너뜁니다.
+    connector = SupabaseConnector.__new__(SupabaseConnector)
+    df = make_stock_frame(N_ROWS)
+    df["quantity"] = df["quantity"].fillna("")
+
+    print(f"[goods_stock 직렬화 벤치마크] {N_ROWS:,} rows, best of {REPEAT}")
+    legacy = timeit("legacy (per-cell loop, 직렬화 제외)", legacy_serialize, connector, df)
+    vectorized = timeit("vectorized (JSON bytes 포함)", connector._serialize_frame, df)
+    print(f"speedup: {legacy / vectorized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
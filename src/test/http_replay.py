@@ -0,0 +1,190 @@
+import base64
+import json
+import os
+import threading
+import time
+from email.parser import BytesParser
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# 스크레이퍼 HTTP 세션 기록/재생 하네스.
+# RecordingSession으로 실제 응답을 fixture 파일에 기록하고, ReplaySession으로 네트워크 없이 재생합니다.
+# 저장소의 fixtures/http는 API 응답 형식을 따른 합성 데이터이며, python -m src.test.record_scraper_fixtures로 실제 응답을 다시 기록할 수 있습니다.
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "http")
+
+# 요청마다 값이 달라 매칭 키에서 제외하는 본문 필드 (롯데시네마 osVersion = User-Agent)
+IGNORED_BODY_FIELDS = {"osVersion"}
+
+
+class MissingFixtureError(AssertionError):
+    """재생할 fixture가 없는 요청. 스크레이퍼의 RequestException 처리에 묻히지 않도록 AssertionError를 상속합니다."""
+
+
+def _canonical_json(text: str) -> str:
+    try:
+        value = json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return text
+    if isinstance(value, dict):
+        value = {k: v for k, v in value.items() if k not in IGNORED_BODY_FIELDS}
+    return json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+
+def _canonical_body(prepared: requests.PreparedRequest) -> str:
+    body = prepared.body
+    if not body:
+        return ""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+
+    content_type = prepared.headers.get("Content-Type", "")
+    if content_type.startswith("multipart/form-data"):
+        # multipart boundary는 요청마다 달라지므로 파트 이름과 내용만 비교합니다.
+        message = BytesParser().parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+        fields = {
+            part.get_param("name", header="content-disposition"): _canonical_json(part.get_payload(decode=True).decode("utf-8"))
+            for part in message.get_payload()
+        }
+        return json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return urlencode(sorted(parse_qsl(body.decode("utf-8"), keep_blank_values=True)))
+    return _canonical_json(body.decode("utf-8", errors="replace"))
+
+
+def canonical_request_key(prepared: requests.PreparedRequest) -> str:
+    """메서드, 정렬된 쿼리스트링, 정규화된 본문으로 요청을 식별합니다."""
+    parts = urlsplit(prepared.url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{prepared.method} {parts.scheme}://{parts.netloc}{parts.path}?{query} {_canonical_body(prepared)}"
+
+
+class HttpFixtureStore:
+    """
+    요청 키별 응답을 저장하는 fixture 파일 (fixtures/http/<스크레이퍼 클래스명>.json).
+    같은 키가 여러 번 기록되면 마지막 응답을 사용합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+
+    @classmethod
+    def for_scraper(cls, scraper_cls: type, fixture_dir: str = FIXTURE_DIR) -> "HttpFixtureStore":
+        return cls(os.path.join(fixture_dir, f"{scraper_cls.__name__}.json"))
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> "HttpFixtureStore":
+        with open(self.path, "r", encoding="utf8") as f:
+            self.entries = {entry["key"]: entry for entry in json.load(f)["entries"]}
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf8") as f:
+            json.dump({"entries": list(self.entries.values())}, f, ensure_ascii=False, indent=1)
+
+    def record(self, prepared: requests.PreparedRequest, response: requests.Response):
+        content = response.content
+        entry = {
+            "key": canonical_request_key(prepared),
+            "request": {"method": prepared.method, "url": prepared.url},
+            "response": {
+                "status_code": response.status_code,
+                "url": response.url,
+                "content_type": response.headers.get("Content-Type"),
+                "encoding": response.encoding,
+            },
+        }
+        try:
+            entry["response"]["text"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["response"]["base64"] = base64.b64encode(content).decode("ascii")
+        self.entries[entry["key"]] = entry
+
+    def build_response(self, prepared: requests.PreparedRequest) -> requests.Response:
+        key = canonical_request_key(prepared)
+        entry = self.entries.get(key)
+        if entry is None:
+            raise MissingFixtureError(f"재생할 fixture가 없습니다: {key} ({self.path})")
+
+        stored = entry["response"]
+        response = requests.Response()
+        response.status_code = stored["status_code"]
+        response.url = stored["url"]
+        response.encoding = stored.get("encoding")
+        response.request = prepared
+        if stored.get("content_type"):
+            response.headers = CaseInsensitiveDict({"Content-Type": stored["content_type"]})
+        if "text" in stored:
+            response._content = stored["text"].encode("utf-8")
+        else:
+            response._content = base64.b64decode(stored["base64"])
+        return response
+
+
+class RecordingSession(requests.Session):
+    """실제로 요청하면서 (리다이렉트를 따라간 최종) 응답을 store에 기록하는 세션"""
+
+    def __init__(self, store: HttpFixtureStore):
+        super().__init__()
+        self.store = store
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        response = super().request(method, url, **kwargs)
+        # 리다이렉트가 있으면 최초 요청 기준으로 기록합니다.
+        original = response.history[0].request if response.history else response.request
+        with self._lock:
+            self.store.record(original, response)
+        return response
+
+
+class ReplaySession(requests.Session):
+    """
+    store에 기록된 응답을 네트워크 없이 돌려주는 세션.
+    latency(초)를 지정하면 요청마다 왕복 지연을 주입하고, 전송 구간에서 보낸 시간을 집계합니다.
+    """
+
+    def __init__(self, store: HttpFixtureStore, latency: float = 0.0):
+        super().__init__()
+        self.store = store
+        self.latency = latency
+        self.request_count = 0
+        self.transport_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        response = self.store.build_response(request)
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.request_count += 1
+            self.transport_seconds += time.perf_counter() - start
+        return response
+
+    def reset_counters(self):
+        self.request_count = 0
+        self.transport_seconds = 0.0
+
+
+def use_session(scraper, session: requests.Session, warm_up: Optional[bool] = None):
+    """
+    스크레이퍼의 세션을 기록/재생 세션으로 교체합니다. 기존 헤더(User-Agent, Referer 등)는 그대로 옮깁니다.
+    재생 세션은 워밍업 요청을 보내지 않도록 이미 워밍업된 것으로 표시하고,
+    기록 세션은 쿠키 발급 과정까지 기록하도록 워밍업을 새로 수행합니다.
+    """
+    session.headers.update(scraper.session.headers)
+    scraper.session = session
+    if warm_up is None:
+        warm_up = not isinstance(session, ReplaySession)
+    if warm_up:
+        scraper._ensure_session(force=True)
+    else:
+        scraper._session_warmed_at = time.time()
+    return scraper
@@ -0,0 +1,38 @@
+import argparse
+import logging
+from ..boxoffice.logic.movie_events_scraper import CGVScraper, LotteCinemaScraper, MegaboxScraper
+from .http_replay import HttpFixtureStore, RecordingSession, use_session
+
+SCRAPER_CLASSES = {"CGV": CGVScraper, "롯데시네마": LotteCinemaScraper, "메가박스": MegaboxScraper}
+
+
+def record(scraper_cls, max_stock_events: int) -> HttpFixtureStore:
+    """실제 사이트에 요청하면서 get_events / get_goods_stock의 응답을 기록합니다."""
+    store = HttpFixtureStore.for_scraper(scraper_cls)
+    scraper = use_session(scraper_cls(), RecordingSession(store))
+    events = scraper.get_events()
+    stock_events = [event for event in events if event.get("goods_id")][:max_stock_events]
+    for event in stock_events:
+        scraper.get_goods_stock(event)
+    store.save()
+    print(f"{scraper.chain_name}: 이벤트 {len(events)}건, 재고 {len(stock_events)}건, 요청 {len(store.entries)}개 → {store.path}")
+    return store
+
+
+def main():
+    """
+    스크레이퍼 재생 테스트/벤치마크용 HTTP fixture를 실제 사이트에서 다시 기록합니다.
+    python -m src.test.record_scraper_fixtures [--chain CGV] [--max-stock-events 5]
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--chain", choices=list(SCRAPER_CLASSES), action="append", help="기록할 영화관 (기본: 전체)")
+    parser.add_argument("--max-stock-events", type=int, default=5, help="영화관별로 재고를 기록할 이벤트 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    for chain_name in args.chain or SCRAPER_CLASSES:
+        record(SCRAPER_CLASSES[chain_name], args.max_stock_events)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import json
+import sqlite3
+import threading
+import time
+import pandas as pd
+from typing import Any, Callable, Dict, List, Optional
+from ..boxoffice.logic.sqlite_connector import SQLiteConnector
+
+
+class StandInError(Exception):
+    """PostgREST가 4xx/5xx를 반환한 상황을 흉내냅니다."""
+
+
+class StandInResponse:
+    """httpx.Response / postgrest APIResponse에서 SupabaseConnector가 사용하는 부분만 구현합니다."""
+
+    def __init__(self, data: Any = None, status_code: int = 200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise StandInError(f"HTTP {self.status_code}")
+
+
+class _RpcRequest:
+    def __init__(self, standin: "SupabaseStandIn", function_name: str, params: Dict):
+        self.standin = standin
+        self.function_name = function_name
+        self.params = params
+
+    def execute(self) -> StandInResponse:
+        return self.standin._handle_rpc(self.function_name, self.params)
+
+
+class _Session:
+    """client.postgrest.session (httpx.Client) 대역. POST /{table}?on_conflict=... 와 POST /rpc/{function}만 지원합니다."""
+
+    def __init__(self, standin: "SupabaseStandIn"):
+        self.standin = standin
+
+    def post(self, path: str, content: bytes, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> StandInResponse:
+        table_name = path.strip("/")
+        if table_name.startswith("rpc/"):
+            return self.standin._handle_rpc(table_name[len("rpc/"):], json.loads(content))
+        on_conflict = (params or {}).get("on_conflict", "")
+        return self.standin._handle_upsert(table_name, json.loads(content), on_conflict)
+
+
+class _Postgrest:
+    def __init__(self, standin: "SupabaseStandIn"):
+        self.session = _Session(standin)
+
+
+class SupabaseStandIn:
+    """
+    SupabaseConnector를 라이브 프로젝트 없이 테스트/측정하기 위한 프로세스 내 PostgREST 대역.
+
+    - 저장소는 SQLite 파일이며, 테이블은 첫 upsert 시 payload 컬럼으로 생성됩니다.
+      재고 차원/팩트 테이블과 goods_stock 뷰는 SQLiteConnector와 같은 스키마로 미리 만듭니다.
+    - rpc('execute_sql')은 전달된 SQL을 그대로 실행하고, PostgREST처럼 max_rows까지만 반환합니다.
+    - db/supabase/dashboard_functions.sql의 집계 함수와 tables.sql의 insert_goods_stock/delete_boxoffice_rows는 SQLiteConnector의 동일 구현으로 처리합니다.
+    - latency(초)를 지정하면 요청마다 네트워크 왕복 지연을 주입합니다.
+    """
+
+    def __init__(self, db_path: str, latency: float = 0.0, max_rows: int = 1000):
+        self.db_path = db_path
+        self.latency = latency
+        self.max_rows = max_rows
+        self.postgrest = _Postgrest(self)
+        self.request_count = 0
+        self.rows_sent = 0
+        self.rows_received = 0
+        self.rpc_calls: List[str] = []
+        self._lock = threading.Lock()
+
+        # 대시보드 집계 RPC는 SQLiteConnector의 쿼리를 그대로 사용합니다.
+        sqlite_view = SQLiteConnector(db_path)
+        self.rpc_handlers: Dict[str, Callable[[Dict], List[Dict]]] = {
+            "execute_sql": self._execute_sql,
+            "boxoffice_daily_totals": lambda p: sqlite_view.get_daily_totals(p["start_date"], p["end_date"]).to_dict("records"),
+            "boxoffice_top_movies": lambda p: sqlite_view.get_top_movies(p["start_date"], p["end_date"], p.get("top_n", 10)).to_dict("records"),
+            "boxoffice_genre_distribution": lambda p: sqlite_view.get_genre_distribution(p["start_date"], p["end_date"], p.get("top_n", 3)).to_dict("records"),
+            "boxoffice_date_range": lambda p: sqlite_view.get_boxoffice_date_range().to_dict("records"),
+            "boxoffice_between": lambda p: sqlite_view.get_boxoffice(p["start_date"], p["end_date"], p.get("movie_nms")).to_dict("records"),
+            "movie_details": lambda p: sqlite_view.get_movie_details(p["movie_cds"]).to_dict("records"),
+            "goods_stock_latest": lambda p: sqlite_view.get_latest_stock(p["p_event_id"]).to_dict("records"),
+            "sync_dimension_sequences": lambda p: [],
+            "delete_boxoffice_rows": lambda p: sqlite_view.delete_boxoffice_rows(p["p_target_dt"], p["p_movie_cds"]) or [],
+            "insert_goods_stock": lambda p: sqlite_view.insert_goods_stock(pd.DataFrame(p["rows"])) or [],
+        }
+
+    # --- supabase.Client 인터페이스 ---
+
+    def rpc(self, function_name: str, params: Dict) -> _RpcRequest:
+        return _RpcRequest(self, function_name, params)
+
+    # --- 내부 처리 ---
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _simulate_round_trip(self):
+        with self._lock:
+            self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _handle_rpc(self, function_name: str, params: Dict) -> StandInResponse:
+        self._simulate_round_trip()
+        self.rpc_calls.append(function_name)
+        handler = self.rpc_handlers.get(function_name)
+        if handler is None:
+            return StandInResponse(status_code=404)
+        rows = handler(params)[:self.max_rows]
+        with self._lock:
+            self.rows_received += len(rows)
+        return StandInResponse(data=rows)
+
+    def _execute_sql(self, params: Dict) -> List[Dict]:
+        conn = self._connect()
+        try:
+            cursor = conn.execute(params["sql_query"])
+            rows = [dict(row) for row in cursor.fetchall()] if cursor.description else []
+            conn.commit()
+            return rows
+        finally:
+            conn.close()
+
+    def _handle_upsert(self, table_name: str, records: List[Dict], on_conflict: str) -> StandInResponse:
+        self._simulate_round_trip()
+        if not records:
+            return StandInResponse(status_code=201)
+
+        columns = list(records[0].keys())
+        conflict_columns = [c for c in on_conflict.split(",") if c]
+        conn = self._connect()
+        try:
+            self._ensure_table(conn, table_name, columns, conflict_columns)
+            placeholders = ", ".join("?" for _ in columns)
+            query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+            if conflict_columns:
+                updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c not in conflict_columns)
+                query += f" ON CONFLICT({', '.join(conflict_columns)}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING")
+            conn.executemany(query, [tuple(r.get(c) for c in columns) for r in records])
+            conn.commit()
+        except sqlite3.Error:
+            return StandInResponse(status_code=400)
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.rows_sent += len(records)
+        return StandInResponse(status_code=201)
+
+    def _ensure_table(self, conn: sqlite3.Connection, table_name: str, columns: List[str], conflict_columns: List[str]):
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(columns)})")
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+        for column in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {column}")
+        if conflict_columns:
+            index_name = f"uq_{table_name}_{'_'.join(conflict_columns)}"
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(conflict_columns)})")
+
+    def reset_counters(self):
+        self.request_count = 0
+        self.rows_sent = 0
+        self.rows_received = 0
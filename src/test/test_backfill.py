@@ -0,0 +1,106 @@
+from datetime import date, datetime
+import pandas as pd
+from src.boxoffice.logic.backfill_runner import BackfillRunner, date_chunks, year_chunks
+from src.boxoffice.logic.sqlite_connector import SQLiteConnector
+from src.boxoffice.logic.supabase_connector import SupabaseConnector
+from src.scripts import backfill
+from src.test.supabase_standin import SupabaseStandIn, StandInResponse
+
+
+def test_ranges_are_split_into_chunks():
+    assert [key for key, _ in date_chunks(date(2025, 1, 1), date(2025, 1, 10), 4)] == [
+        "20250101-20250104", "20250105-20250108", "20250109-20250110",
+    ]
+    assert year_chunks(2024, 2025) == [("2024", 2024), ("2025", 2025)]
+
+
+def test_runner_resumes_after_failed_chunk(tmp_path):
+    connector = SQLiteConnector(str(tmp_path / "movie.sqlite"))
+    chunks = [(str(i), i) for i in range(5)]
+    calls = []
+
+    def flaky(value):
+        calls.append(value)
+        if value == 3:
+            raise RuntimeError("API 오류")
+        return 10
+
+    runner = BackfillRunner(connector, "test", workers=2)
+    summary = runner.run(chunks, flaky)
+    assert (summary["done"], summary["failed"], summary["rows"]) == (4, 1, 40)
+    assert runner.load_checkpoints()["3"]["status"] == "failed"
+
+    calls.clear()
+    summary = runner.run(chunks, lambda value: calls.append(value) or 10)
+    assert calls == [3]
+    assert (summary["skipped"], summary["done"], summary["failed"]) == (4, 1, 0)
+    assert runner.load_checkpoints()["3"]["attempts"] == 2
+
+    calls.clear()
+    runner.run(chunks, lambda value: calls.append(value) or 0, restart=True)
+    assert sorted(calls) == [0, 1, 2, 3, 4]
+
+
+class FakeExtractor:
+    def get_DailyBoxOffice(self, target_dt: datetime) -> pd.DataFrame:
+        if target_dt.day == 5:
+            return pd.DataFrame()
+        return pd.DataFrame({
+            "rank": [1], "movie_cd": ["20250001"], "movie_nm": ["영화1"],
+            "audi_cnt": [100.0 * target_dt.day], "target_dt": pd.to_datetime(target_dt.date()),
+        })
+
+
+def test_boxoffice_backfill_keeps_existing_rows_and_resumes(tmp_path, monkeypatch):
+    connector = SQLiteConnector(str(tmp_path / "movie.sqlite"))
+    connector.insert_boxoffice(pd.DataFrame({
+        "movie_cd": ["20249999"], "target_dt": ["2025-01-02 00:00:00.000000"], "audi_cnt": [1.0],
+    }))
+    monkeypatch.setattr(backfill, "KobisDataExtractor", FakeExtractor)
+
+    summary = backfill.backfill_boxoffice(connector, date(2025, 1, 1), date(2025, 1, 6), 2, 2, restart=False)
+    assert (summary["done"], summary["failed"]) == (2, 1)
+    rows = connector.select_query("SELECT movie_cd, target_dt FROM boxoffice ORDER BY target_dt, movie_cd")
+    # 받은 날짜에서 응답에 없는 기존 행은 지우고, 실패한 구간(5~6일)은 다음 실행에서 다시 받습니다.
+    assert len(rows) == 4
+    assert "20249999" not in rows["movie_cd"].tolist()
+
+    monkeypatch.setattr(FakeExtractor, "get_DailyBoxOffice", lambda self, target_dt: pd.DataFrame({
+        "rank": [1], "movie_cd": ["20250001"], "movie_nm": ["영화1"],
+        "audi_cnt": [100.0 * target_dt.day], "target_dt": pd.to_datetime(target_dt.date()),
+    }))
+    summary = backfill.backfill_boxoffice(connector, date(2025, 1, 1), date(2025, 1, 6), 2, 2, restart=False)
+    assert (summary["skipped"], summary["done"], summary["failed"]) == (2, 1, 0)
+    assert len(connector.select_query("SELECT * FROM boxoffice")) == 6
+
+
+def test_failed_supabase_write_leaves_chunk_failed(tmp_path, monkeypatch):
+    standin = SupabaseStandIn(str(tmp_path / "standin.sqlite"))
+    handle_upsert = standin._handle_upsert
+
+    def unavailable_boxoffice(table_name, records, on_conflict):
+        if table_name == "boxoffice":
+            return StandInResponse(status_code=503)
+        return handle_upsert(table_name, records, on_conflict)
+
+    monkeypatch.setattr(standin, "_handle_upsert", unavailable_boxoffice)
+    monkeypatch.setattr(backfill, "KobisDataExtractor", FakeExtractor)
+    connector = SupabaseConnector(client=standin)
+
+    summary = backfill.backfill_boxoffice(connector, date(2025, 1, 1), date(2025, 1, 2), 2, 1, restart=False)
+    assert (summary["done"], summary["failed"]) == (0, 1)
+    checkpoint = BackfillRunner(connector, "boxoffice").load_checkpoints()["20250101-20250102"]
+    assert checkpoint["status"] == "failed"
+    # 행이 저장되지 않았으므로 행 해시도 쓰지 않습니다.
+    assert connector.select_query("SELECT * FROM boxoffice_hash").empty
+
+
+def test_checkpoint_write_failure_does_not_stop_runner(tmp_path, monkeypatch):
+    connector = SQLiteConnector(str(tmp_path / "movie.sqlite"))
+
+    def failing_checkpoint(records):
+        raise RuntimeError("checkpoint write failed")
+
+    monkeypatch.setattr(connector, "upsert_backfill_checkpoints", failing_checkpoint)
+    summary = BackfillRunner(connector, "test", workers=2).run([(str(i), i) for i in range(3)], lambda value: 1)
+    assert (summary["done"], summary["rows"]) == (3, 3)
@@ -0,0 +1,97 @@
+import time
+import pytest
+import requests
+from datetime import datetime, timedelta
+from src.boxoffice.logic.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.boxoffice.logic.movie_events_scraper import ChainDeadlineExceeded, LotteCinemaScraper
+from src.boxoffice.logic.movie_title_index import MovieTitleIndex
+from src.test.http_replay import HttpFixtureStore, ReplaySession, use_session
+
+
+class FailingSession(requests.Session):
+    """모든 요청에 연결 오류를 내는 세션"""
+
+    def __init__(self):
+        super().__init__()
+        self.request_count = 0
+
+    def send(self, request, **kwargs):
+        self.request_count += 1
+        raise requests.ConnectionError("connection refused")
+
+
+def test_opens_after_consecutive_failures_and_half_opens_after_cool_down():
+    breaker = CircuitBreaker("CGV", failure_threshold=3, cool_down_seconds=60)
+    for _ in range(2):
+        breaker.record_failure("timeout")
+    breaker.record_success()
+    for _ in range(3):
+        assert breaker.allow_request()
+        breaker.record_failure("timeout")
+    assert breaker.current_state() == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    breaker.opened_at = datetime.now() - timedelta(seconds=61)
+    assert breaker.current_state() == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # 시험 요청은 하나만
+    breaker.record_failure("timeout")
+    assert breaker.current_state() == CircuitBreaker.OPEN
+
+    breaker.opened_at = datetime.now() - timedelta(seconds=61)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.current_state() == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+def test_snapshot_round_trip():
+    breaker = CircuitBreaker("롯데시네마", failure_threshold=1)
+    breaker.record_failure("HTTP 503")
+    restored = CircuitBreaker("롯데시네마")
+    restored.restore(breaker.snapshot())
+    assert restored.state == CircuitBreaker.OPEN
+    assert restored.last_error == "HTTP 503"
+    assert restored.opened_at == breaker.opened_at
+    assert not restored.allow_request()
+
+
+def test_merge_keeps_stored_open_state_unless_probed():
+    tripped = CircuitBreaker("CGV", failure_threshold=1, cool_down_seconds=60)
+    tripped.record_failure("HTTP 503")
+    sibling = CircuitBreaker("CGV", failure_threshold=1, cool_down_seconds=60)
+    assert sibling.merge(tripped.snapshot())
+    assert sibling.current_state() == CircuitBreaker.OPEN
+    assert not sibling.merge({"state": CircuitBreaker.CLOSED})
+
+    # 냉각 시간이 지나 반열림 시험 요청을 보낸 샤드는 저장된 OPEN을 자신의 결과로 덮어씁니다.
+    sibling.opened_at = datetime.now() - timedelta(seconds=61)
+    assert sibling.allow_request()
+    sibling.record_success()
+    assert not sibling.merge(tripped.snapshot())
+    assert sibling.current_state() == CircuitBreaker.CLOSED
+
+
+def test_open_circuit_stops_requests_to_failing_chain():
+    scraper = use_session(LotteCinemaScraper(), FailingSession(), warm_up=False)
+    scraper.title_index = MovieTitleIndex([], [])
+
+    assert scraper.get_events() == []
+    for _ in range(scraper.CIRCUIT_FAILURE_THRESHOLD):
+        scraper.get_goods_stock({"event_id": "1", "goods_id": "1", "goods_name": "굿즈"})
+    assert scraper.circuit_breaker.current_state() == CircuitBreaker.OPEN
+
+    sent = scraper.session.request_count
+    with pytest.raises(CircuitOpenError):
+        scraper._request("POST", scraper.BASE_URL)
+    assert scraper.session.request_count == sent
+
+
+def test_deadline_stops_requests():
+    session = ReplaySession(HttpFixtureStore.for_scraper(LotteCinemaScraper).load())
+    scraper = use_session(LotteCinemaScraper(), session)
+    scraper.begin_run(0.01)
+    time.sleep(0.02)
+    with pytest.raises(ChainDeadlineExceeded):
+        scraper._request("POST", scraper.BASE_URL)
+    assert session.request_count == 0
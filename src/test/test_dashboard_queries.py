@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+from src.boxoffice.logic.sqlite_connector import SQLiteConnector
+from src.boxoffice.logic.supabase_connector import SupabaseConnector
+from src.test.supabase_standin import SupabaseStandIn
+
+DATES = pd.date_range("2025-01-01", "2025-01-05")
+
+
+@pytest.fixture
+def sqlite_connector(tmp_path):
+    connector = SQLiteConnector(str(tmp_path / "movie.sqlite"))
+    connector.insert_boxoffice(pd.DataFrame([
+        {"target_dt": target_dt, "rank": rank, "movie_cd": f"2025000{rank}", "movie_nm": f"영화{rank}",
+         "audi_cnt": 100.0 * rank, "audi_inten": 0.0, "audi_acc": 1000.0, "sales_amt": 1.0, "open_dt": "2025-01-01"}
+        for target_dt in DATES for rank in (1, 2, 3)
+    ]))
+    connector.insert_movie(pd.DataFrame([
+        {"movie_cd": f"2025000{rank}", "movie_nm": f"영화{rank}", "rep_genre_nm": genre}
+        for rank, genre in [(1, "액션"), (2, "드라마"), (3, "코미디")]
+    ]))
+    return connector
+
+
+@pytest.fixture(params=["sqlite", "supabase"])
+def connector(request, sqlite_connector):
+    if request.param == "sqlite":
+        return sqlite_connector
+    return SupabaseConnector(client=SupabaseStandIn(sqlite_connector.db_path))
+
+
+def test_boxoffice_is_loaded_only_for_selected_range(connector):
+    day = connector.get_boxoffice("2025-01-03", "2025-01-03")
+    assert day["rank"].tolist() == [1, 2, 3]
+    assert set(pd.to_datetime(day["target_dt"]).dt.date.astype(str)) == {"2025-01-03"}
+
+    period = connector.get_boxoffice("2025-01-02", "2025-01-04", ["영화2"])
+    assert len(period) == 3
+    assert set(period["movie_nm"]) == {"영화2"}
+    assert connector.get_boxoffice("2025-01-02", "2025-01-04", []).empty
+
+
+def test_date_range_and_movie_details(connector):
+    date_range = connector.get_boxoffice_date_range().iloc[0]
+    assert str(date_range["min_dt"])[:10] == "2025-01-01"
+    assert str(date_range["max_dt"])[:10] == "2025-01-05"
+
+    details = connector.get_movie_details(["20250001", "20250003"])
+    assert dict(zip(details["movie_cd"], details["rep_genre_nm"])) == {"20250001": "액션", "20250003": "코미디"}
+
+
+def test_range_queries_use_target_dt_index(sqlite_connector):
+    plan = sqlite_connector.select_query(
+        "EXPLAIN QUERY PLAN SELECT * FROM boxoffice WHERE target_dt >= date(?) AND target_dt < date(?, '+1 day')",
+        ("2025-01-03", "2025-01-03"),
+    )
+    assert plan["detail"].str.contains("boxoffice_target_dt").any()
+    totals = sqlite_connector.get_daily_totals("2025-01-02", "2025-01-03")
+    assert totals["audi_cnt"].tolist() == [600.0, 600.0]
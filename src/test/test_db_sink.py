@@ -0,0 +1,44 @@
+import pytest
+from src.boxoffice.logic.db_sink import BatchSink
+
+
+def test_flushes_in_batches_and_on_exit():
+    batches = []
+    with BatchSink(batches.append, batch_size=3, flush_interval=None) as sink:
+        sink.extend({"n": i} for i in range(7))
+        assert [len(b) for b in batches] == [3, 3]
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert sink.written == 7 and sink.flushes == 3
+
+
+def test_failed_write_keeps_buffer_for_retry():
+    calls = []
+
+    def flaky_write(records):
+        calls.append(list(records))
+        if len(calls) == 1:
+            raise RuntimeError("DB 오류")
+
+    sink = BatchSink(flaky_write, batch_size=2, flush_interval=None)
+    with pytest.raises(RuntimeError):
+        sink.extend([{"n": 1}, {"n": 2}])
+    assert sink.written == 0 and len(sink.buffer) == 2
+
+    sink.flush()
+    assert calls[-1] == [{"n": 1}, {"n": 2}]
+    assert sink.written == 2 and not sink.buffer
+
+
+def test_partial_results_are_written_when_producer_fails():
+    batches = []
+
+    def producer():
+        yield {"n": 1}
+        yield {"n": 2}
+        raise ValueError("늦게 실패한 영화관")
+
+    with pytest.raises(ValueError):
+        with BatchSink(batches.append, batch_size=10, flush_interval=None) as sink:
+            for record in producer():
+                sink.add(record)
+    assert batches == [[{"n": 1}, {"n": 2}]]
@@ -0,0 +1,61 @@
+from src.boxoffice.logic.event_normalizer import EventNormalizer, first_group, BRACKET_CONTENT_PATTERN
+
+RULES = """
+[goods_aliases."*"]
+"오리지널 티켓" = ["OT", "오티"]
+
+[goods_aliases.CGV]
+"SCREENX 포스터" = ["SX 포스터", "SX포스터"]
+"오리지널 티켓" = ["CGV OT"]
+
+[goods_keywords."*"]
+"아트카드" = "아트카드"
+
+[goods_keywords."롯데시네마"]
+"시그니처 아트카드" = "시그니처 아트카드"
+"""
+
+
+def make_normalizer(tmp_path, chain_name, title_normalizer=None):
+    rules_path = tmp_path / "rules.toml"
+    rules_path.write_text(RULES, encoding="utf8")
+    return EventNormalizer(chain_name, title_normalizer, rules_path=str(rules_path))
+
+
+def test_goods_aliases_are_merged_per_chain(tmp_path):
+    cgv = make_normalizer(tmp_path, "CGV")
+    assert cgv.goods_name(" SX포스터 ") == "SCREENX 포스터"
+    assert cgv.goods_name("CGV OT") == "오리지널 티켓"
+    assert cgv.goods_name("오티") == "오리지널 티켓"
+    assert cgv.goods_name("배지") == "배지"
+    assert cgv.goods_name(None) == ""
+
+    megabox = make_normalizer(tmp_path, "메가박스")
+    assert megabox.goods_name("SX포스터") == "SX포스터"
+    assert megabox.goods_name("OT") == "오리지널 티켓"
+
+
+def test_chain_keywords_take_precedence(tmp_path):
+    lotte = make_normalizer(tmp_path, "롯데시네마")
+    assert lotte.keyword_goods_name("<F1 더 무비> 시그니처 아트카드 증정") == "시그니처 아트카드"
+    assert lotte.keyword_goods_name("<F1 더 무비> 아트카드 증정") == "아트카드"
+    assert lotte.keyword_goods_name("<F1 더 무비> 포스터 증정") is None
+
+
+def test_batch_normalizes_each_title_once(tmp_path):
+    calls = []
+
+    def title_normalizer(title):
+        calls.append(title)
+        return title.upper()
+
+    normalizer = make_normalizer(tmp_path, "CGV", title_normalizer)
+    events = [
+        {"movie_title": first_group(BRACKET_CONTENT_PATTERN, "[ f1 ] SX 포스터"), "goods_name": "SX 포스터"},
+        {"movie_title": "f1", "goods_name": "TTT"},
+        {"movie_title": None, "goods_name": None},
+    ]
+    normalizer.normalize_events(events)
+    assert calls == ["f1"]
+    assert [event["movie_title"] for event in events] == ["F1", "F1", None]
+    assert [event["goods_name"] for event in events] == ["SCREENX 포스터", "TTT", None]
@@ -0,0 +1,58 @@
+import os
+import pytest
+from bs4 import BeautifulSoup
+from src.boxoffice.logic.html_parser import BACKENDS
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "megabox")
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf8") as f:
+        return f.read()
+
+
+def available_backends():
+    backends = []
+    for name, backend_cls in BACKENDS.items():
+        try:
+            backends.append(pytest.param(backend_cls(), id=name))
+        except ImportError:
+            continue
+    return backends
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_match_full_bs4_parse(backend):
+    """모든 백엔드가 기존 BeautifulSoup 전체 파싱과 같은 값을 추출하는지 확인합니다."""
+    event_list = read_fixture("event_list.html")
+    soup = BeautifulSoup(event_list, "html.parser")
+    expected_items = []
+    for tag in soup.select("div.event-list > div.item"):
+        link = tag.find("a")
+        img_tag = link.find("img")
+        expected_items.append({
+            "onclick": link.get("onclick", ""),
+            "img_alt": img_tag.get("alt", ""),
+            "image_url": img_tag.get("data-src"),
+            "period": link.find("p", class_="date").get_text(strip=True),
+        })
+    assert backend.parse_event_items(event_list) == expected_items
+
+    button = BeautifulSoup(read_fixture("event_detail.html"), "html.parser").find("button", id="btnSelectGoodsStock")
+    assert backend.parse_goods_button(read_fixture("event_detail.html")) == {
+        "name": button.get("data-nm"), "id": button.get("data-pn")
+    }
+
+    stock_soup = BeautifulSoup(read_fixture("goods_stock.html"), "html.parser")
+    expected_stocks = [
+        (tag.find("a").get_text(strip=True), tag.find("span").get_text(strip=True))
+        for tag in stock_soup.find_all("li", class_="brch")
+    ]
+    assert backend.parse_branch_stocks(read_fixture("goods_stock.html")) == expected_stocks
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_handle_missing_nodes(backend):
+    assert backend.parse_event_items("") == []
+    assert backend.parse_goods_button("<html><body><p>없음</p></body></html>") is None
+    assert backend.parse_branch_stocks('<ul><li class="brch">지점</li></ul>') == [(None, None)]
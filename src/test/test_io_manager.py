@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+from dagster import job, op, Out, DynamicOut, DynamicOutput
+from src.boxoffice.pipelines.io_managers import ParquetIOManager
+
+STOCKS = pd.DataFrame({
+    "scraped_at": pd.to_datetime(["2025-07-26 14:40:20.057611"] * 3),
+    "event_id": ["100", "100", "200"],
+    "theater_name": ["CGV 용산", "CGV 판교", "CGV 용산"],
+    "quantity": [229.0, None, -3.0],
+})
+EVENTS = [
+    {"event_id": "100", "theater_chain": "CGV", "end_date": "2025-08-01"},
+    {"event_id": "200", "theater_chain": "메가박스", "end_date": None},
+]
+
+
+@op(out={"stocks": Out(pd.DataFrame), "events": Out(list), "summary": Out(dict)})
+def produce():
+    return STOCKS, EVENTS, {"events": 2}
+
+
+@op(out=DynamicOut(pd.DataFrame))
+def fan_out(stocks: pd.DataFrame):
+    for event_id, group in stocks.groupby("event_id"):
+        yield DynamicOutput(group.reset_index(drop=True), mapping_key=f"event_{event_id}")
+
+
+@op
+def check(stocks: pd.DataFrame, events: list, summary: dict, shards: list):
+    pd.testing.assert_frame_equal(stocks, STOCKS)
+    assert events == EVENTS
+    assert summary == {"events": 2}
+    assert sorted(len(shard) for shard in shards) == [1, 2]
+
+
+@job
+def handoff_job():
+    stocks, events, summary = produce()
+    check(stocks, events, summary, fan_out(stocks).collect())
+
+
+@pytest.mark.parametrize("file_format, compression", [("parquet", "zstd"), ("arrow", None), ("arrow", "lz4")])
+def test_round_trip_and_metadata(tmp_path, file_format, compression):
+    io_manager = ParquetIOManager(base_dir=str(tmp_path), file_format=file_format, compression=compression)
+    result = handoff_job.execute_in_process(resources={"io_manager": io_manager})
+    assert result.success
+
+    metadata = {
+        event.event_specific_data.metadata["path"].value: event.event_specific_data.metadata
+        for event in result.all_events if event.event_type_value == "HANDLED_OUTPUT"
+    }
+    stocks_path = next(path for path in metadata if path.endswith(f"produce/stocks.{file_format}"))
+    assert metadata[stocks_path]["rows"].value == 3
+    assert metadata[stocks_path]["bytes"].value > 0
+    assert sum(path.endswith(f".{file_format}") and "fan_out" in path for path in metadata) == 2
+    summary_path = next(path for path in metadata if path.endswith("summary.json"))
+    assert "rows" not in metadata[summary_path]
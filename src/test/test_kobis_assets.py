@@ -0,0 +1,217 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from dagster import materialize, build_asset_context, build_schedule_context, Failure
+from src.boxoffice.logic.kobisdata_extractor import KobisDataExtractor
+from src.boxoffice.logic.sqlite_connector import SQLiteConnector
+from src.boxoffice.pipelines import kobis_pipeline
+
+
+class FakeExtractor:
+    """요청한 날짜/연도마다 고정된 응답을 돌려주는 KobisDataExtractor 대역"""
+
+    def get_DailyBoxOffice(self, target_dt: datetime) -> pd.DataFrame:
+        if target_dt.day == 3:
+            return pd.DataFrame()
+        return pd.DataFrame({
+            "rank": [1, 2],
+            "movie_cd": ["20250001", "20250002"],
+            "movie_nm": ["영화1", "영화2"],
+            "open_dt": pd.to_datetime(["2024-12-25", "2025-01-01"]),
+            "audi_cnt": [1000.0 * target_dt.day, 500.0],
+            "target_dt": pd.to_datetime(target_dt.date()),
+            "elapsed_dt": [7, 0],
+        })
+
+    def get_MovieList(self, year: int) -> pd.DataFrame:
+        return pd.DataFrame({
+            "movie_cd": [f"{year}0001", f"{year}0002"],
+            "movie_nm": ["영화1", "영화2"],
+            "open_dt": [f"{year}-01-01", None],
+        })
+
+
+@pytest.fixture
+def connector(tmp_path, monkeypatch):
+    connector = SQLiteConnector(str(tmp_path / "movie.sqlite"))
+    monkeypatch.setattr(kobis_pipeline, "KobisDataExtractor", FakeExtractor)
+    monkeypatch.setattr(kobis_pipeline, "get_database_connector", lambda: connector)
+    return connector
+
+
+def test_boxoffice_partition_is_idempotent(connector):
+    for partition_key in ["2025-01-01", "2025-01-02", "2025-01-02"]:
+        result = materialize([kobis_pipeline.boxoffice], partition_key=partition_key)
+        assert result.success
+
+    rows = connector.select_query("SELECT target_dt, movie_cd, audi_cnt FROM boxoffice ORDER BY target_dt, movie_cd")
+    assert len(rows) == 4
+    assert rows["target_dt"].tolist() == ["2025-01-01 00:00:00.000000"] * 2 + ["2025-01-02 00:00:00.000000"] * 2
+    assert rows["audi_cnt"].tolist() == [1000.0, 500.0, 2000.0, 500.0]
+
+
+def test_refetch_writes_only_revised_rows(connector, monkeypatch):
+    result = materialize([kobis_pipeline.boxoffice], partition_key="2025-01-01")
+    metadata = result.asset_materializations_for_node("boxoffice")[0].metadata
+    assert metadata["written_rows"].value == 2
+    rowids = connector.select_query("SELECT rowid, movie_cd FROM boxoffice ORDER BY movie_cd")
+
+    get_daily = FakeExtractor.get_DailyBoxOffice
+
+    def revised(self, target_dt):
+        df = get_daily(self, target_dt)
+        df.loc[df["movie_cd"] == "20250002", "audi_cnt"] = 600.0
+        return df
+
+    monkeypatch.setattr(FakeExtractor, "get_DailyBoxOffice", revised)
+    result = materialize([kobis_pipeline.boxoffice], partition_key="2025-01-01")
+    metadata = result.asset_materializations_for_node("boxoffice")[0].metadata
+    assert (metadata["written_rows"].value, metadata["revised_rows"].value) == (1, 1)
+
+    rows = connector.select_query("SELECT rowid, movie_cd, audi_cnt FROM boxoffice ORDER BY movie_cd")
+    assert rows["audi_cnt"].tolist() == [1000.0, 600.0]
+    assert rows["rowid"].iloc[0] == rowids["rowid"].iloc[0]  # 바뀌지 않은 행은 다시 쓰지 않음
+
+    result = materialize([kobis_pipeline.boxoffice], partition_key="2025-01-01")
+    assert result.asset_materializations_for_node("boxoffice")[0].metadata["written_rows"].value == 0
+
+
+def test_refetch_deletes_movies_missing_from_response(connector, monkeypatch):
+    assert materialize([kobis_pipeline.boxoffice], partition_key="2025-01-01").success
+    assert materialize([kobis_pipeline.boxoffice], partition_key="2025-01-02").success
+
+    get_daily = FakeExtractor.get_DailyBoxOffice
+    monkeypatch.setattr(FakeExtractor, "get_DailyBoxOffice", lambda self, target_dt: get_daily(self, target_dt).iloc[:1])
+    result = materialize([kobis_pipeline.boxoffice], partition_key="2025-01-01")
+    assert result.asset_materializations_for_node("boxoffice")[0].metadata["deleted_rows"].value == 1
+
+    # 정정된 응답에서 빠진 영화는 그날의 행과 해시만 지우고, 다른 날짜의 행은 그대로 둡니다.
+    rows = connector.select_query("SELECT target_dt, movie_cd FROM boxoffice ORDER BY target_dt, movie_cd")
+    assert rows["movie_cd"].tolist() == ["20250001", "20250001", "20250002"]
+    hashes = connector.select_query("SELECT movie_cd FROM boxoffice_hash WHERE target_dt = '2025-01-01'")
+    assert hashes["movie_cd"].tolist() == ["20250001"]
+    deletions = connector.select_query("SELECT target_dt, movie_cd FROM boxoffice_change WHERE op = 'delete'")
+    assert deletions.values.tolist() == [["2025-01-01", "20250002"]]
+
+
+def test_failed_boxoffice_write_skips_hashes(connector, monkeypatch):
+    def failing_insert(df):
+        raise RuntimeError("write failed")
+
+    monkeypatch.setattr(connector, "insert_boxoffice", failing_insert)
+    df = FakeExtractor().get_DailyBoxOffice(datetime(2025, 1, 1))
+    with pytest.raises(RuntimeError):
+        kobis_pipeline.save_boxoffice_day(connector, "2025-01-01", df)
+    assert connector.select_query("SELECT * FROM boxoffice_hash").empty
+
+
+def test_daily_schedule_covers_revision_window():
+    context = build_schedule_context(scheduled_execution_time=datetime(2025, 1, 4, 8))
+    run_requests = list(kobis_pipeline.kobis_daily_schedule(context))
+    assert [request.partition_key for request in run_requests] == ["2025-01-03", "2025-01-02", "2025-01-01"]
+
+
+def test_empty_boxoffice_partition_fails(connector):
+    with pytest.raises(Failure):
+        kobis_pipeline.boxoffice(build_asset_context(partition_key="2025-01-03"))
+    assert connector.select_query("SELECT * FROM boxoffice").empty
+
+
+def test_movie_partition_upserts_by_movie_cd(connector):
+    for _ in range(2):
+        assert materialize([kobis_pipeline.movie], partition_key="2025").success
+    movies = connector.select_query("SELECT movie_cd, open_dt FROM movie ORDER BY movie_cd")
+    assert movies["movie_cd"].tolist() == ["20250001", "20250002"]
+    assert movies["open_dt"].tolist() == ["2025-01-01", None]
+
+
+def test_existing_duplicates_are_removed_before_natural_key(tmp_path):
+    db_path = str(tmp_path / "legacy.sqlite")
+    connector = SQLiteConnector(db_path)
+    conn = connector._get_connection()
+    conn.execute("DROP INDEX boxoffice_natural_key")
+    conn.executemany("INSERT INTO boxoffice (movie_cd, target_dt, audi_cnt) VALUES (?, ?, ?)", [
+        ("1", "2025-01-01 00:00:00.000000", 10.0),
+        ("1", "2025-01-01 00:00:00.000000", 20.0),
+    ])
+    conn.commit()
+    conn.close()
+
+    connector = SQLiteConnector(db_path)
+    assert connector.select_query("SELECT audi_cnt FROM boxoffice")["audi_cnt"].tolist() == [20.0]
+
+
+class FakeKobisApi(KobisDataExtractor):
+    """영화목록/상세정보 API 응답을 메모리의 목록으로 흉내 내는 추출기 (가공 로직은 실제 것을 사용)"""
+
+    def __init__(self, catalog, infos=None):
+        self.kobis_key = "test"
+        self.catalog = catalog
+        self.infos = infos or {}
+        self.calls = []
+
+    def _request_api(self, endpoint, params, data_path=None):
+        self.calls.append(endpoint)
+        if endpoint == "movie/searchMovieInfo.json":
+            return self.infos.get(params["movieCd"], {})
+        page = int(params["curPage"])
+        size = int(params["itemPerPage"])
+        return {"movieList": self.catalog[(page - 1) * size:page * size]}
+
+
+def make_list_item(movie_cd, genre="드라마"):
+    return {
+        "movieCd": movie_cd, "movieNm": f"영화{movie_cd}", "movieNmEn": f"Movie {movie_cd}",
+        "prdtYear": "2025", "openDt": "20250101", "typeNm": "장편", "prdtStatNm": "개봉",
+        "nationAlt": "한국", "genreAlt": genre, "repNationNm": "한국", "repGenreNm": genre,
+        "directors": [{"peopleNm": "감독"}], "companys": [],
+    }
+
+
+def materialize_movie(full_reload):
+    result = materialize(
+        [kobis_pipeline.movie], partition_key="2025",
+        run_config={"ops": {"movie": {"config": {"full_reload": full_reload}}}},
+    )
+    assert result.success
+    materialization = result.asset_materializations_for_node("movie")[0]
+    return {key: value.value for key, value in materialization.metadata.items()}
+
+
+def test_incremental_movie_sync_stops_at_known_page(connector, monkeypatch):
+    catalog = [make_list_item("20259999", genre="성인물(에로)")] + [make_list_item(f"2025{i:04d}") for i in range(249)]
+    api = FakeKobisApi(catalog)
+    monkeypatch.setattr(kobis_pipeline, "KobisDataExtractor", lambda: api)
+
+    assert materialize_movie(full_reload=True)["rows"] == 249
+    assert api.calls.count("movie/searchMovieList.json") == 3
+
+    catalog[:0] = [make_list_item(f"2026{i:04d}") for i in range(3)]
+    api.calls.clear()
+    stats = materialize_movie(full_reload=False)
+    assert stats["new_movies"] == 3
+    assert stats["list_pages"] == 2
+    assert api.calls == ["movie/searchMovieList.json"] * 2
+    assert len(connector.select_query("SELECT movie_cd FROM movie")) == 252
+
+
+def test_incremental_movie_sync_fills_boxoffice_movies(connector, monkeypatch):
+    info = {
+        "movieCd": "20240001", "movieNm": "독립영화", "movieNmEn": "", "prdtYear": "2024", "openDt": "20250105",
+        "typeNm": "장편", "prdtStatNm": "개봉", "nations": [{"nationNm": "한국"}, {"nationNm": "일본"}],
+        "genres": [{"genreNm": "다큐멘터리"}], "directors": [], "companys": [{"companyCd": "1", "companyNm": "배급사"}],
+    }
+    api = FakeKobisApi([], {"20240001": info})
+    monkeypatch.setattr(kobis_pipeline, "KobisDataExtractor", lambda: api)
+    connector.insert_boxoffice(pd.DataFrame({"movie_cd": ["20240001"], "target_dt": ["2025-01-05 00:00:00.000000"]}))
+
+    stats = materialize_movie(full_reload=False)
+    assert stats["missing_movies"] == 1
+    movie = connector.select_query("SELECT * FROM movie").iloc[0]
+    assert movie["nation_alt"] == "한국,일본"
+    assert movie["rep_genre_nm"] == "다큐멘터리"
+    assert movie["open_dt"] == "2025-01-05"
+    assert movie["companys"] == '[{"company_cd": "1", "company_nm": "배급사"}]'
+
+    api.calls.clear()
+    assert materialize_movie(full_reload=False)["missing_codes"] == 0
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+from dagster import build_schedule_context, SkipReason, RunRequest
+from src.boxoffice.logic.run_lease import RunLease
+from src.boxoffice.logic.sqlite_connector import SQLiteConnector
+from src.boxoffice.pipelines import goods_stock_pipeline
+
+NOW = datetime(2025, 7, 1, 12, 0)
+
+
+def test_lease_is_exclusive_until_expired(tmp_path):
+    lease = RunLease(SQLiteConnector(str(tmp_path / "movie.sqlite")), "goods_stock", ttl_seconds=600)
+    assert lease.acquire("CGV", "run-a", NOW)
+    assert lease.acquire("CGV", "run-a", NOW + timedelta(seconds=10))  # 같은 실행은 다시 얻을 수 있음
+    assert not lease.acquire("CGV", "run-b", NOW + timedelta(seconds=60))
+    assert lease.acquire("메가박스", "run-b", NOW + timedelta(seconds=60))
+
+    # run-a가 반납하지 못하고 죽어도 유효 시간이 지나면 다른 실행이 가져갑니다.
+    assert lease.acquire("CGV", "run-b", NOW + timedelta(seconds=611))
+    assert lease.held(NOW + timedelta(seconds=611))["CGV"]["holder"] == "run-b"
+
+
+def test_release_only_expires_own_leases(tmp_path):
+    lease = RunLease(SQLiteConnector(str(tmp_path / "movie.sqlite")), "goods_stock", ttl_seconds=600)
+    lease.acquire("CGV", "run-a", NOW)
+    lease.acquire("메가박스", "run-b", NOW)
+    lease.release("run-a", NOW + timedelta(seconds=30))
+    assert set(lease.held(NOW + timedelta(seconds=31))) == {"메가박스"}
+    assert lease.acquire("CGV", "run-c", NOW + timedelta(seconds=31))
+
+
+def test_schedule_skips_when_every_chain_is_leased(tmp_path, monkeypatch):
+    connector = SQLiteConnector(str(tmp_path / "movie.sqlite"))
+    monkeypatch.setattr(goods_stock_pipeline, "get_database_connector", lambda: connector)
+    lease = goods_stock_pipeline._stock_lease(connector)
+    context = build_schedule_context(scheduled_execution_time=datetime.now())
+
+    lease.acquire("CGV", "run-a")
+    assert isinstance(goods_stock_pipeline.goods_stock_schedule(context), RunRequest)
+
+    lease.acquire("롯데시네마", "run-a")
+    lease.acquire("메가박스", "run-a")
+    skip = goods_stock_pipeline.goods_stock_schedule(context)
+    assert isinstance(skip, SkipReason)
+    assert "CGV(run run-a" in skip.skip_message
@@ -0,0 +1,55 @@
+import pytest
+from src.boxoffice.logic.movie_events_scraper import CGVScraper, LotteCinemaScraper, MegaboxScraper
+from src.boxoffice.logic.movie_title_index import MovieTitleIndex
+from src.test.http_replay import HttpFixtureStore, MissingFixtureError, ReplaySession, use_session
+
+
+def replay_scraper(scraper_cls, latency: float = 0.0):
+    session = ReplaySession(HttpFixtureStore.for_scraper(scraper_cls).load(), latency=latency)
+    scraper = use_session(scraper_cls(), session)
+    scraper.title_index = MovieTitleIndex([], [])
+    return scraper, session
+
+
+@pytest.mark.parametrize("scraper_cls", [CGVScraper, LotteCinemaScraper, MegaboxScraper])
+def test_replay_events_and_stock(scraper_cls):
+    """기록된 fixture만으로 이벤트와 재고를 수집할 수 있는지 확인합니다. (네트워크 없음)"""
+    scraper, session = replay_scraper(scraper_cls)
+
+    events = scraper.get_events()
+    assert events
+    assert all(event["theater_chain"] == scraper.chain_name for event in events)
+    assert session.request_count > 0
+
+    event = next(event for event in events if event.get("goods_id"))
+    stocks = scraper.get_goods_stock(event)
+    assert stocks
+    assert all(stock["theater_name"] for stock in stocks)
+
+
+def test_unrecorded_request_fails_loudly():
+    scraper, _ = replay_scraper(LotteCinemaScraper)
+    with pytest.raises(MissingFixtureError):
+        scraper.get_goods_stock({"event_id": "unknown", "goods_id": "unknown", "goods_name": "없음"})
+
+
+def test_replay_latency_is_counted_as_transport_time():
+    scraper, session = replay_scraper(LotteCinemaScraper, latency=0.01)
+    scraper.get_events()
+    assert session.transport_seconds >= 0.01 * session.request_count
+
+
+def test_cgv_listing_pages_are_fetched_after_first_page(tmp_path, monkeypatch):
+    """첫 페이지들로 totalCount를 확인한 뒤 나머지 페이지를 모두 가져오고, 디버그 CSV는 지정한 경우에만 씁니다."""
+    monkeypatch.chdir(tmp_path)
+    scraper, session = replay_scraper(CGVScraper)
+    listings = {**scraper._movie_event_listings(), **scraper._goods_event_listings()}
+    items = scraper._fetch_listings(listings)
+    assert set(items) == set(listings)
+    assert all(items.values())
+    assert session.request_count >= len(listings)
+    assert list(tmp_path.iterdir()) == []
+
+    scraper.movie_events_dump_path = str(tmp_path / "cgv_movie_events.csv")
+    scraper._get_movie_events(items)
+    assert (tmp_path / "cgv_movie_events.csv").exists()
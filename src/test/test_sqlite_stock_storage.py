@@ -0,0 +1,87 @@
+import sqlite3
+from datetime import datetime
+import pandas as pd
+import pytest
+from src.boxoffice.logic.sqlite_connector import SQLiteConnector
+
+
+@pytest.fixture
+def connector(tmp_path):
+    return SQLiteConnector(str(tmp_path / "movie.sqlite"))
+
+
+def make_stocks(scraped_at: datetime, status: str = "보유") -> pd.DataFrame:
+    return pd.DataFrame({
+        "scraped_at": scraped_at,
+        "event_id": ["100", "100", "200"],
+        "theater_chain": "CGV",
+        "theater_name": ["CGV 용산", "CGV 판교", "CGV 용산"],
+        "status": [status, "새로운 상태", status],
+        "quantity": [229.0, float("nan"), -3.0],
+        "total_quantity": [600, None, 10],
+    })
+
+
+def test_stocks_are_stored_as_integer_facts(connector):
+    connector.insert_goods_stock(make_stocks(datetime(2025, 7, 26, 14, 40, 20, 57611)))
+    # 같은 초 안에 다시 수집한 재고는 초 미만이 버려져 같은 행을 덮어씁니다.
+    connector.insert_goods_stock(make_stocks(datetime(2025, 7, 26, 14, 40, 20, 957611)))
+
+    facts = connector.select_query("SELECT * FROM goods_stock_fact")
+    assert len(facts) == 3
+    assert all(pd.api.types.is_integer_dtype(facts[col]) for col in ["scraped_at", "event_key", "theater_id"])
+    assert len(connector.select_query("SELECT * FROM theater")) == 2
+
+    view = connector.select_query("SELECT * FROM goods_stock ORDER BY event_id, theater_name")
+    assert view["scraped_at"].tolist() == ["2025-07-26 14:40:20"] * 3
+    assert view["quantity"].tolist() == ["229", None, "-3"]
+    assert view["status"].tolist() == ["보유", "새로운 상태", "보유"]
+
+
+def test_latest_stock_per_theater(connector):
+    connector.insert_goods_stock(make_stocks(datetime(2025, 7, 26, 14, 0)))
+    connector.insert_goods_stock(make_stocks(datetime(2025, 7, 26, 14, 10), status="소진"))
+
+    latest = connector.get_latest_stock("100").sort_values("theater_name")
+    assert latest["scraped_at"].tolist() == ["2025-07-26 14:10:00"] * 2
+    assert latest["status"].tolist() == ["소진", "새로운 상태"]
+    assert connector.get_latest_stock("999").empty
+
+
+def test_legacy_goods_stock_table_is_migrated(tmp_path):
+    db_path = str(tmp_path / "legacy.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE goods_event (event_id TEXT PRIMARY KEY, theater_chain TEXT)")
+    conn.execute("INSERT INTO goods_event VALUES ('100', 'CGV')")
+    conn.execute("""
+        CREATE TABLE goods_stock (
+            scraped_at DATETIME, theater_name TEXT, event_id TEXT,
+            status TEXT, quantity TEXT, total_quantity INTEGER
+        )
+    """)
+    # 같은 초에 두 번 수집한 행은 테이블에 들어간 순서와 관계없이 나중에 수집한 값이 남아야 합니다.
+    conn.executemany("INSERT INTO goods_stock VALUES (?, ?, ?, ?, ?, ?)", [
+        ("2025-07-26 14:40:20.100000", "CGV 용산", "100", "소진", "0", 600),
+        ("2025-07-26 14:40:20.957611", "CGV 용산", "100", "보유", "229.0", 600),
+        ("2025-07-26 14:40:20.957611", "CGV 판교", "100", "준비중", None, None),
+        ("2025-07-26 14:40:20.100000", "CGV 판교", "100", "소진", "0", None),
+    ])
+    conn.commit()
+    conn.close()
+
+    # 연결만으로는 옮기지 않고, 예전 테이블을 그대로 둡니다.
+    connector = SQLiteConnector(db_path)
+    assert connector.select_query("SELECT COUNT(*) AS n FROM goods_stock_fact")["n"].iloc[0] == 0
+
+    assert connector.migrate_legacy_goods_stock() == 4
+    assert connector.migrate_legacy_goods_stock() == 0
+    view = connector.select_query("SELECT * FROM goods_stock ORDER BY theater_name")
+    # 초 미만은 반올림하지 않고 버립니다.
+    assert view["scraped_at"].tolist() == ["2025-07-26 14:40:20"] * 2
+    assert view["quantity"].tolist() == ["229", None]
+    assert view["status"].tolist() == ["보유", "준비중"]
+    theaters = connector.select_query("SELECT theater_chain FROM theater")
+    assert theaters["theater_chain"].tolist() == ["CGV", "CGV"]
+    table_types = connector.select_query("SELECT name, type FROM sqlite_master WHERE name LIKE 'goods_stock%'")
+    assert dict(zip(table_types["name"], table_types["type"]))["goods_stock"] == "view"
+    assert len(connector.select_query("SELECT * FROM goods_stock_legacy")) == 4
@@ -0,0 +1,182 @@
+import time
+import pytest
+from dagster import DagsterInstance, build_run_status_sensor_context
+from src.boxoffice.logic.circuit_breaker import CircuitBreaker
+from src.boxoffice.logic.sqlite_connector import SQLiteConnector
+from src.boxoffice.pipelines import goods_stock_pipeline
+from src.boxoffice.pipelines.io_managers import ParquetIOManager
+
+EVENTS = [("CGV", f"c{i}") for i in range(30)] + [("메가박스", "m1"), ("롯데시네마", "l1")]
+
+
+@pytest.fixture
+def connector(tmp_path, monkeypatch):
+    connector = SQLiteConnector(str(tmp_path / "movie.sqlite"))
+    connector.insert_goods_event([
+        {"event_id": event_id, "theater_chain": chain_name, "goods_name": "굿즈", "end_date": "2099-12-31"}
+        for chain_name, event_id in EVENTS
+    ])
+    monkeypatch.setattr(goods_stock_pipeline, "get_database_connector", lambda: connector)
+
+    def fake_stock(event, previous_hash=None):
+        response_hash = f"hash-{event['event_id']}"
+        if previous_hash == response_hash:
+            return None, response_hash
+        return [{"theater_name": "용산", "status": "보유", "quantity": "12"}], response_hash
+
+    for scraper in goods_stock_pipeline.SCRAPERS:
+        monkeypatch.setattr(scraper, "get_goods_stock_if_changed", fake_stock)
+        monkeypatch.setattr(scraper, "circuit_breaker", CircuitBreaker(scraper.chain_name))
+    return connector
+
+
+def run_job(tmp_path):
+    result = goods_stock_pipeline.goods_stock_check_job.execute_in_process(
+        resources={"io_manager": ParquetIOManager(base_dir=str(tmp_path / "io"))}
+    )
+    assert result.success
+    return result
+
+
+def test_shards_fan_out_and_write_once(connector, tmp_path):
+    result = run_job(tmp_path)
+    fetch_steps = {
+        event.step_key for event in result.all_events
+        if event.event_type_value == "STEP_SUCCESS" and event.step_key.startswith("fetch_")
+    }
+    assert fetch_steps == {
+        "fetch_cgv_stocks[cgv_0]", "fetch_cgv_stocks[cgv_1]",
+        "fetch_lotte_stocks[lotte_0]", "fetch_megabox_stocks[megabox_0]",
+    }
+    assert result.output_for_node("save_stocks_to_db") == {
+        "events": 32, "unchanged_events": 0, "skipped_events": 0, "circuit_open_events": 0,
+        "lease_held_events": 0, "stock_rows": 32,
+    }
+    facts = connector.select_query("SELECT quantity FROM goods_stock_fact")
+    assert facts["quantity"].tolist() == [12] * 32
+
+    summary = run_job(tmp_path).output_for_node("save_stocks_to_db")
+    assert summary["unchanged_events"] == 32
+    assert summary["stock_rows"] == 0
+
+
+def test_open_circuit_chain_is_skipped(connector, tmp_path):
+    breaker = CircuitBreaker("롯데시네마", failure_threshold=1)
+    breaker.record_failure("HTTP 503")
+    connector.upsert_scraper_circuit_state([breaker.snapshot()])
+
+    summary = run_job(tmp_path).output_for_node("save_stocks_to_db")
+    assert summary["circuit_open_events"] == 1
+    assert summary["stock_rows"] == 31
+
+
+def test_fetch_ops_are_tagged_per_chain():
+    assert goods_stock_pipeline.goods_stock_check_job.executor_def.name == "stock_multiprocess_executor"
+    tags = {
+        op_def.name: op_def.tags[goods_stock_pipeline.CHAIN_TAG]
+        for op_def in goods_stock_pipeline.FETCH_STOCKS_OPS.values()
+    }
+    assert tags == {"fetch_cgv_stocks": "cgv", "fetch_lotte_stocks": "lotte", "fetch_megabox_stocks": "megabox"}
+
+
+def test_leased_chain_is_skipped_and_released(connector, tmp_path):
+    lease = goods_stock_pipeline._stock_lease(connector)
+    assert lease.acquire("CGV", "other-run")
+
+    result = run_job(tmp_path)
+    summary = result.output_for_node("save_stocks_to_db")
+    assert summary["lease_held_events"] == 30
+    assert summary["stock_rows"] == 2
+    # 이번 실행이 얻은 임대는 반납되고, 다른 실행의 임대는 그대로 남습니다.
+    assert set(lease.held()) == {"CGV"}
+    assert lease.acquire("메가박스", "next-run")
+
+
+def test_failed_stock_write_skips_hashes(connector, tmp_path, monkeypatch):
+    def failing_insert(df):
+        raise RuntimeError("write failed")
+
+    monkeypatch.setattr(connector, "insert_goods_stock", failing_insert)
+    result = goods_stock_pipeline.goods_stock_check_job.execute_in_process(
+        resources={"io_manager": ParquetIOManager(base_dir=str(tmp_path / "io"))}, raise_on_error=False,
+    )
+    assert not result.success
+    # 재고가 저장되지 않았으므로 다음 실행이 같은 응답을 다시 파싱하도록 해시도 쓰지 않습니다.
+    assert connector.select_query("SELECT COUNT(*) AS n FROM goods_stock_hash")["n"].iloc[0] == 0
+    assert goods_stock_pipeline._stock_lease(connector).held() == {}
+
+
+def test_deadline_is_kept_until_running_fetches_finish(connector, monkeypatch):
+    scraper = goods_stock_pipeline.SCRAPERS[0]
+    deadline_seen = []
+
+    def slow_stock(event, previous_hash=None):
+        time.sleep(0.5)
+        deadline_seen.append(scraper._deadline is not None)
+        return [], "hash"
+
+    monkeypatch.setattr(scraper, "get_goods_stock_if_changed", slow_stock)
+    monkeypatch.setattr(goods_stock_pipeline, "_remaining_run_seconds", lambda context: 0.2)
+    events = [{"event_id": f"c{i}", "theater_chain": scraper.chain_name} for i in range(6)]
+
+    _, report = goods_stock_pipeline._fetch_shard_stocks(None, scraper, events)
+    assert report["skipped_events"] == 6
+    # 마감 후에도 실행 중이던 조회는 마감 시각이 걸린 채로 끝나고, 시작하지 않은 조회는 취소됩니다.
+    assert deadline_seen and all(deadline_seen)
+    assert len(deadline_seen) < len(events)
+    assert scraper._deadline is None
+
+
+def test_sibling_shard_keeps_open_circuit_and_stops(connector, monkeypatch):
+    tripping = goods_stock_pipeline.SCRAPERS[0]
+    sibling = type(tripping)()
+    monkeypatch.setattr(tripping, "circuit_breaker", CircuitBreaker(tripping.chain_name, failure_threshold=2))
+    monkeypatch.setattr(goods_stock_pipeline, "_remaining_run_seconds", lambda context: 300)
+    tripping_events = [{"event_id": f"c{i}", "theater_chain": tripping.chain_name} for i in range(2)]
+    sibling_events = [{"event_id": f"c{i}", "theater_chain": sibling.chain_name} for i in range(2, 12)]
+
+    def failing_stock(event, previous_hash=None):
+        tripping.circuit_breaker.record_failure("HTTP 503")
+        raise RuntimeError("HTTP 503")
+
+    sibling_calls = []
+
+    def sibling_stock(event, previous_hash=None):
+        # 첫 조회 중에 다른 샤드가 같은 체인의 차단기를 열고 상태를 저장합니다.
+        if not sibling_calls:
+            goods_stock_pipeline._fetch_shard_stocks(None, tripping, tripping_events)
+        sibling_calls.append(event["event_id"])
+        return [], f"hash-{event['event_id']}"
+
+    monkeypatch.setattr(tripping, "get_goods_stock_if_changed", failing_stock)
+    monkeypatch.setattr(sibling, "get_goods_stock_if_changed", sibling_stock)
+
+    _, report = goods_stock_pipeline._fetch_shard_stocks(None, sibling, sibling_events)
+    assert len(sibling_calls) == goods_stock_pipeline.STOCK_CIRCUIT_SYNC_EVENTS
+    assert report["circuit_open_events"] == len(sibling_events) - len(sibling_calls)
+    stored = connector.select_query("SELECT state FROM scraper_circuit_state WHERE theater_chain = 'CGV'")
+    assert stored["state"].tolist() == [CircuitBreaker.OPEN]
+
+
+def test_failed_run_releases_leases(connector, tmp_path, monkeypatch):
+    def failing_fetch(context, scraper, events):
+        raise RuntimeError("shard failed")
+
+    monkeypatch.setattr(goods_stock_pipeline, "_fetch_shard_stocks", failing_fetch)
+    instance = DagsterInstance.ephemeral()
+    result = goods_stock_pipeline.goods_stock_check_job.execute_in_process(
+        resources={"io_manager": ParquetIOManager(base_dir=str(tmp_path / "io"))},
+        instance=instance, raise_on_error=False,
+    )
+    assert not result.success
+    lease = goods_stock_pipeline._stock_lease(connector)
+    assert set(lease.held()) == {"CGV", "롯데시네마", "메가박스"}
+
+    context = build_run_status_sensor_context(
+        sensor_name="release_stock_leases_on_failure",
+        dagster_event=result.get_run_failure_event(),
+        dagster_instance=instance,
+        dagster_run=result.dagster_run,
+    ).for_run_failure()
+    goods_stock_pipeline.release_stock_leases_on_failure(context)
+    assert lease.held() == {}
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+import pandas as pd
+from src.boxoffice.logic.sqlite_connector import SQLiteConnector
+from src.boxoffice.logic.stock_poll_scheduler import StockPollScheduler
+
+NOW = datetime(2025, 8, 1, 12, 0)
+OLD_EVENT = NOW - timedelta(days=10)
+
+
+def make_scheduler(budget=720):
+    return StockPollScheduler(db_connector=None, request_budget_per_hour=budget)
+
+
+def metrics(change_rate=0.0, units_per_hour=0.0, remaining=None, sold_out=False):
+    return {"change_rate": change_rate, "units_per_hour": units_per_hour, "remaining": remaining, "sold_out": sold_out}
+
+
+def test_hot_event_polls_every_minute():
+    scheduler = make_scheduler()
+    interval = scheduler.compute_interval(metrics(change_rate=5.0, units_per_hour=500, remaining=50), NOW, OLD_EVENT, NOW)
+    assert interval == scheduler.MIN_INTERVAL_SECONDS
+
+
+def test_low_remaining_stock_shortens_interval():
+    scheduler = make_scheduler()
+    plenty = scheduler.compute_interval(metrics(change_rate=0.1, units_per_hour=10, remaining=1000), NOW, OLD_EVENT, NOW)
+    scarce = scheduler.compute_interval(metrics(change_rate=0.1, units_per_hour=10, remaining=5), NOW, OLD_EVENT, NOW)
+    assert scarce < plenty
+
+
+def test_static_and_sold_out_events_back_off():
+    scheduler = make_scheduler()
+    stale = scheduler.compute_interval(None, NOW - timedelta(hours=8), OLD_EVENT, NOW)
+    assert stale == 2 * 60 * 60
+    sold_out = scheduler.compute_interval(metrics(sold_out=True), NOW, OLD_EVENT, NOW)
+    assert sold_out == scheduler.MAX_INTERVAL_SECONDS
+
+
+def test_new_event_interval_is_capped():
+    scheduler = make_scheduler()
+    interval = scheduler.compute_interval(None, NOW - timedelta(days=3), NOW - timedelta(hours=1), NOW)
+    assert interval == scheduler.NEW_EVENT_MAX_INTERVAL_SECONDS
+
+
+def test_budget_scales_intervals():
+    scheduler = make_scheduler(budget=60)
+    intervals = scheduler._apply_budget({"a": 60, "b": 60, "c": 600})
+    requests_per_hour = sum(3600 / interval for interval in intervals.values())
+    assert requests_per_hour <= 60 + 1e-6
+    assert intervals["a"] == intervals["b"] < intervals["c"]
+
+
+def test_stock_metrics_read_recent_facts_by_index(tmp_path):
+    connector = SQLiteConnector(str(tmp_path / "movie.sqlite"))
+    connector.insert_goods_stock(pd.DataFrame([
+        {"scraped_at": NOW - timedelta(hours=5), "event_id": "e1", "theater_name": "용산", "status": "보유", "quantity": 100},
+        {"scraped_at": NOW - timedelta(hours=2), "event_id": "e1", "theater_name": "용산", "status": "보유", "quantity": 50},
+        {"scraped_at": NOW - timedelta(hours=1), "event_id": "e1", "theater_name": "용산", "status": "보유", "quantity": 40},
+    ]))
+
+    # VELOCITY_WINDOW_HOURS(3시간) 밖의 스냅샷은 읽지 않습니다.
+    metrics = StockPollScheduler(connector, request_budget_per_hour=720).load_stock_metrics(NOW)
+    assert metrics["e1"]["units_per_hour"] == 10.0
+    assert metrics["e1"]["remaining"] == 40.0
+
+    plan = connector.select_query(
+        "EXPLAIN QUERY PLAN SELECT * FROM goods_stock_fact WHERE scraped_at >= 0"
+    )["detail"].tolist()
+    assert any("goods_stock_fact_scraped_at" in detail for detail in plan)
@@ -0,0 +1,50 @@
+import logging
+import os
+from src.boxoffice.logic.html_parser import Bs4Backend
+from src.boxoffice.logic.movie_events_scraper import MegaboxScraper
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "megabox", "goods_stock.html")
+EVENT = {"theater_chain": "메가박스", "event_id": "1", "goods_id": "G1", "goods_name": "테스트 굿즈"}
+
+
+def make_scraper(responses):
+    """네트워크 없이 응답 원문을 차례로 돌려주는 메가박스 스크레이퍼"""
+    scraper = MegaboxScraper.__new__(MegaboxScraper)
+    scraper.chain_name = "메가박스"
+    scraper.logger = logging.getLogger("test")
+    scraper.html_parser = Bs4Backend()
+    scraper.parse_calls = 0
+    responses = iter(responses)
+    parse = scraper._parse_goods_stock
+
+    def counting_parse(raw):
+        scraper.parse_calls += 1
+        return parse(raw)
+
+    scraper._fetch_goods_stock = lambda event: next(responses)
+    scraper._parse_goods_stock = counting_parse
+    return scraper
+
+
+def test_unchanged_response_skips_parsing():
+    with open(FIXTURE_PATH, "rb") as f:
+        raw = f.read()
+    scraper = make_scraper([raw, raw, raw.replace(b"</ul>", b"</ul> ", 1)])
+
+    stocks, first_hash = scraper.get_goods_stock_if_changed(EVENT)
+    assert stocks and first_hash
+    assert scraper.parse_calls == 1
+
+    stocks, second_hash = scraper.get_goods_stock_if_changed(EVENT, first_hash)
+    assert stocks is None
+    assert second_hash == first_hash
+    assert scraper.parse_calls == 1
+
+    stocks, third_hash = scraper.get_goods_stock_if_changed(EVENT, first_hash)
+    assert stocks is not None and third_hash != first_hash
+    assert scraper.parse_calls == 2
+
+
+def test_failed_request_returns_no_hash():
+    scraper = make_scraper([None])
+    assert scraper.get_goods_stock_if_changed(EVENT, "abc") == ([], None)
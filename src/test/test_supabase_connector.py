@@ -0,0 +1,74 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+from src.boxoffice.logic.supabase_connector import SupabaseConnector, SupabaseWriteError
+from src.test.supabase_standin import SupabaseStandIn, StandInResponse
+
+
+@pytest.fixture
+def standin(tmp_path):
+    return SupabaseStandIn(str(tmp_path / "standin.sqlite"))
+
+
+@pytest.fixture
+def connector(standin):
+    return SupabaseConnector(client=standin)
+
+
+def make_stocks(n_rows: int, scraped_at: datetime) -> pd.DataFrame:
+    return pd.DataFrame({
+        "event_id": [str(i % 7) for i in range(n_rows)],
+        "theater_name": [f"지점{i}" for i in range(n_rows)],
+        "status": "보유",
+        "quantity": [float(i % 50) for i in range(n_rows)],
+        "total_quantity": [float("nan") if i % 2 else 100.0 for i in range(n_rows)],
+        "scraped_at": scraped_at,
+    })
+
+
+def test_upsert_is_batched_and_idempotent(connector, standin):
+    stocks = make_stocks(2500, datetime(2025, 7, 1, 12, 0))
+    connector.insert_goods_stock(stocks)
+    assert standin.request_count == 3  # 1000 + 1000 + 500
+
+    connector.insert_goods_stock(stocks)
+    count = connector.select_query("SELECT COUNT(*) AS cnt FROM goods_stock")
+    assert count["cnt"].iloc[0] == 2500
+
+
+def test_select_query_paginates_past_max_rows(connector, standin):
+    connector.insert_goods_stock(make_stocks(2500, datetime(2025, 7, 1, 12, 0)))
+    standin.reset_counters()
+
+    result = connector.select_query("SELECT * FROM goods_stock ORDER BY theater_name")
+    assert len(result) == 2500
+    assert standin.request_count == 3
+
+
+def test_serialization_converts_nan_and_integers(connector, standin):
+    connector.insert_goods_stock(make_stocks(2, datetime(2025, 7, 1, 12, 0)))
+    result = connector.select_query("SELECT total_quantity, scraped_at FROM goods_stock ORDER BY theater_name")
+    assert result["total_quantity"].iloc[0] == 100
+    assert pd.isna(result["total_quantity"].iloc[1])
+    assert pd.Timestamp(result["scraped_at"].iloc[0]) == pd.Timestamp("2025-07-01 12:00:00")
+
+
+def test_latest_stock_rpc(connector):
+    connector.insert_goods_stock(make_stocks(7, datetime(2025, 7, 1, 12, 0)))
+    newer = make_stocks(7, datetime(2025, 7, 1, 12, 10))
+    newer["status"] = "소진"
+    connector.insert_goods_stock(newer)
+
+    latest = connector.get_latest_stock("0")
+    assert len(latest) == 1
+    assert latest["status"].iloc[0] == "소진"
+
+
+def test_failed_write_raises(connector, standin, monkeypatch):
+    assert connector.config is None
+    with pytest.raises(SupabaseWriteError):
+        connector._post_rpc_rows("missing_function", make_stocks(1, datetime(2025, 7, 1, 12, 0)))
+
+    monkeypatch.setattr(standin, "_handle_upsert", lambda *args: StandInResponse(status_code=503))
+    with pytest.raises(SupabaseWriteError):
+        connector.upsert_boxoffice_hashes([{"target_dt": "2025-01-01", "movie_cd": "1", "row_hash": "h"}])
@@ -0,0 +1,88 @@
+import sqlite3
+from datetime import datetime
+import pandas as pd
+from src.boxoffice.logic.sqlite_connector import SQLiteConnector
+from src.boxoffice.logic.supabase_connector import SupabaseConnector
+from src.boxoffice.logic.supabase_replicator import SupabaseReplicator
+from src.test.supabase_standin import SupabaseStandIn
+
+
+def make_stock(status: str) -> pd.DataFrame:
+    return pd.DataFrame([{
+        "scraped_at": datetime(2025, 7, 1, 12, 0), "event_id": "1", "theater_chain": "CGV",
+        "theater_name": "용산", "status": status, "quantity": 3, "total_quantity": None,
+    }])
+
+
+def test_updated_fact_is_replicated_again(tmp_path):
+    source = SQLiteConnector(str(tmp_path / "source.sqlite"))
+    standin = SupabaseStandIn(str(tmp_path / "standin.sqlite"))
+    replicator = SupabaseReplicator(source=source, target=SupabaseConnector(client=standin))
+
+    source.insert_goods_stock(make_stock("보유"))
+    assert replicator.sync_all()["goods_stock_fact"] == 1
+    assert "sync_dimension_sequences" in standin.rpc_calls
+
+    # 같은 (이벤트, 지점, 수집 시각)을 덮어쓰면 새 rowid를 받아 다음 동기화에서 다시 전송됩니다.
+    source.insert_goods_stock(make_stock("소진"))
+    assert replicator.sync_all()["goods_stock_fact"] == 1
+    target = SupabaseConnector(client=standin).select_query("SELECT status_code FROM goods_stock_fact")
+    assert target["status_code"].tolist() == [SQLiteConnector.STOCK_STATUSES["소진"]]
+
+
+def test_deleted_boxoffice_rows_are_replicated(tmp_path):
+    source = SQLiteConnector(str(tmp_path / "source.sqlite"))
+    standin = SupabaseStandIn(str(tmp_path / "standin.sqlite"))
+    target = SupabaseConnector(client=standin)
+    replicator = SupabaseReplicator(source=source, target=target)
+
+    source.insert_boxoffice(pd.DataFrame([
+        {"target_dt": pd.Timestamp("2025-01-01"), "movie_cd": movie_cd, "audi_cnt": 1.0} for movie_cd in ("1", "2")
+    ]))
+    assert replicator.sync_all()["boxoffice"] == 2
+
+    source.delete_boxoffice_rows("2025-01-01", ["2"])
+    assert replicator.sync_all()["boxoffice"] == 1
+    assert target.select_query("SELECT movie_cd FROM boxoffice")["movie_cd"].tolist() == ["1"]
+    # 이미 반영한 변경 기록은 다시 보내지 않습니다.
+    assert replicator.sync_all()["boxoffice"] == 0
+
+
+def test_row_inserted_after_deleting_max_rowid_is_replicated(tmp_path):
+    source = SQLiteConnector(str(tmp_path / "source.sqlite"))
+    standin = SupabaseStandIn(str(tmp_path / "standin.sqlite"))
+    target = SupabaseConnector(client=standin)
+    replicator = SupabaseReplicator(source=source, target=target)
+
+    source.insert_boxoffice(pd.DataFrame([
+        {"target_dt": pd.Timestamp("2025-01-01"), "movie_cd": movie_cd, "audi_cnt": 1.0} for movie_cd in ("1", "2")
+    ]))
+    replicator.sync_all()
+    max_rowid = source.select_query("SELECT MAX(rowid) AS r FROM boxoffice")["r"].iloc[0]
+
+    # 가장 큰 rowid의 행을 지우면 다음 행이 같은 rowid를 다시 받습니다.
+    source.delete_boxoffice_rows("2025-01-01", ["2"])
+    source.insert_boxoffice(pd.DataFrame([{"target_dt": pd.Timestamp("2025-01-02"), "movie_cd": "3", "audi_cnt": 1.0}]))
+    assert source.select_query("SELECT rowid AS r FROM boxoffice WHERE movie_cd = '3'")["r"].iloc[0] == max_rowid
+
+    assert replicator.sync_all()["boxoffice"] == 2
+    rows = target.select_query("SELECT movie_cd FROM boxoffice ORDER BY movie_cd")
+    assert rows["movie_cd"].tolist() == ["1", "3"]
+
+
+def test_existing_boxoffice_is_moved_to_change_log(tmp_path):
+    db_path = str(tmp_path / "source.sqlite")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE boxoffice (movie_cd TEXT, target_dt DATE, audi_cnt REAL)")
+    conn.execute("INSERT INTO boxoffice VALUES ('1', '2025-01-01', 1.0)")
+    conn.execute("CREATE TABLE boxoffice_deletion (target_dt DATE, movie_cd TEXT, deleted_at DATETIME)")
+    conn.execute("INSERT INTO boxoffice_deletion VALUES ('2025-01-01', '2', '2025-01-02 08:00:00')")
+    conn.commit()
+    conn.close()
+
+    source = SQLiteConnector(db_path)
+    changes = source.select_query("SELECT movie_cd, op FROM boxoffice_change ORDER BY seq")
+    assert changes.values.tolist() == [["2", "delete"], ["1", "upsert"]]
+    target = SupabaseConnector(client=SupabaseStandIn(str(tmp_path / "standin.sqlite")))
+    assert SupabaseReplicator(source=source, target=target).sync_all()["boxoffice"] == 2
+    assert target.select_query("SELECT movie_cd FROM boxoffice")["movie_cd"].tolist() == ["1"]